@@ -0,0 +1,90 @@
+"""
+Benchmark: writing a month of activity to the activity store and querying it.
+
+Writes --days days of synthetic activity (--events key presses and clicks per day spread over 20 applications,
+plus focus changes) through an ActivitySink, then times:
+- app_totals: per-application keys, clicks and focused seconds for the whole month (from the per-day totals);
+- scan:       streaming the 'kind' and 'app' columns of every event and counting events per application.
+
+Usage:
+    python benchmarks/bench_activity_store.py [--days 30] [--events 100000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.activity_store import FOCUS, ActivitySink, ActivityStore, numpy  # noqa: E402
+from src.core.input_events import KEY_DOWN, MOUSE_DOWN  # noqa: E402
+
+
+def write_month(directory, days, events):
+    rng = random.Random(42)
+    apps = [f'Application {i}' for i in range(20)]
+    sink = ActivitySink(directory)
+    start = datetime(2026, 1, 1, 8)
+    for day in range(days):
+        now = (start + timedelta(days=day)).timestamp()
+        app, focused = rng.choice(apps), now
+        for i in range(events):
+            now += 0.25
+            if i % 500 == 0:
+                sink.add(now, FOCUS, app, value=now - focused)
+                app, focused = rng.choice(apps), now
+            if i % 10:
+                sink.add(now, KEY_DOWN, app, key='a')
+            else:
+                sink.add(now, MOUSE_DOWN, app, key='left', x=100, y=200)
+    sink.flush()
+
+
+def scan(store):
+    counts = Counter()
+    for _, names, chunk in store.read(('kind', 'app')):
+        if numpy is not None:
+            for code, count in enumerate(numpy.bincount(chunk['app'][chunk['kind'] != FOCUS])):
+                if count:
+                    counts[names[code]] += int(count)
+        else:
+            counts.update(names[app] for kind, app in zip(chunk['kind'], chunk['app']) if kind != FOCUS)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=30, help='days of activity')
+    parser.add_argument('--events', type=int, default=100000, help='input events per day')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        write_month(directory, args.days, args.events)
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory)
+                   for name in names)
+        total = args.days * args.events
+        print(f"wrote {total} events in {elapsed:.1f}s ({total / elapsed:,.0f}/s), {size / 2 ** 20:.0f} MiB on disk")
+
+        store = ActivityStore(directory)
+        start = time.perf_counter()
+        totals = store.app_totals()
+        print(f"app_totals: {len(totals)} applications in {(time.perf_counter() - start) * 1000:.1f}ms")
+        start = time.perf_counter()
+        counts = scan(store)
+        print(f"scan:       {sum(counts.values())} events in {time.perf_counter() - start:.2f}s "
+              f"({'numpy' if numpy is not None else 'array module, no numpy'})")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
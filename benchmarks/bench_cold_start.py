@@ -0,0 +1,82 @@
+"""
+Benchmark: cold-start time of a worker that only runs file tasks.
+
+Each run starts a fresh interpreter that creates a TaskScheduler, runs one file copy task and exits:
+- eager: the original import graph, where loading the executors imported pyautogui (which connects to the X
+         display) and selenium up front;
+- lazy:  the executor registry, which imports a backend when the first task of its type runs.
+
+On a machine without pyautogui, selenium or a display, the eager worker cannot start at all; that is reported
+instead of a time.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 10]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import os, sys
+{preamble}
+from src.core.task_scheduler import TaskScheduler
+scheduler = TaskScheduler()
+scheduler.schedule_task({{'task_name': 'copy', 'type': 'file', 'operation': 'copy',
+                         'source': {source!r}, 'destination': {destination!r}}})
+scheduler.execute_tasks()
+assert scheduler.task_status['copy'] == 'completed', scheduler.task_status
+print(len(sys.modules))
+"""
+
+EAGER_IMPORTS = "import pyautogui\nimport selenium.webdriver\nimport src.modules.browser_automation"
+
+
+def run_worker(preamble, source, destination, runs):
+    """
+    Starts the worker `runs` times and returns (median seconds, modules loaded), or (None, error) if it fails.
+    """
+    code = WORKER.format(preamble=preamble, source=source, destination=destination)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if completed.returncode:
+            return None, completed.stderr.strip().splitlines()[-1]
+        modules = int(completed.stdout.split()[-1])
+    return statistics.median(timings), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='worker starts per variant')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, 'source.txt')
+    with open(source, 'w') as f:
+        f.write('payload')
+    destination = os.path.join(directory, 'copy.txt')
+
+    print(f"{'worker':<8}{'median start-to-exit':>22}{'modules':>10}")
+    try:
+        for name, preamble in (('eager', EAGER_IMPORTS), ('lazy', '')):
+            seconds, detail = run_worker(preamble, source, destination, args.runs)
+            if seconds is None:
+                print(f"{name:<8}  fails to start: {detail}")
+            else:
+                print(f"{name:<8}{seconds * 1000:>20.0f}ms{detail:>10}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: files per second for copy, move and delete of many small files.
+
+Compares the original execute_file_management path, which forked cp/mv/rm for every file, with the
+in-process file operations engine, one task per file and as a single batch task.
+
+Usage:
+    python benchmarks/bench_file_operations.py [--files 2000] [--size 4096]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.file_operations import BATCH_WORKERS, run_file_operation  # noqa: E402
+
+
+def subprocess_operation(task):
+    """The original implementation: one cp/mv/rm process per file."""
+    if task['operation'] == 'copy':
+        subprocess.run(['cp', task['source'], task['destination']])
+    elif task['operation'] == 'move':
+        subprocess.run(['mv', task['source'], task['destination']])
+    elif task['operation'] == 'delete':
+        subprocess.run(['rm', task['source']])
+
+
+def run_batch(task):
+    """One batch task for all files of a phase."""
+    sources, destination = [], None
+    for item in task:
+        sources.append(item['source'])
+        destination = item.get('destination')
+    run_file_operation({'operation': task[0]['operation'], 'sources': sources, 'destination': destination})
+
+
+def run(name, operation, directory, files, size, batch=False):
+    source_dir = os.path.join(directory, name, 'src')
+    copy_dir = os.path.join(directory, name, 'copy')
+    moved_dir = os.path.join(directory, name, 'moved')
+    for path in (source_dir, copy_dir, moved_dir):
+        os.makedirs(path)
+    payload = os.urandom(size)
+    names = [f'file-{i}.bin' for i in range(files)]
+    for file_name in names:
+        with open(os.path.join(source_dir, file_name), 'wb') as f:
+            f.write(payload)
+
+    timings = {}
+    phases = (
+        ('copy', lambda n: {'operation': 'copy', 'source': os.path.join(source_dir, n), 'destination': copy_dir}),
+        ('move', lambda n: {'operation': 'move', 'source': os.path.join(copy_dir, n), 'destination': moved_dir}),
+        ('delete', lambda n: {'operation': 'delete', 'source': os.path.join(moved_dir, n)}),
+    )
+    for phase, make_task in phases:
+        start = time.perf_counter()
+        if batch:
+            run_batch([make_task(file_name) for file_name in names])
+        else:
+            for file_name in names:
+                operation(make_task(file_name))
+        timings[phase] = files / (time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=2000, help='number of files')
+    parser.add_argument('--size', type=int, default=4096, help='bytes per file')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        before = run('subprocess', subprocess_operation, directory, args.files, args.size)
+        after = run('engine', run_file_operation, directory, args.files, args.size)
+        batch = run('batch', None, directory, args.files, args.size, batch=True)
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"{args.files} files of {args.size} bytes; files/s ({BATCH_WORKERS} batch workers)")
+    print(f"{'operation':<10}{'cp/mv/rm (before)':>20}{'in-process':>14}{'batch':>12}{'speed-up':>10}")
+    for phase in before:
+        best = max(after[phase], batch[phase])
+        print(f"{phase:<10}{before[phase]:>20,.0f}{after[phase]:>14,.0f}{batch[phase]:>12,.0f}{best / before[phase]:>9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: latency of the ActivityMonitor's input event handlers under a steady input stream.
+
+Feeds a synthetic stream of key presses and clicks (--rate events per second for --seconds) through
+on_key_press/on_click, with the monitor logging to a file as it does in production, and reports the handler
+latency percentiles and the log records written:
+- per-event: one record per keystroke and click (the original INFO lines, now written only at DEBUG);
+- aggregated: events are counted and summarised in one record per summary interval (the default).
+
+Usage:
+    python benchmarks/bench_input_logging.py [--rate 50] [--seconds 10]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import activity_monitor  # noqa: E402
+from src.core.activity_monitor import ActivityMonitor  # noqa: E402
+
+
+def run_stream(level, rate, seconds, log_path):
+    """
+    Handles rate * seconds events paced at `rate` per second and returns (latencies in seconds, records logged).
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.FileHandler(log_path, mode='w')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    root.addHandler(handler)
+    activity_monitor.logger.setLevel(level)
+
+    monitor = ActivityMonitor()
+    monitor.active_window_name = 'Editor'
+    monitor.summary_interval = 1.0
+    key, button = SimpleNamespace(char='a'), SimpleNamespace(name='left')
+    latencies = []
+    start = time.perf_counter()
+    for i in range(int(rate * seconds)):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        began = time.perf_counter()
+        if i % 10:
+            monitor.on_key_press(key)
+        else:
+            monitor.on_click(100, 200, button, True)
+        if time.time() - monitor.input_stats.started >= monitor.summary_interval:  # As the dispatcher does
+            monitor.log_input_summary()
+        latencies.append(time.perf_counter() - began)
+    monitor.log_input_summary()
+    root.removeHandler(handler)
+    handler.close()
+    with open(log_path) as f:
+        return latencies, sum(1 for _ in f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=50, help='input events per second')
+    parser.add_argument('--seconds', type=float, default=10, help='length of the stream')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{'logging':<12}{'p50':>10}{'p99':>10}{'max':>10}{'records':>10}")
+        for name, level in (('per-event', logging.DEBUG), ('aggregated', logging.INFO)):
+            latencies, records = run_stream(level, args.rate, args.seconds, os.path.join(directory, f'{name}.log'))
+            cuts = statistics.quantiles(latencies, n=100)
+            print(f"{name:<12}{cuts[49] * 1e6:>8.1f}us{cuts[98] * 1e6:>8.1f}us{max(latencies) * 1e6:>8.1f}us"
+                  f"{records:>10}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: CPU usage of a running ActivityMonitor with adaptive and fixed sampling.
+
+Runs the monitor (process sampler, dispatcher and a stub window tracker) for an active phase with a synthetic input
+stream of --rate events per second, then an idle phase with no input, and reports the samples taken and the
+monitor's own CPU usage (ActivityMonitor.cpu_usage) per phase:
+- fixed:    a sample every check_interval seconds whatever the user does, as the monitor used to;
+- adaptive: AdaptiveInterval with the default 0.5% CPU budget (idle_after is shortened to fit the run).
+
+Usage:
+    python benchmarks/bench_monitor_cpu.py [--active 20] [--idle 60] [--rate 20]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.activity_monitor import ActivityMonitor  # noqa: E402
+
+
+def run(monitor, active, idle, rate):
+    """
+    Runs the monitor through both phases and returns [(phase, samples, CPU share)].
+    """
+    samples = []
+    sample_processes = monitor.sample_processes
+    monitor.sample_processes = lambda: samples.append(time.monotonic()) or sample_processes()
+    monitor.read_active_window = lambda: 'Editor'
+    monitor.start()
+    on_press = monitor._enqueuer('key_press')
+    key = SimpleNamespace(char='a')
+
+    results = []
+    deadline = time.monotonic() + active
+    cpu = sum(monitor._cpu_time.values())
+    while time.monotonic() < deadline:
+        on_press(key)
+        time.sleep(1 / rate)
+    taken, cpu_now = len(samples), sum(monitor._cpu_time.values())
+    results.append(('active', taken, (cpu_now - cpu) / active))
+    time.sleep(idle)
+    cpu = sum(monitor._cpu_time.values())
+    results.append(('idle', len(samples) - taken, (cpu - cpu_now) / idle))
+    monitor.stop()
+    results.append(('overall', len(samples), monitor.cpu_usage()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--active', type=float, default=20, help='seconds of synthetic input')
+    parser.add_argument('--idle', type=float, default=60, help='seconds without input')
+    parser.add_argument('--rate', type=float, default=20, help='input events per second while active')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'sampling':<10}{'phase':<9}{'samples':>9}{'monitor CPU':>14}")
+    for name in ('fixed', 'adaptive'):
+        if name == 'fixed':
+            monitor = ActivityMonitor(cpu_budget=None)
+            monitor.polling.next = lambda cost=0.0, now=None: monitor.check_interval
+        else:
+            monitor = ActivityMonitor()
+            monitor.polling.idle_after = min(monitor.polling.idle_after, args.idle / 4)
+        for phase, samples, usage in run(monitor, args.active, args.idle, args.rate):
+            print(f"{name:<10}{phase:<9}{samples:>9}{usage:>13.3%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: cost of one process sample with a few hundred processes running.
+
+Starts --processes idle child processes and times one sample of the whole process table:
+- process_iter: the original loop, psutil.process_iter with cpu_percent and memory_percent (new Process objects
+                every cycle, and cpu_percent is 0.0 for all of them);
+- psutil:       ProcessSampler with PsutilSource (cached Process handles read inside oneshot());
+- procfs:       ProcessSampler with ProcfsSource (one /proc/<pid>/stat read per process), the Linux default.
+
+Also reports the memory of the per-application history the sampler keeps.
+
+Usage:
+    python benchmarks/bench_process_sampler.py [--processes 500] [--samples 20]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil  # noqa: E402
+
+from src.core.process_sampler import ProcessSampler, ProcfsSource, PsutilSource  # noqa: E402
+
+
+def time_samples(sample, samples):
+    sample()  # Prime
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        sample()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=500, help='idle child processes to start')
+    parser.add_argument('--samples', type=int, default=20, help='timed samples per variant')
+    args = parser.parse_args()
+
+    children = [subprocess.Popen(['sleep', '600']) for _ in range(args.processes)]
+    try:
+        time.sleep(0.5)
+        variants = [('process_iter', lambda: list(psutil.process_iter(['pid', 'name', 'cpu_percent',
+                                                                       'memory_percent'])))]
+        samplers = [('psutil', ProcessSampler(source=PsutilSource()))]
+        if os.path.exists('/proc/self/stat'):
+            samplers.append(('procfs', ProcessSampler(source=ProcfsSource())))
+        variants += [(name, sampler.sample) for name, sampler in samplers]
+
+        print(f"{len(psutil.pids())} processes")
+        print(f"{'variant':<14}{'median sample':>16}")
+        for name, sample in variants:
+            print(f"{name:<14}{time_samples(sample, args.samples) * 1000:>14.2f}ms")
+
+        sampler = samplers[-1][1]
+        history = sum(series.nbytes() for series in sampler.history.values())
+        print(f"history: {len(sampler.history)} applications, {history / 1024:.0f} KiB "
+              f"(at most {sampler.max_apps} applications)")
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+if __name__ == '__main__':
+    main()
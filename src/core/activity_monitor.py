@@ -1,83 +1,229 @@
 import psutil
 import time
 import logging
-import os
-from pynput import keyboard, mouse
+import queue
+import threading
+
+try:
+    from pynput import keyboard, mouse
+except ImportError:  # Without pynput (e.g. on a headless machine) keyboard and mouse input is not monitored.
+    keyboard = mouse = None
+
+from src.core.activity_store import FOCUS, ActivitySink
+from src.core.adaptive_interval import AdaptiveInterval
+from src.core.input_events import KEY_DOWN, MOUSE_DOWN, button_name, key_name
+from src.core.input_stats import InputStatistics
+from src.core.process_sampler import ProcessSampler
+from src.core.ring_buffer import EventRingBuffer
+from src.core.window_tracker import PollingWindowTracker, create_window_tracker, read_active_window_xdotool
+from src.utils.constants import INPUT_BUFFER_CAPACITY, INPUT_RETENTION, INPUT_SUMMARY_INTERVAL, MONITOR_CPU_BUDGET
 
-# TODO: Implement process monitoring with resource tracking (CPU, Memory) for enhanced insights.
 # TODO: Add real-time browser activity tracking using Selenium or browser APIs.
-# TODO: Ensure that the monitoring logic does not block the main application (use threading or async).
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
+# Seconds stop() waits for the monitoring threads to finish and the event queue to drain.
+STOP_TIMEOUT = 5.0
+
 class ActivityMonitor:
     """
     Monitors the user's desktop activity, including application usage, keystrokes, and mouse actions.
     The goal is to provide insightful feedback on user productivity and automate repetitive tasks.
+
+    start() runs the keyboard and mouse listeners, the process sampler and the window tracker on background
+    threads. They only put events on one queue; a single dispatcher thread logs them, stores them and notifies
+    input listeners, so nothing slow runs on the user's input path. stop() shuts everything down and drains the
+    queue within a bounded time.
+
+    Input events are not logged one by one: they are counted in InputStatistics and summarised in one INFO record
+    every summary_interval seconds. Per-event records are only written when the logger is enabled for DEBUG.
+
+    Sampling follows the user (see adaptive_interval.py): every few seconds while they work, faster during bursts
+    of input, backing off while they are idle or on battery, and never using more than cpu_budget of one CPU. The
+    monitor's own CPU usage is logged with every input summary.
     """
 
-    def __init__(self):
+    def __init__(self, event_capacity=INPUT_BUFFER_CAPACITY, event_retention=INPUT_RETENTION, event_sink=None,
+                 check_interval=5, cpu_budget=MONITOR_CPU_BUDGET):
         """
         Initializes the activity monitor, setting up tracking for processes, keystrokes, and mouse events.
+
+        Args:
+            event_capacity (int): Keystrokes, and separately mouse actions, kept in memory.
+            event_retention (float, optional): Seconds captured events are kept. None keeps them until overwritten.
+            event_sink (ActivitySink, optional): Persists captured key presses, clicks and focus time to the
+                activity store (see activity_store.py).
+            check_interval (float): Seconds between samples while the user is active.
+            cpu_budget (float, optional): Share of one CPU the sampling may use (0.005 is 0.5%); None for no limit.
         """
         self.active_window_name = None  # Store the name of the active window
-        self.last_app_check_time = 0     # Time of last application check to minimize overhead
-        self.key_strokes = []           # Record of all captured keystrokes
-        self.mouse_actions = []         # Record of all mouse actions
+        self._focus_started = time.time()  # When the active window got the focus
+        self.event_sink = event_sink
+        # Captured keystrokes and mouse clicks, in fixed-size ring buffers so memory stays flat over long uptimes
+        self.key_strokes = EventRingBuffer(event_capacity, event_retention)
+        self.mouse_actions = EventRingBuffer(event_capacity, event_retention)
+        self.input_listeners = []       # Objects notified of every input event (e.g. a MacroRecorder)
+        self.input_stats = InputStatistics()
+        self.summary_interval = INPUT_SUMMARY_INTERVAL  # Seconds between input activity summaries
 
-        # TODO: Allow user-defined intervals for how frequently activity is checked (configurable).
-        self.check_interval = 5         # Check system every 5 seconds
+        self.check_interval = check_interval  # Seconds between samples while the user is active
         self.cpu_threshold = 80         # High CPU usage threshold for logging
         self.memory_threshold = 80      # High Memory usage threshold for logging
+        # Per-process CPU and memory sampling, with per-application history (see process_sampler.py)
+        self.process_sampler = ProcessSampler()
+        self._total_memory = psutil.virtual_memory().total
+        # Sampling interval adapted to user activity, power source and the CPU budget
+        self.polling = AdaptiveInterval(base=check_interval, cpu_budget=cpu_budget)
+        self._cpu_time = {}             # Monitor thread -> CPU seconds it has used since start()
+        self._started = self._stopped = None
+
+        self._events = queue.SimpleQueue()  # (kind, timestamp, args) from the listener and sampler threads
+        self._stop_event = threading.Event()
+        self._threads = []              # Sampler and tracker threads
+        self._listeners = []            # Running pynput listeners
+        self._window_tracker = None
+        self._dispatcher = None
 
     def monitor_processes(self):
         """
         Monitor running processes and their resource usage.
         Logs any process that exceeds CPU or memory usage thresholds.
         """
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                if proc.info['cpu_percent'] > self.cpu_threshold or proc.info['memory_percent'] > self.memory_threshold:
-                    logger.warning(f"High resource usage detected: {proc.info}")
-                # TODO: Enhance the reporting to include historical trends of resource usage for each app.
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        self._on_processes(self.sample_processes())
+
+    def sample_processes(self):
+        """
+        Samples every process, records per-application history, and returns the info dicts of processes over the
+        CPU or memory threshold. CPU usage is measured since the previous sample, so processes first seen in this
+        sample are not reported yet.
+        """
+        heavy = []
+        for sample in self.process_sampler.sample():
+            memory_percent = sample.rss * 100 / self._total_memory
+            if sample.cpu_percent > self.cpu_threshold or memory_percent > self.memory_threshold:
+                heavy.append({'pid': sample.pid, 'name': sample.name, 'cpu_percent': sample.cpu_percent,
+                              'memory_percent': memory_percent})
+        return heavy
+
+    def resource_history(self, app_name, step=60, since=None):
+        """
+        Returns the CPU and memory history of an application as (time, CPU percent, RSS in MiB) tuples, one per
+        `step` seconds (1, 60 or 3600 with the default rollup levels), oldest first.
+        """
+        return self.process_sampler.app_history(app_name, step, since)
+
+    def _on_processes(self, heavy):
+        for info in heavy:
+            logger.warning(f"High resource usage detected: {info}")
+
+    def add_input_listener(self, listener):
+        """
+        Registers an object to be notified of input events. The listener may define any of on_key_press(key),
+        on_key_release(key), on_click(x, y, button, pressed), on_move(x, y) and on_scroll(x, y, dx, dy).
+        """
+        self.input_listeners.append(listener)
+
+    def remove_input_listener(self, listener):
+        if listener in self.input_listeners:
+            self.input_listeners.remove(listener)
+
+    def _notify_listeners(self, event, *args):
+        for listener in self.input_listeners:
+            callback = getattr(listener, event, None)
+            if callback is not None:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    logger.error(f"Input listener {listener!r} failed on {event}: {e}")
 
-    def on_key_press(self, key):
+    def on_key_press(self, key, timestamp=None):
         """
         Callback function to handle key press events.
-        Logs each keystroke and stores it in the key_strokes list.
+        Counts the keystroke for the input summary and stores it in the key_strokes buffer.
         """
-        try:
-            logger.info(f"Key pressed: {key.char}")
-            self.key_strokes.append(key.char)
-        except AttributeError:
-            logger.info(f"Special key pressed: {key}")
-            self.key_strokes.append(str(key))
+        timestamp = timestamp or time.time()
+        self._notify_listeners('on_key_press', key)
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                logger.debug(f"Key pressed: {key.char}")
+            except AttributeError:
+                logger.debug(f"Special key pressed: {key}")
+        name = key_name(key) or str(key)
+        self.key_strokes.append(timestamp, KEY_DOWN, key=name)
+        self.input_stats.record(timestamp, KEY_DOWN, self.active_window_name)
+        self.polling.note_input(timestamp)
+        if self.event_sink is not None:
+            self.event_sink.add(timestamp, KEY_DOWN, self.active_window_name, key=name)
 
-    def on_click(self, x, y, button, pressed):
+    def on_click(self, x, y, button, pressed, timestamp=None):
         """
         Callback function to handle mouse clicks.
-        Logs mouse click position and button pressed.
+        Counts the click for the input summary and stores its position and button in the mouse_actions buffer.
         """
+        self._notify_listeners('on_click', x, y, button, pressed)
         if pressed:
-            logger.info(f"Mouse clicked at ({x}, {y}) with {button}")
-            self.mouse_actions.append((x, y, str(button)))
+            timestamp = timestamp or time.time()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Mouse clicked at ({x}, {y}) with {button}")
+            name = button_name(button) or str(button)
+            self.mouse_actions.append(timestamp, MOUSE_DOWN, x, y, key=name)
+            self.input_stats.record(timestamp, MOUSE_DOWN, self.active_window_name)
+            self.polling.note_input(timestamp)
+            if self.event_sink is not None:
+                self.event_sink.add(timestamp, MOUSE_DOWN, self.active_window_name, key=name, x=x, y=y)
+
+    def log_input_summary(self, now=None):
+        """
+        Logs the input activity since the previous summary as one INFO record (nothing if there was none) and
+        starts a new summary period.
+
+        Returns:
+            dict: The summary (see InputStatistics.summary).
+        """
+        summary = self.input_stats.summary(now)
+        if summary['keys'] or summary['clicks']:
+            minutes = (summary['end'] - summary['start']) / 60
+            apps = ', '.join(f"{app}: {counts['keys']} keys/{counts['clicks']} clicks"
+                             for app, counts in list(summary['apps'].items())[:5])
+            bursts = ', '.join(f"{label}: {count}" for label, count in summary['bursts'].items() if count)
+            logger.info(f"Input activity over {minutes:.1f} min: {summary['keys']} keys "
+                        f"({summary['keys_per_minute']:.0f}/min), {summary['clicks']} clicks "
+                        f"({summary['clicks_per_minute']:.0f}/min); bursts by size {{{bursts}}}, longest "
+                        f"{summary['longest_burst']}; by app {{{apps}}}")
+        return summary
+
+    def on_key_release(self, key):
+        """
+        Callback function for key releases. Only forwarded to input listeners.
+        """
+        self._notify_listeners('on_key_release', key)
+
+    def on_move(self, x, y):
+        """
+        Callback function for mouse movement. Only forwarded to input listeners.
+        """
+        self._notify_listeners('on_move', x, y)
+
+    def on_scroll(self, x, y, dx, dy):
+        """
+        Callback function for mouse scrolling. Only forwarded to input listeners.
+        """
+        self._notify_listeners('on_scroll', x, y, dx, dy)
 
     def monitor_keystrokes(self):
         """
         Set up a listener to monitor and log all keyboard activity.
         """
-        with keyboard.Listener(on_press=self.on_key_press) as listener:
+        with keyboard.Listener(on_press=self.on_key_press, on_release=self.on_key_release) as listener:
             listener.join()
 
     def monitor_mouse(self):
         """
         Set up a listener to monitor and log all mouse activity.
         """
-        with mouse.Listener(on_click=self.on_click) as listener:
+        with mouse.Listener(on_click=self.on_click, on_move=self.on_move, on_scroll=self.on_scroll) as listener:
             listener.join()
 
     def get_active_window(self):
@@ -86,33 +232,201 @@ class ActivityMonitor:
         Logs when a new window becomes active.
         """
         try:
-            active_window = os.popen('xdotool getwindowfocus getwindowname').read().strip()
-            if active_window and active_window != self.active_window_name:
-                logger.info(f"Active window changed to: {active_window}")
-                self.active_window_name = active_window
+            active_window = self.read_active_window()
+            self._on_window(active_window)
             return active_window
         except Exception as e:
             logger.error(f"Error retrieving active window: {e}")
 
-    def start_monitoring(self):
+    def read_active_window(self):
         """
-        Begin monitoring processes, keystrokes, and mouse activity in the background.
-        This function will run indefinitely unless manually stopped.
+        Returns the title of the focused window.
+        """
+        return read_active_window_xdotool()
+
+    def _on_window(self, active_window, timestamp=None):
+        if active_window and active_window != self.active_window_name:
+            logger.info(f"Active window changed to: {active_window}")
+            self._record_focus(timestamp or time.time())
+            self.active_window_name = active_window
+
+    def _record_focus(self, now):
+        """
+        Records the time the active window has had the focus since it got it (or since the last record).
+        """
+        if self.event_sink is not None and self.active_window_name is not None:
+            self.event_sink.add(now, FOCUS, self.active_window_name, value=now - self._focus_started)
+        self._focus_started = now
+
+    @property
+    def running(self):
+        return self._dispatcher is not None
+
+    def start(self):
+        """
+        Starts monitoring on background threads and returns immediately.
+
+        Threads:
+        - pynput keyboard and mouse listeners, whose callbacks only timestamp the event and queue it;
+        - the process sampler, which polls at the adaptive interval (see adaptive_interval.py);
+        - the window tracker, which is told about focus changes by the X server (see window_tracker.py), or
+          polls at the same interval when there is no X display;
+        - the dispatcher, which handles queued events in order (ring buffers, input listeners, input summaries).
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.polling.base = self.check_interval
+        self._cpu_time = {}
+        self._started, self._stopped = time.monotonic(), None
+        self._dispatcher = self._start_thread('activity-dispatcher', self._dispatch_events)
+        self._threads = [self._start_thread('process-sampler', self._poll, 'processes', self.sample_processes)]
+        # Focus changes are pushed by the X server where possible, and polled with the processes otherwise.
+        self._window_tracker = create_window_tracker(self._enqueuer('window'), self.read_active_window,
+                                                     self.check_interval)
+        self._listeners = [self._window_tracker]
+        if keyboard is None or mouse is None:
+            logger.warning("pynput is not installed; keyboard and mouse activity is not monitored.")
+        else:
+            self._listeners += [
+                keyboard.Listener(on_press=self._enqueuer('key_press'), on_release=self._enqueuer('key_release')),
+                mouse.Listener(on_click=self._enqueuer('click'), on_move=self._enqueuer('move'),
+                               on_scroll=self._enqueuer('scroll')),
+            ]
+        for listener in self._listeners:
+            listener.daemon = True
+            listener.start()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Stops monitoring: stops the listeners and pollers, lets the dispatcher handle every event queued before
+        the stop, and drops events past their retention.
+
+        Args:
+            timeout (float): Seconds to wait in total for the threads to finish.
+
+        Returns:
+            bool: True if every thread finished within the timeout.
+        """
+        if not self.running:
+            return True
+        deadline = time.monotonic() + timeout
+        self._stop_event.set()
+        self.polling.wake()
+        for listener in self._listeners:
+            listener.stop()
+        threads = self._listeners + self._threads
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._events.put(None)  # Queued after every event already captured, so the dispatcher drains them first
+        self._dispatcher.join(max(0.0, deadline - time.monotonic()))
+        self._stopped = time.monotonic()
+        self.log_input_summary()
+        self.log_cpu_usage()
+        if self.event_sink is not None:
+            self._record_focus(time.time())
+            self.event_sink.flush()
+
+        stopped = not any(thread.is_alive() for thread in threads + [self._dispatcher])
+        if not stopped:
+            logger.warning(f"Activity monitor threads did not stop within {timeout} seconds.")
+        now = time.time()
+        self.key_strokes.expire(now)
+        self.mouse_actions.expire(now)
+        self._listeners, self._threads, self._dispatcher = [], [], None
+        return stopped
+
+    def _start_thread(self, name, target, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def _enqueuer(self, kind):
         """
+        Returns a pynput callback that only queues the event with its timestamp, keeping the input path short.
+        """
+        put = self._events.put
+        return lambda *args: put((kind, time.time(), args))
+
+    def _poll(self, kind, sample):
+        """
+        Calls `sample` at the adaptive polling interval until stopped, queueing each result. The CPU time of each
+        sample is fed to the interval so sampling stays within the CPU budget.
+        """
+        while not self._stop_event.is_set():
+            cpu_time = time.thread_time()
+            try:
+                self._events.put((kind, time.time(), (sample(),)))
+            except Exception as e:
+                logger.error(f"Activity monitor {kind} sampling failed: {e}")
+            self._cpu_time[kind] = time.thread_time()
+            interval = self.polling.next(cost=self._cpu_time[kind] - cpu_time)
+            if isinstance(self._window_tracker, PollingWindowTracker):
+                self._window_tracker.interval = interval
+            self.polling.wait(interval)
+
+    def cpu_usage(self):
+        """
+        Returns the share of one CPU (0.005 is 0.5%) used by the monitor's sampler and dispatcher threads since
+        start(), until stop().
+        """
+        if self._started is None:
+            return 0.0
+        elapsed = (self._stopped or time.monotonic()) - self._started
+        return sum(self._cpu_time.values()) / max(elapsed, 1e-9)
+
+    def log_cpu_usage(self):
+        budget = f"{self.polling.cpu_budget:.2%}" if self.polling.cpu_budget else "none"
+        logger.info(f"Activity monitor CPU usage: {self.cpu_usage():.2%} of one CPU (budget {budget}), "
+                    f"sampling every {self.polling.interval:.1f}s")
+
+    def _dispatch_events(self):
+        """
+        Handles queued events in order until stop() queues the end marker.
+        """
+        handlers = {
+            'key_press': lambda timestamp, key: self.on_key_press(key, timestamp),
+            'key_release': lambda timestamp, key: self.on_key_release(key),
+            'click': lambda timestamp, *args: self.on_click(*args, timestamp=timestamp),
+            'move': lambda timestamp, *args: self.on_move(*args),
+            'scroll': lambda timestamp, *args: self.on_scroll(*args),
+            'processes': lambda timestamp, heavy: self._on_processes(heavy),
+            'window': lambda timestamp, title: self._on_window(title, timestamp),
+        }
+        last_expiry = time.time()
+        self.input_stats.started = last_expiry
         while True:
-            current_time = time.time()
-            
-            # Check the active window every check_interval
-            if current_time - self.last_app_check_time >= self.check_interval:
-                self.monitor_processes()
-                self.get_active_window()
-                self.last_app_check_time = current_time
+            item = self._events.get()
+            if item is None:
+                return
+            kind, timestamp, args = item
+            try:
+                handlers[kind](timestamp, *args)
+            except Exception as e:
+                logger.error(f"Activity monitor failed to handle {kind} event: {e}")
+            self._cpu_time['dispatcher'] = time.thread_time()
+            if timestamp - last_expiry >= self.check_interval:
+                self.key_strokes.expire(timestamp)
+                self.mouse_actions.expire(timestamp)
+                last_expiry = timestamp
+            if timestamp - self.input_stats.started >= self.summary_interval:
+                self.log_input_summary(timestamp)
+                self.log_cpu_usage()
 
-            # TODO: Use threading to run keystroke and mouse monitoring in parallel.
-            time.sleep(1)  # Sleep to prevent excessive CPU usage
+    def start_monitoring(self):
+        """
+        Begin monitoring processes, keystrokes, and mouse activity in the background.
+        Blocks until interrupted (Ctrl+C), then stops the monitoring threads.
+        """
+        self.start()
+        try:
+            while not self._stop_event.wait(60):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
 
 if __name__ == "__main__":
-    monitor = ActivityMonitor()
-    # TODO: Start process monitoring in a separate thread
+    monitor = ActivityMonitor(event_sink=ActivitySink())
     monitor.start_monitoring()
-    # TODO: Implement proper shutdown procedure (graceful termination)
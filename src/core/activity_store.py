@@ -0,0 +1,350 @@
+"""
+activity_store.py
+
+This module persists the activity captured by the ActivityMonitor so that it survives restarts and can be analysed
+later. ActivitySink batches events in memory and appends them to a columnar store partitioned by day; ActivityStore
+reads the store back.
+
+Each day (local time) is a directory named YYYY-MM-DD holding:
+- one append-only file per column (see COLUMNS), the raw typed array in native byte order (the layout
+  numpy.fromfile reads), so a column can be streamed in chunks without reading the others;
+- names.jsonl, the application (window title) and key/button names interned into the 'app' and 'code' columns,
+  one JSON string per line in code order. Key names are only stored by a sink created with record_keys, so by
+  default the store counts key presses per application without keeping what was typed;
+- totals.json, per-application keys, clicks and focused seconds for the day, updated by the sink at every flush,
+  so totals over a month are read from 30 small files.
+
+Columns are appended in batches, so if the process dies in the middle of a flush the reader only returns the rows
+present in every column. Every flush first truncates the columns to those rows, and a batch is only dropped from
+memory once all its columns are written, so a failed flush is retried whole and later rows stay aligned. A store
+directory is written by one ActivitySink at a time.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+from src.core.input_events import KEY_DOWN, KEY_UP, MOUSE_DOWN
+from src.utils.constants import ACTIVITY_BATCH_SIZE, ACTIVITY_FLUSH_INTERVAL, ACTIVITY_RECORD_KEYS, ACTIVITY_STORE_PATH
+
+try:
+    import numpy
+except ImportError:  # Columns are read as arrays from the array module instead
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# Column name -> array typecode. 'app' and 'code' are indexes into the day's names (-1 for none), and 'value'
+# holds the seconds spent for FOCUS events.
+COLUMNS = (('time', 'd'), ('kind', 'B'), ('app', 'i'), ('code', 'i'), ('x', 'i'), ('y', 'i'), ('value', 'f'))
+
+# Event kind recorded when the focus leaves an application; its value is the seconds the application had focus.
+# (Kinds 1-6 are the input event kinds from input_events.py.)
+FOCUS = 7
+
+_DAY_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_TYPECODES = dict(COLUMNS)
+
+
+def _load_names(path):
+    try:
+        with open(os.path.join(path, 'names.jsonl'), encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def _complete_rows(path):
+    """
+    Returns the number of rows present in every column file of a day directory.
+    """
+    sizes = []
+    for name, typecode in COLUMNS:
+        try:
+            sizes.append(os.path.getsize(os.path.join(path, name)) // array(typecode).itemsize)
+        except FileNotFoundError:
+            sizes.append(0)
+    return min(sizes)
+
+
+def _truncate_torn_rows(path):
+    """
+    Truncates every column file of a day directory to the rows present in all of them, dropping rows torn by an
+    interrupted or failed flush so appended rows line up in every column.
+    """
+    rows = _complete_rows(path)
+    for name, typecode in COLUMNS:
+        column = os.path.join(path, name)
+        if os.path.exists(column) and os.path.getsize(column) > rows * array(typecode).itemsize:
+            os.truncate(column, rows * array(typecode).itemsize)
+
+
+def _load_totals(path):
+    try:
+        with open(os.path.join(path, 'totals.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class _DayBuffer:
+    """
+    Events of one day waiting to be flushed, with the day's name table and running totals.
+    """
+
+    def __init__(self, path, start, end):
+        self.path = path
+        self.start, self.end = start, end
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self.names = _load_names(path)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+        self.flushed_names = len(self.names)
+        self.totals = {}  # app -> [keys, clicks, seconds] since the last flush
+
+    def code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def flush(self):
+        if not len(self.columns['time']):
+            return
+        os.makedirs(self.path, exist_ok=True)
+        _truncate_torn_rows(self.path)
+        # Names first, so every code in the columns can be resolved even after an interrupted flush.
+        if len(self.names) > self.flushed_names:
+            with open(os.path.join(self.path, 'names.jsonl'), 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(name) + '\n' for name in self.names[self.flushed_names:])
+            self.flushed_names = len(self.names)
+        for name, column in self.columns.items():
+            with open(os.path.join(self.path, name), 'ab') as f:
+                column.tofile(f)
+        for column in self.columns.values():  # Only once every column is written, so a failure retries them all
+            del column[:]
+
+        totals = _load_totals(self.path)
+        for app, counts in self.totals.items():
+            merged = totals.setdefault(app, [0, 0, 0.0])
+            for i, count in enumerate(counts):
+                merged[i] += count
+        temporary = os.path.join(self.path, 'totals.json.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(totals, f)
+        os.replace(temporary, os.path.join(self.path, 'totals.json'))
+        self.totals = {}
+
+
+class ActivitySink:
+    """
+    Buffers activity events and appends them to the store in batches. add() and flush() are thread-safe.
+
+    A batch is written when it holds batch_size events, or flush_interval seconds after its first event was buffered
+    (from a timer thread, so events captured just before the user goes idle are not held in memory).
+    """
+
+    def __init__(self, directory=ACTIVITY_STORE_PATH, batch_size=ACTIVITY_BATCH_SIZE,
+                 flush_interval=ACTIVITY_FLUSH_INTERVAL, record_keys=ACTIVITY_RECORD_KEYS):
+        """
+        Args:
+            directory (str): Root directory of the store.
+            batch_size (int): Buffered events that trigger a flush.
+            flush_interval (float): Seconds after which buffered events are flushed.
+            record_keys (bool): Store the names of pressed keys. Off, key events keep no code (-1).
+        """
+        self.directory = directory
+        self.record_keys = record_keys
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._days = {}        # day -> _DayBuffer
+        self._current = None   # _DayBuffer of the most recent event, to skip the date lookup
+        self._pending = 0
+        self._timer = None     # Flushes the batch flush_interval seconds after its first event
+        self._lock = threading.Lock()
+
+    def _day(self, timestamp):
+        current = self._current
+        if current is not None and current.start <= timestamp < current.end:
+            return current
+        midnight = datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0)
+        day = midnight.strftime('%Y-%m-%d')
+        buffer = self._days.get(day)
+        if buffer is None:
+            buffer = self._days[day] = _DayBuffer(os.path.join(self.directory, day), midnight.timestamp(),
+                                                  (midnight + timedelta(days=1)).timestamp())
+        self._current = buffer
+        return buffer
+
+    def add(self, timestamp, kind, app=None, key=None, x=0, y=0, value=0.0, code=0):
+        """
+        Buffers one event, flushing the batch when it is full or flush_interval has passed.
+
+        Args:
+            timestamp (float): Event time; it selects the day partition.
+            kind (int): An input event kind, or FOCUS.
+            app (str, optional): Application (active window title) the event belongs to.
+            key (str, optional): Key or button name; interned into the 'code' column. Key names of KEY_DOWN and
+                KEY_UP events are dropped unless record_keys is set.
+            x, y (int): Pointer coordinates.
+            value (float): Seconds of focus for FOCUS events.
+            code (int): Raw code for events without a key name (e.g. the scroll amount).
+        """
+        with self._lock:
+            day = self._day(timestamp)
+            if key is not None:
+                code = day.code(key) if self.record_keys or kind not in (KEY_DOWN, KEY_UP) else -1
+            columns = day.columns
+            columns['time'].append(timestamp)
+            columns['kind'].append(kind)
+            columns['app'].append(day.code(app) if app is not None else -1)
+            columns['code'].append(code)
+            columns['x'].append(x)
+            columns['y'].append(y)
+            columns['value'].append(value)
+            if app is not None and kind in (KEY_DOWN, MOUSE_DOWN, FOCUS):
+                totals = day.totals.get(app)
+                if totals is None:
+                    totals = day.totals[app] = [0, 0, 0.0]
+                if kind == FOCUS:
+                    totals[2] += value
+                else:
+                    totals[0 if kind == KEY_DOWN else 1] += 1
+
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for day, buffer in list(self._days.items()):
+            try:
+                buffer.flush()
+            except OSError as e:
+                logger.error(f"Failed to write activity for {day}: {e}")
+                continue
+            if buffer is not self._current:
+                del self._days[day]
+        self._pending = 0
+
+    def flush(self):
+        """
+        Writes every buffered event to the store.
+        """
+        with self._lock:
+            self._flush()
+
+
+class ActivityStore:
+    """
+    Reads the day-partitioned activity store written by ActivitySink.
+    """
+
+    def __init__(self, directory=ACTIVITY_STORE_PATH):
+        self.directory = directory
+
+    def days(self, first=None, last=None):
+        """
+        Returns the stored days (YYYY-MM-DD strings) from `first` to `last` inclusive, oldest first. Either bound
+        may be a date or a YYYY-MM-DD string.
+        """
+        try:
+            entries = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        first = str(first) if first is not None else None
+        last = str(last) if last is not None else None
+        return sorted(day for day in entries if _DAY_PATTERN.match(day)
+                      and (first is None or day >= first) and (last is None or day <= last))
+
+    def names(self, day):
+        """
+        Returns the name table of a day: names[code] is the application or key name of a code.
+        """
+        return _load_names(os.path.join(self.directory, str(day)))
+
+    def rows(self, day):
+        """
+        Returns the number of complete rows stored for a day.
+        """
+        return _complete_rows(os.path.join(self.directory, str(day)))
+
+    def read(self, columns=('time', 'kind', 'app'), first=None, last=None, chunk_size=65536):
+        """
+        Streams columns of the stored events in chunks, oldest first, reading only the requested columns.
+
+        Args:
+            columns (iterable): Column names from COLUMNS.
+            first, last (optional): Range of days to read (see days()).
+            chunk_size (int): Rows per chunk.
+
+        Yields:
+            tuple: (day, names, chunk), where chunk maps each column name to a NumPy array (or an array.array
+            without NumPy) of up to chunk_size rows, and names resolves the day's 'app' and 'code' values.
+
+        Raises:
+            ValueError: If a column name is unknown.
+        """
+        unknown = [name for name in columns if name not in _TYPECODES]
+        if unknown:
+            raise ValueError(f"Unknown activity columns: {unknown}")
+        for day in self.days(first, last):
+            rows = self.rows(day)
+            if not rows:
+                continue
+            path = os.path.join(self.directory, day)
+            names = self.names(day)
+            files = {name: open(os.path.join(path, name), 'rb') for name in columns}
+            try:
+                for offset in range(0, rows, chunk_size):
+                    count = min(chunk_size, rows - offset)
+                    chunk = {}
+                    for name, f in files.items():
+                        typecode = _TYPECODES[name]
+                        data = f.read(count * array(typecode).itemsize)
+                        if numpy is not None:
+                            chunk[name] = numpy.frombuffer(data, dtype=typecode)
+                        else:
+                            chunk[name] = array(typecode, data)
+                    yield day, names, chunk
+            finally:
+                for f in files.values():
+                    f.close()
+
+    def app_totals(self, first=None, last=None):
+        """
+        Returns the keys, clicks and focused seconds of each application over a range of days.
+
+        Returns:
+            dict: app -> {'keys', 'clicks', 'seconds'}.
+        """
+        result = {}
+        for day in self.days(first, last):
+            for app, (keys, clicks, seconds) in _load_totals(os.path.join(self.directory, day)).items():
+                totals = result.setdefault(app, {'keys': 0, 'clicks': 0, 'seconds': 0.0})
+                totals['keys'] += keys
+                totals['clicks'] += clicks
+                totals['seconds'] += seconds
+        return result
+
+    def activity_data(self, first=None, last=None):
+        """
+        Returns per-application activity in the form FeedbackGenerator takes, most used first.
+
+        Returns:
+            list: {'app', 'keystrokes', 'clicks', 'time_spent' (seconds)} dicts.
+        """
+        totals = self.app_totals(first, last)
+        return [{'app': app, 'keystrokes': counts['keys'], 'clicks': counts['clicks'],
+                 'time_spent': counts['seconds']}
+                for app, counts in sorted(totals.items(), key=lambda item: -item[1]['seconds'])]
@@ -0,0 +1,136 @@
+"""
+adaptive_interval.py
+
+This module decides how often the ActivityMonitor samples the system. AdaptiveInterval replaces the fixed check
+interval with one that follows the user:
+- during a burst of input (input in the last `burst_window` seconds) it samples every `min_interval` seconds;
+- while the user is active it samples every `base` seconds (the monitor's check_interval);
+- once the user has been idle for `idle_after` seconds the interval doubles at every sample, up to `max_interval`;
+- on battery power every interval is stretched by `battery_factor`;
+- whatever the state, the interval never drops below the CPU time of a sample divided by `cpu_budget`, so sampling
+  uses at most that share of one CPU.
+
+A sampler thread sleeps in wait(), which returns early when input arrives after a backoff, so the first input
+after an idle period is followed by a sample within the burst interval.
+"""
+
+import threading
+import time
+
+from src.utils.constants import (MONITOR_BATTERY_FACTOR, MONITOR_CPU_BUDGET, MONITOR_IDLE_AFTER,
+                                 MONITOR_MAX_INTERVAL, MONITOR_MIN_INTERVAL)
+
+try:
+    import psutil
+except ImportError:  # Without psutil the power source is unknown and treated as mains
+    psutil = None
+
+# Seconds the power source is cached for.
+BATTERY_CHECK_INTERVAL = 60.0
+
+
+def on_battery():
+    """
+    Returns True if the machine is running on battery power, False if on mains or unknown.
+    """
+    if psutil is None or not hasattr(psutil, 'sensors_battery'):
+        return False
+    try:
+        battery = psutil.sensors_battery()
+    except Exception:  # Not supported on this platform
+        return False
+    return battery is not None and not battery.power_plugged
+
+
+class AdaptiveInterval:
+    """
+    Sampling interval that adapts to user activity, power source and a CPU budget.
+    """
+
+    def __init__(self, base=5.0, min_interval=MONITOR_MIN_INTERVAL, max_interval=MONITOR_MAX_INTERVAL,
+                 idle_after=MONITOR_IDLE_AFTER, burst_window=10.0, backoff=2.0, cpu_budget=MONITOR_CPU_BUDGET,
+                 battery_factor=MONITOR_BATTERY_FACTOR, power=on_battery, clock=time.time):
+        """
+        Args:
+            base (float): Interval while the user is active but not in a burst.
+            min_interval (float): Interval during bursts of input (never more than base).
+            max_interval (float): Longest interval while idle.
+            idle_after (float): Seconds without input after which the user counts as idle.
+            burst_window (float): Input within this many seconds counts as a burst.
+            backoff (float): Factor the interval grows by at each idle sample.
+            cpu_budget (float, optional): Share of one CPU sampling may use; None for no limit.
+            battery_factor (float): Factor intervals are stretched by on battery power.
+            power (callable): Returns True on battery power; checked every BATTERY_CHECK_INTERVAL seconds.
+            clock (callable): Time source for input timestamps.
+        """
+        self.base = base
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_after = idle_after
+        self.burst_window = burst_window
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.battery_factor = battery_factor
+        self._power = power
+        self._clock = clock
+        self._battery = None
+        self._battery_checked = None
+        self.last_input = clock()
+        self.interval = base       # The interval last returned by next()
+        self._activity_interval = base  # The interval before the battery and budget adjustments
+        self._wakeup = threading.Event()
+
+    def note_input(self, timestamp=None):
+        """
+        Records user input, waking the sampler if it has backed off beyond the base interval.
+        """
+        self.last_input = timestamp or self._clock()
+        if self._activity_interval > self.base:
+            self._wakeup.set()
+
+    def on_battery(self, now):
+        if self._battery_checked is None or now - self._battery_checked >= BATTERY_CHECK_INTERVAL:
+            self._battery = self._power()
+            self._battery_checked = now
+        return self._battery
+
+    def next(self, cost=0.0, now=None):
+        """
+        Computes the interval until the next sample.
+
+        Args:
+            cost (float): CPU seconds the last sample took.
+            now (float, optional): Current time.
+
+        Returns:
+            float: Seconds to wait, also kept in `interval`.
+        """
+        now = self._clock() if now is None else now
+        quiet = now - self.last_input
+        if quiet >= self.idle_after:
+            interval = min(max(self._activity_interval, self.base) * self.backoff, self.max_interval)
+        elif quiet < self.burst_window:
+            interval = min(self.min_interval, self.base)
+        else:
+            interval = self.base
+        self._activity_interval = interval
+        if self.on_battery(now):
+            interval *= self.battery_factor
+        if self.cpu_budget:
+            interval = max(interval, cost / self.cpu_budget)
+        self.interval = interval
+        return interval
+
+    def wait(self, timeout):
+        """
+        Sleeps for `timeout` seconds, or until input arrives after a backoff or wake() is called.
+
+        Returns:
+            bool: True if woken early.
+        """
+        woken = self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return woken
+
+    def wake(self):
+        self._wakeup.set()
@@ -0,0 +1,164 @@
+"""
+admission_control.py
+
+This module decides whether the TaskScheduler may start more low-priority work given the current system load.
+When CPU, memory or disk I/O cross their thresholds, deferrable tasks are held back so the desktop stays usable
+for the person sitting at it. Once load falls below the thresholds minus a hysteresis margin, admission ramps
+back up gradually instead of releasing the whole backlog at once.
+"""
+
+import logging
+import time
+
+try:
+    import psutil
+except ImportError:  # Without psutil the load cannot be sampled and admission stays open.
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Admission states
+ADMISSION_OPEN = 'open'            # Every task is admitted.
+ADMISSION_THROTTLED = 'throttled'  # Deferrable tasks are held back.
+ADMISSION_RAMPING = 'ramping'      # Load has recovered; a growing number of deferrable tasks may run at once.
+
+
+class SystemLoadSampler:
+    """
+    Samples system-wide CPU, memory and disk I/O with psutil, without blocking.
+    """
+
+    def __init__(self):
+        self._last_io = None
+        self._last_time = None
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # The first call only primes the counter and returns 0.0.
+            self._read_io()
+
+    def _read_io(self):
+        counters = psutil.disk_io_counters()
+        now = time.monotonic()
+        total = (counters.read_bytes + counters.write_bytes) if counters else 0
+        rate = 0.0
+        if self._last_io is not None and now > self._last_time:
+            rate = (total - self._last_io) / (now - self._last_time) / (1024 * 1024)
+        self._last_io, self._last_time = total, now
+        return rate
+
+    def __call__(self):
+        """
+        Returns:
+            dict: 'cpu' and 'memory' in percent, and 'disk_io' in MB/s since the previous sample.
+        """
+        if psutil is None:
+            return {'cpu': 0.0, 'memory': 0.0, 'disk_io': 0.0}
+        return {
+            'cpu': psutil.cpu_percent(interval=None),
+            'memory': psutil.virtual_memory().percent,
+            'disk_io': self._read_io(),
+        }
+
+
+class AdmissionController:
+    """
+    Load-aware gate in front of the scheduler's dispatcher.
+
+    Only tasks whose priority is in `deferrable_priorities` are ever held back; higher priority work always runs.
+    """
+
+    def __init__(self, cpu_threshold=80, memory_threshold=80, disk_io_threshold=None, hysteresis=10,
+                 sample_interval=1.0, deferrable_priorities=('low',), ramp_max=8, sampler=None, clock=time.monotonic):
+        """
+        Args:
+            cpu_threshold (float): CPU percent above which deferrable tasks are held back.
+            memory_threshold (float): Memory percent above which deferrable tasks are held back.
+            disk_io_threshold (float, optional): Disk throughput in MB/s above which deferrable tasks are held back.
+            hysteresis (float): Percentage points (or percent of the disk I/O threshold) that load must fall below
+                the thresholds before admission reopens, so it does not flap around a threshold.
+            sample_interval (float): Seconds between load samples.
+            deferrable_priorities (tuple): Task priorities that may be deferred.
+            ramp_max (int): Concurrent deferrable tasks at which ramping ends and admission is fully open.
+            sampler (callable, optional): Returns the load as a dict; defaults to SystemLoadSampler.
+            clock (callable): Monotonic time source.
+        """
+        self.thresholds = {'cpu': cpu_threshold, 'memory': memory_threshold, 'disk_io': disk_io_threshold}
+        self.hysteresis = hysteresis
+        self.sample_interval = sample_interval
+        self.deferrable_priorities = frozenset(deferrable_priorities)
+        self.ramp_max = max(1, ramp_max)
+        self._sampler = sampler or SystemLoadSampler()
+        self._clock = clock
+
+        self.state = ADMISSION_OPEN
+        self.load = {}
+        self.ramp_limit = self.ramp_max
+        self.running_deferrable = 0
+        self._last_sample = None
+
+    def is_deferrable(self, task):
+        return task.get('priority', 'medium') in self.deferrable_priorities
+
+    def _over(self, margin=0):
+        """
+        Returns the names of metrics above their threshold, lowered by `margin` percent of the threshold scale.
+        """
+        over = []
+        for metric, threshold in self.thresholds.items():
+            if threshold is None:
+                continue
+            limit = threshold - margin if metric != 'disk_io' else threshold * (1 - margin / 100)
+            if self.load.get(metric, 0.0) > limit:
+                over.append(metric)
+        return over
+
+    def update(self):
+        """
+        Samples the load if the sample interval has elapsed and moves between the admission states.
+        """
+        now = self._clock()
+        if self._last_sample is not None and now - self._last_sample < self.sample_interval:
+            return self.state
+        self._last_sample = now
+        self.load = self._sampler()
+
+        previous = self.state
+        if self._over():
+            self.state = ADMISSION_THROTTLED
+        elif self.state == ADMISSION_THROTTLED:
+            if not self._over(self.hysteresis):
+                self.state = ADMISSION_RAMPING
+                self.ramp_limit = 1
+        elif self.state == ADMISSION_RAMPING and not self._over(self.hysteresis):
+            self.ramp_limit *= 2
+            if self.ramp_limit >= self.ramp_max:
+                self.state = ADMISSION_OPEN
+        if self.state != previous:
+            logger.info(f"Admission {previous} -> {self.state} (load: {self.load})")
+        return self.state
+
+    def available_slots(self):
+        """
+        Returns how many more deferrable tasks may start now (None means no limit).
+        """
+        if self.state == ADMISSION_OPEN:
+            return None
+        if self.state == ADMISSION_THROTTLED:
+            return 0
+        return max(0, self.ramp_limit - self.running_deferrable)
+
+    def admit(self, task):
+        """
+        Returns True if the task may start now.
+        """
+        if not self.is_deferrable(task):
+            return True
+        slots = self.available_slots()
+        return slots is None or slots > 0
+
+    def task_started(self, task):
+        if self.is_deferrable(task):
+            self.running_deferrable += 1
+
+    def task_finished(self, task):
+        if self.is_deferrable(task):
+            self.running_deferrable -= 1
@@ -7,6 +7,9 @@ and integrates the suggested actions into the broader automation workflow.
 
 import openai
 
+from src.core.cancellation import TaskCancelled, bounded_timeout
+from src.utils.constants import API_TIMEOUT
+
 # Placeholder for API key (set it through a secure method such as environment variables).
 OPENAI_API_KEY = "your-api-key-here"
 
@@ -35,17 +38,48 @@ def send_query_to_chatgpt4(query):
             engine="gpt-4",
             prompt=query,
             max_tokens=500,
-            temperature=0.7
+            temperature=0.7,
+            request_timeout=bounded_timeout(API_TIMEOUT)
         )
         # Process and return the response text
         result = response.choices[0].text.strip()
         # TODO: Further process the result for integration into the broader task workflow.
         return result
+    except TaskCancelled:
+        raise
     except Exception as e:
         # TODO: Implement better error handling and logging.
         return f"Error occurred while communicating with ChatGPT-4: {e}"
 
 
+async def send_query_to_chatgpt4_async(query):
+    """
+    Sends a query to the ChatGPT-4 API without blocking the event loop and returns the response.
+    
+    - Logic:
+      Same as send_query_to_chatgpt4(), but awaits the API call so many queries can be in flight
+      on one event loop at the same time.
+    
+    - Program Interaction:
+      Used by tasks running on the AsyncTaskScheduler (src/core/async_scheduler.py).
+    """
+    openai.api_key = OPENAI_API_KEY
+    
+    try:
+        response = await openai.Completion.acreate(
+            engine="gpt-4",
+            prompt=query,
+            max_tokens=500,
+            temperature=0.7,
+            request_timeout=bounded_timeout(API_TIMEOUT)
+        )
+        return response.choices[0].text.strip()
+    except TaskCancelled:
+        raise
+    except Exception as e:
+        return f"Error occurred while communicating with ChatGPT-4: {e}"
+
+
 def interpret_chatgpt_response(response, task_context):
     """
     Interprets the response from ChatGPT-4 and extracts actionable steps.
@@ -0,0 +1,277 @@
+"""
+application_manager.py
+
+This module launches, closes and reports on desktop applications for execute_application_management. It keeps a
+process index (name -> pids and start times) built with psutil and refreshed incrementally: each refresh lists the
+current pids and only inspects the ones that appeared since the last refresh. Refreshes are rate limited, so a bulk
+task that closes thirty applications scans the process table once, not thirty times.
+
+Applications are launched without waiting for them (Popen in a new session) and closed gracefully: every matching
+process is sent SIGTERM at once, given a grace period, and only the ones still alive are killed. The manager's own
+process and its parent are never closed, even when their name matches.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from src.core.cancellation import bounded_timeout
+
+try:
+    import psutil
+except ImportError:  # The process index needs psutil; without it the manager cannot find running applications.
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds a process index refresh stays valid.
+INDEX_MAX_AGE = 1.0
+
+# Seconds closed applications get to exit after SIGTERM before they are killed.
+CLOSE_GRACE_PERIOD = 5.0
+
+ProcessInfo = namedtuple('ProcessInfo', 'pid name exe create_time')
+
+
+class PsutilProcessSource:
+    """
+    Reads the process table with psutil.
+    """
+
+    def __init__(self):
+        if psutil is None:
+            raise RuntimeError("The process index needs the psutil package.")
+
+    def pids(self):
+        return psutil.pids()
+
+    def describe(self, pid):
+        """
+        Returns the ProcessInfo of a pid, or None if it has exited or cannot be read.
+        """
+        try:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                name, create_time = process.name(), process.create_time()
+                try:
+                    exe = process.exe()
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    exe = ''
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        return ProcessInfo(pid, name, exe, create_time)
+
+
+class ProcessIndex:
+    """
+    Index of running processes by name, refreshed incrementally.
+    """
+
+    def __init__(self, source=None, max_age=INDEX_MAX_AGE, clock=time.monotonic):
+        """
+        Args:
+            source (optional): Provides pids() and describe(pid); defaults to PsutilProcessSource.
+            max_age (float): Seconds a refresh stays valid; lookups within that time reuse it.
+            clock (callable): Time source for max_age.
+        """
+        self._source = source if source is not None else PsutilProcessSource()
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._processes = {}                # pid -> ProcessInfo
+        self._by_name = defaultdict(set)    # lowercase name -> pids
+        self._refreshed_at = None
+        self.scans = 0
+
+    @staticmethod
+    def _names(info):
+        names = {info.name.lower()}
+        if info.exe:
+            names.add(os.path.basename(info.exe).lower())
+        return names
+
+    def _add(self, info):
+        self._processes[info.pid] = info
+        for name in self._names(info):
+            self._by_name[name].add(info.pid)
+
+    def _remove(self, pid):
+        info = self._processes.pop(pid, None)
+        if info is None:
+            return
+        for name in self._names(info):
+            pids = self._by_name.get(name)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._by_name[name]
+
+    def refresh(self, force=False):
+        """
+        Brings the index up to date, unless it was refreshed less than max_age seconds ago.
+
+        Only pids that appeared since the previous refresh are inspected; pids that disappeared are dropped.
+        """
+        with self._lock:
+            now = self._clock()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.max_age:
+                return
+            current = set(self._source.pids())
+            for pid in set(self._processes) - current:
+                self._remove(pid)
+            for pid in current - set(self._processes):
+                info = self._source.describe(pid)
+                if info is not None:
+                    self._add(info)
+            self._refreshed_at = now
+            self.scans += 1
+
+    def add(self, info):
+        """
+        Adds a process the caller knows about (e.g. one it just launched) without waiting for a refresh.
+        """
+        with self._lock:
+            self._remove(info.pid)
+            self._add(info)
+
+    def discard(self, pid):
+        with self._lock:
+            self._remove(pid)
+
+    def find(self, name):
+        """
+        Returns the ProcessInfo of every process whose name or executable is `name`, oldest first.
+        """
+        with self._lock:
+            self.refresh()
+            pids = self._by_name.get(os.path.basename(name).lower(), ())
+            return sorted((self._processes[pid] for pid in pids), key=lambda info: info.create_time)
+
+
+class ApplicationManager:
+    """
+    Launches, closes and reports on applications using a shared ProcessIndex.
+    """
+
+    def __init__(self, index=None, grace_period=CLOSE_GRACE_PERIOD):
+        self.index = index if index is not None else ProcessIndex()
+        self.grace_period = grace_period
+        self._launched = {}  # pid -> Popen of applications started by this manager, reaped when they exit
+
+    def launch(self, app, args=(), cwd=None, env=None):
+        """
+        Starts an application without waiting for it.
+
+        Returns:
+            int: The pid of the new process.
+        """
+        self._reap()
+        process = subprocess.Popen([app, *args], cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   start_new_session=(os.name == 'posix'))
+        self._launched[process.pid] = process
+        self.index.add(ProcessInfo(process.pid, os.path.basename(app), '', time.time()))
+        logger.info(f"Launched {app} (pid {process.pid})")
+        return process.pid
+
+    def close(self, names, grace_period=None):
+        """
+        Closes every process of the given applications: SIGTERM to all of them at once, then a kill for those
+        still running after the grace period.
+
+        Args:
+            names (str or list): Application (process or executable) names.
+            grace_period (float, optional): Seconds to wait before killing; defaults to the manager's, and is
+                shortened to the time left before the current task's deadline.
+
+        Returns:
+            dict: name -> {'terminated': processes that exited on SIGTERM, 'killed': processes that had to be killed}.
+        """
+        if psutil is None:
+            raise RuntimeError("Closing applications needs the psutil package.")
+        names = [names] if isinstance(names, str) else list(names)
+        grace_period = bounded_timeout(self.grace_period if grace_period is None else grace_period)
+        self.index.refresh(force=True)
+
+        own = {os.getpid(), os.getppid()}
+        owners, processes = {}, []
+        for name in names:
+            for info in self.index.find(name):
+                if info.pid in owners:
+                    continue
+                if info.pid in own:
+                    logger.warning(f"Skipped closing {name} process {info.pid}: it is this process or its parent")
+                    continue
+                try:
+                    process = psutil.Process(info.pid)
+                    if process.create_time() != info.create_time and info.pid not in self._launched:
+                        continue  # The pid was reused by another process
+                    process.terminate()
+                except psutil.NoSuchProcess:
+                    continue
+                owners[info.pid] = name
+                processes.append(process)
+
+        _, alive = psutil.wait_procs(processes, timeout=grace_period)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                pass
+        if alive:
+            psutil.wait_procs(alive, timeout=1.0)
+
+        killed = {process.pid for process in alive}
+        result = {name: {'terminated': 0, 'killed': 0} for name in names}
+        for pid, name in owners.items():
+            result[name]['killed' if pid in killed else 'terminated'] += 1
+            self.index.discard(pid)
+        self._reap()
+        logger.info(f"Closed {len(owners)} processes of {len(names)} applications ({len(killed)} killed)")
+        return result
+
+    def status(self, names):
+        """
+        Reports whether applications are running.
+
+        Returns:
+            dict: name -> {'running', 'pids', 'started' (start time of the oldest process, or None)}.
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        self._reap()
+        result = {}
+        for name in names:
+            processes = self.index.find(name)
+            result[name] = {
+                'running': bool(processes),
+                'pids': [info.pid for info in processes],
+                'started': processes[0].create_time if processes else None,
+            }
+        return result
+
+    def _reap(self):
+        """
+        Collects the exit status of launched applications that have exited, so they do not linger as zombies.
+        """
+        for pid, process in list(self._launched.items()):
+            if process.poll() is not None:
+                del self._launched[pid]
+                self.index.discard(pid)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_application_manager():
+    """
+    Returns the ApplicationManager shared by application management tasks, creating it on first use.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ApplicationManager()
+        return _manager
@@ -0,0 +1,259 @@
+"""
+archives.py
+
+This module implements the 'compress' and 'extract' file operations. Archives are written and read as streams in
+fixed-size chunks, so memory use stays flat whatever the size of the files or the archive. Supported formats are
+zip, tar, tar.gz and, if the zstandard package is installed, tar.zst. The 'gz' format compresses each file to its
+own .gz next to the others, several files at a time.
+
+Parallelism: zip and tar.gz are single compressed streams and are written by one thread. tar.zst uses zstd's own
+worker threads, and 'gz' compresses separate files on a thread pool (zlib releases the GIL while it works).
+"""
+
+import gzip
+import logging
+import os
+import shutil
+import stat
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.cancellation import check_cancelled, current_token, use_token
+
+try:
+    import zstandard
+except ImportError:  # tar.zst support is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Bytes read and written per step when streaming file contents.
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
+ARCHIVE_FORMATS = ('zip', 'tar', 'tar.gz', 'tar.zst', 'gz')
+
+_EXTENSIONS = (
+    ('.tar.gz', 'tar.gz'), ('.tgz', 'tar.gz'), ('.tar.zst', 'tar.zst'), ('.tzst', 'tar.zst'),
+    ('.tar', 'tar'), ('.zip', 'zip'), ('.gz', 'gz'),
+)
+
+
+class _CancellableReader:
+    """
+    File wrapper that checks for cancellation before every read, so streaming copies inside zipfile and
+    tarfile stop between chunks when the task is cancelled.
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def read(self, size=-1):
+        check_cancelled()
+        return self._fileobj.read(size)
+
+
+def resolve_format(path, archive_format=None):
+    """
+    Returns the archive format given explicitly or implied by the file name.
+
+    Raises:
+        ValueError: If the format is unknown or tar.zst is requested without the zstandard package.
+    """
+    if archive_format is None:
+        lowered = path.lower()
+        archive_format = next((name for extension, name in _EXTENSIONS if lowered.endswith(extension)), None)
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format for {path!r}: {archive_format}")
+    if archive_format == 'tar.zst' and zstandard is None:
+        raise ValueError("tar.zst archives need the zstandard package.")
+    return archive_format
+
+
+def _archive_members(sources):
+    """
+    Yields (path, name in the archive) for every file and directory under the sources, directories first.
+    """
+    for source in sources:
+        source = os.path.normpath(source)
+        base = os.path.dirname(source)
+        if not os.path.isdir(source) or os.path.islink(source):
+            yield source, os.path.basename(source)
+            continue
+        for root, directories, files in os.walk(source):
+            directories.sort()
+            yield root, os.path.relpath(root, base)
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                yield path, os.path.relpath(path, base)
+
+
+def _safe_target(destination, name):
+    """
+    Resolves an archive member's path below `destination`, rejecting absolute paths and '..' escapes.
+    """
+    target = os.path.realpath(os.path.join(destination, name))
+    root = os.path.realpath(destination)
+    if os.path.isabs(name) or (target != root and not target.startswith(root + os.sep)):
+        raise ValueError(f"Archive member {name!r} would be extracted outside {destination!r}")
+    return target
+
+
+def compress(sources, archive, archive_format=None, level=None, workers=1):
+    """
+    Writes files and directory trees into an archive, streaming each file in ARCHIVE_CHUNK_SIZE chunks.
+
+    Args:
+        sources (list): Files and directories to archive. Each keeps its own name at the top of the archive.
+        archive (str): The archive to write, or for 'gz' the directory the .gz files are written to.
+        archive_format (str, optional): One of ARCHIVE_FORMATS; inferred from the archive name by default.
+        level (int, optional): Compression level; each format's default if not given.
+        workers (int): Threads for tar.zst and for 'gz'.
+
+    Returns:
+        dict: 'archive', 'format', 'files', 'bytes_in' (uncompressed) and 'bytes_out' (archive size).
+    """
+    archive_format = archive_format or ('gz' if os.path.isdir(archive) else None)
+    archive_format = resolve_format(archive, archive_format)
+    if archive_format == 'gz':
+        return _compress_gz(sources, archive, level, workers)
+
+    files = bytes_in = 0
+    if archive_format == 'zip':
+        level = 6 if level is None else level
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+            for path, name in _archive_members(sources):
+                if os.path.isdir(path):
+                    zf.write(path, name)
+                    continue
+                info = zipfile.ZipInfo.from_file(path, name)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, 'rb') as src, zf.open(info, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as dst:
+                    shutil.copyfileobj(_CancellableReader(src), dst, ARCHIVE_CHUNK_SIZE)
+                files += 1
+                bytes_in += info.file_size
+    else:
+        with open(archive, 'wb') as raw:
+            stream = raw
+            if archive_format == 'tar.gz':
+                stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6 if level is None else level)
+            elif archive_format == 'tar.zst':
+                compressor = zstandard.ZstdCompressor(level=3 if level is None else level, threads=max(1, workers))
+                stream = compressor.stream_writer(raw, closefd=False)
+            try:
+                with tarfile.open(fileobj=stream, mode='w|', bufsize=ARCHIVE_CHUNK_SIZE) as tar:
+                    for path, name in _archive_members(sources):
+                        info = tar.gettarinfo(path, name)
+                        if info.isreg():
+                            with open(path, 'rb') as src:
+                                tar.addfile(info, _CancellableReader(src))
+                            files += 1
+                            bytes_in += info.size
+                        else:
+                            tar.addfile(info)
+            finally:
+                if stream is not raw:
+                    stream.close()
+    result = {'archive': archive, 'format': archive_format, 'files': files, 'bytes_in': bytes_in,
+              'bytes_out': os.path.getsize(archive)}
+    logger.info(f"Compressed {files} files ({bytes_in} bytes) into {archive} ({result['bytes_out']} bytes)")
+    return result
+
+
+def _gzip_file(source, target, level):
+    with open(source, 'rb') as src, gzip.open(target, 'wb', compresslevel=level) as dst:
+        shutil.copyfileobj(_CancellableReader(src), dst, ARCHIVE_CHUNK_SIZE)
+    return os.path.getsize(source), os.path.getsize(target)
+
+
+def _compress_gz(sources, directory, level, workers):
+    """
+    Compresses every file under the sources to its own .gz file below `directory`, several at a time.
+    """
+    level = 6 if level is None else level
+    jobs = []
+    for path, name in _archive_members(sources):
+        target = os.path.join(directory, name)
+        if os.path.isdir(path):
+            os.makedirs(target, exist_ok=True)
+        else:
+            jobs.append((path, target + '.gz'))
+
+    token = current_token()
+
+    def run(job):
+        with use_token(token):
+            return _gzip_file(job[0], job[1], level)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='gzip') as pool:
+        sizes = list(pool.map(run, jobs))
+    return {'archive': directory, 'format': 'gz', 'files': len(jobs),
+            'bytes_in': sum(size for size, _ in sizes), 'bytes_out': sum(size for _, size in sizes)}
+
+
+def extract(archive, destination, archive_format=None):
+    """
+    Extracts an archive into a directory, streaming each member in ARCHIVE_CHUNK_SIZE chunks.
+    Members that would land outside the destination (absolute paths, '..', links out of it) are rejected.
+
+    Returns:
+        dict: 'archive', 'format', 'files' and 'bytes' (uncompressed bytes written).
+
+    Raises:
+        ValueError: If the archive holds an unsafe member or its format is unknown.
+    """
+    archive_format = resolve_format(archive, archive_format)
+    os.makedirs(destination, exist_ok=True)
+    files = written = 0
+
+    if archive_format == 'gz':
+        name = os.path.basename(archive)[:-len('.gz')] if archive.lower().endswith('.gz') else os.path.basename(archive)
+        target = _safe_target(destination, name)
+        with gzip.open(archive, 'rb') as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(_CancellableReader(src), dst, ARCHIVE_CHUNK_SIZE)
+        files, written = 1, os.path.getsize(target)
+    elif archive_format == 'zip':
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                target = _safe_target(destination, info.filename)
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(_CancellableReader(src), dst, ARCHIVE_CHUNK_SIZE)
+                mode = (info.external_attr >> 16) & 0o777
+                if mode:
+                    os.chmod(target, mode)
+                files += 1
+                written += info.file_size
+    else:
+        with open(archive, 'rb') as raw:
+            stream = raw
+            if archive_format == 'tar.zst':
+                stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+            mode = {'tar': 'r|', 'tar.gz': 'r|gz', 'tar.zst': 'r|'}[archive_format]
+            try:
+                with tarfile.open(fileobj=stream, mode=mode, bufsize=ARCHIVE_CHUNK_SIZE) as tar:
+                    for member in tar:
+                        check_cancelled()
+                        _safe_target(destination, member.name)
+                        if member.issym():  # Relative to the directory holding the link
+                            _safe_target(destination, os.path.join(os.path.dirname(member.name), member.linkname))
+                        elif member.islnk():  # Hard link names are relative to the archive root
+                            _safe_target(destination, member.linkname)
+                        if not (member.isreg() or member.isdir() or member.issym() or member.islnk()):
+                            raise ValueError(f"Archive member {member.name!r} is not a regular file or directory")
+                        member.mode &= ~(stat.S_ISUID | stat.S_ISGID)
+                        if hasattr(tarfile, 'data_filter'):
+                            tar.extract(member, destination, filter='data')
+                        else:
+                            tar.extract(member, destination)
+                        if member.isreg():
+                            files += 1
+                            written += member.size
+            finally:
+                if stream is not raw:
+                    stream.close()
+    logger.info(f"Extracted {files} files ({written} bytes) from {archive} into {destination}")
+    return {'archive': archive, 'format': archive_format, 'files': files, 'bytes': written}
@@ -0,0 +1,175 @@
+"""
+async_scheduler.py
+
+This module provides an asyncio-based variant of the TaskScheduler. I/O-bound tasks written as coroutines
+(API calls, browser waits) run concurrently on a single event loop, so thousands of in-flight waits do not
+need a thread each. Blocking functions, such as file copies, are offloaded to a small thread pool.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.core.cancellation import use_token
+from src.core.task_scheduler import AGING_INTERVAL, TaskScheduler, _execute_task_function, _run_with_token, _timed_call
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskScheduler(TaskScheduler):
+    """
+    Schedules and runs tasks on an asyncio event loop.
+
+    Tasks use the same dict format as TaskScheduler. A task's 'function' may be a coroutine function, which is
+    awaited on the loop, or a regular function, which is run on the offload thread pool (or on the process pool
+    if the task is 'cpu_bound'). Priorities, due times, retries and resource locks behave as in TaskScheduler,
+    and existing callers of schedule_task keep working.
+    """
+
+    def __init__(self, max_concurrency=1000, workers=4, process_workers=0, clock=time.time, store=None,
+                 admission=None, priority_weights=None, category_weights=None, aging_interval=AGING_INTERVAL,
+                 executors=None):
+        """
+        Args:
+            max_concurrency (int): Maximum number of tasks in flight at once.
+            workers (int): Number of threads used to run blocking task functions.
+            process_workers (int): Number of processes for tasks marked 'cpu_bound'. 0 disables the process pool.
+            clock (callable): Time source used for due times; defaults to time.time.
+            store (TaskStore, optional): Persistent store for the queue, as for TaskScheduler.
+            admission (AdmissionController, optional): Load-aware admission control, as for TaskScheduler.
+            priority_weights, category_weights, aging_interval: Fair queuing settings, as for TaskScheduler.
+            executors (ExecutorRegistry, optional): Handlers for tasks by 'type', as for TaskScheduler.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._loop = None
+        self._wakeup = None
+        super().__init__(workers=workers, process_workers=process_workers, clock=clock, store=store,
+                         admission=admission, priority_weights=priority_weights,
+                         category_weights=category_weights, aging_interval=aging_interval, executors=executors)
+
+    def schedule_task(self, task):
+        """
+        Schedules a task for execution. Safe to call from the event loop, from running tasks and from other threads.
+        """
+        super().schedule_task(task)
+        self._notify()
+
+    async def submit(self, task):
+        """
+        Schedules a task from a coroutine.
+
+        Args:
+            task (dict): The task to schedule, in the same format accepted by schedule_task.
+        """
+        self.schedule_task(task)
+
+    async def run(self):
+        """
+        Runs scheduled tasks until the queue is empty and every in-flight task has finished, or until stop() is called.
+
+        This function:
+        1. Starts the highest priority due tasks, up to max_concurrency at once, skipping tasks whose resources are busy.
+        2. Awaits coroutine tasks on the loop and offloads blocking ones to the thread or process pool.
+        3. Sleeps until a task finishes, a task is scheduled, or the next delayed task becomes due.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        thread_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='task-offload')
+        process_pool = ProcessPoolExecutor(max_workers=self.process_workers) if self.process_workers else None
+        self._run_started = time.perf_counter()
+        self._stopping = False
+        try:
+            while True:
+                # Clear before inspecting state so a wake-up arriving during this pass is not lost.
+                self._wakeup.clear()
+                with self._condition:
+                    self._process_completed()
+                    self._dispatch_ready(self.max_concurrency, lambda task: self._start(task, thread_pool, process_pool))
+                    if self._run_finished():
+                        break
+                    if self._completed:
+                        continue
+                    timeout = self._idle_timeout(self.max_concurrency)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            thread_pool.shutdown(wait=False)
+            if process_pool:
+                process_pool.shutdown(wait=False)
+            self._run_elapsed += time.perf_counter() - self._run_started
+            self._run_started = None
+            self._loop = None
+            if self.store is not None:
+                self.store.flush()
+        logger.info(f"Offload worker utilization: {self.worker_utilization()}")
+
+    def execute_tasks(self):
+        """
+        Runs all scheduled tasks to completion on a new event loop, for callers that are not async.
+        """
+        asyncio.run(self.run())
+
+    def _start(self, task, thread_pool, process_pool):
+        """
+        Starts a task on the loop or the appropriate pool.
+        """
+        function = task.get('function')
+        token = self._in_flight[task['task_name']]
+        if asyncio.iscoroutinefunction(function):
+            future = asyncio.ensure_future(self._run_coroutine(task, token))
+            # Coroutines can be interrupted at their next await, so cancellation and deadlines stop them outright.
+            loop = self._loop
+            token.add_callback(lambda: loop.call_soon_threadsafe(future.cancel))
+        elif process_pool and task.get('cpu_bound') and function:
+            future = self._loop.run_in_executor(
+                process_pool, _timed_call, _execute_task_function, function, task.get('args', ()), task.get('kwargs', {})
+            )
+        else:
+            future = self._loop.run_in_executor(thread_pool, _timed_call, _run_with_token, self.run_task, task, token)
+        future.add_done_callback(lambda f, task=task: self._report_completion(task, f))
+
+    async def _run_coroutine(self, task, token):
+        """
+        Awaits a coroutine task, returning its outcome in the same shape as _timed_call.
+
+        Coroutines do not occupy a worker, so their worker id is None and they are left out of worker_utilization.
+        """
+        start = time.perf_counter()
+        try:
+            with use_token(token):
+                result, error = await task['function'](*task.get('args', ()), **task.get('kwargs', {})), None
+        except asyncio.CancelledError:  # Cancelled through the token
+            result, error = None, token.exception()
+        except Exception as e:
+            result, error = None, e
+        return None, time.perf_counter() - start, result, error
+
+    def stop(self):
+        super().stop()
+        self._notify()
+
+    def _report_completion(self, task, future):
+        super()._report_completion(task, future)
+        self._notify()
+
+    def _notify(self):
+        """
+        Wakes up the run loop, from the loop's own thread or any other thread.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:  # The loop finished while we were scheduling
+                pass
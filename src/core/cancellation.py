@@ -0,0 +1,245 @@
+"""
+cancellation.py
+
+This module provides cooperative cancellation for scheduled tasks. The TaskScheduler gives every running task a
+CancellationToken that is cancelled when the task is cancelled or its deadline passes. Long-running work checks
+the token (directly, or through current_token() when it is not handed the token): browser waits and API calls
+bound their timeouts by the time left. Task functions that run a command should use run_subprocess, which kills the
+command outright when the token is cancelled; other child processes (such as launched applications) are left
+running.
+"""
+
+import contextlib
+import contextvars
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Reasons a token is cancelled for
+CANCELLED = 'cancelled'
+TIMEOUT = 'timeout'
+
+_current_token = contextvars.ContextVar('cancel_token', default=None)
+
+
+class TaskCancelled(Exception):
+    """
+    Raised inside a task when it has been cancelled.
+    """
+
+
+class TaskTimeout(TaskCancelled):
+    """
+    Raised inside a task when it has run past its deadline.
+    """
+
+
+class CancellationToken:
+    """
+    Signals a running task that it should stop.
+
+    The token is thread-safe. Callbacks registered with add_callback run once when it is cancelled, which is how
+    blocking work that cannot poll (such as a child process) is interrupted.
+    """
+
+    def __init__(self, deadline=None, clock=time.monotonic):
+        """
+        Args:
+            deadline (float, optional): Time, on the given clock, after which the token counts as timed out.
+            clock (callable): Time source for the deadline.
+        """
+        self.deadline = deadline
+        self.reason = None
+        self._clock = clock
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        if self.reason is None and self.deadline is not None and self._clock() >= self.deadline:
+            self.cancel(TIMEOUT)
+        return self.reason is not None
+
+    def cancel(self, reason=CANCELLED):
+        """
+        Cancels the token and runs its callbacks.
+
+        Returns:
+            bool: False if the token was already cancelled.
+        """
+        with self._lock:
+            if self.reason is not None:
+                return False
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        self._event.set()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancellation callback {callback!r} failed: {e}")
+        return True
+
+    def remaining(self):
+        """
+        Returns the seconds left until the deadline, or None if the token has no deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self._clock())
+
+    def exception(self):
+        """
+        Returns the exception matching the reason the token was cancelled for.
+        """
+        if self.reason == TIMEOUT:
+            return TaskTimeout("Task exceeded its deadline")
+        return TaskCancelled("Task was cancelled")
+
+    def check(self):
+        """
+        Raises TaskCancelled (or TaskTimeout) if the token has been cancelled.
+        """
+        if self.cancelled:
+            raise self.exception()
+
+    def wait(self, timeout=None):
+        """
+        Sleeps for up to `timeout` seconds, returning early if the token is cancelled.
+
+        Returns:
+            bool: True if the token was cancelled.
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        self._event.wait(timeout)
+        return self.cancelled
+
+    def add_callback(self, callback):
+        """
+        Registers a callable to run when the token is cancelled; it runs immediately if it already is.
+        """
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def current_token():
+    """
+    Returns the CancellationToken of the task running in the current thread or coroutine, or None.
+    """
+    return _current_token.get()
+
+
+@contextlib.contextmanager
+def use_token(token):
+    """
+    Makes `token` the current token for the duration of the block.
+    """
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled():
+    """
+    Raises TaskCancelled if the current task has been cancelled or has run past its deadline.
+    """
+    token = current_token()
+    if token is not None:
+        token.check()
+
+
+def bounded_timeout(timeout):
+    """
+    Returns `timeout` shortened to the time left before the current task's deadline.
+
+    Raises:
+        TaskCancelled: If the current task has already been cancelled.
+    """
+    token = current_token()
+    if token is None:
+        return timeout
+    token.check()
+    remaining = token.remaining()
+    if remaining is None:
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _kill_process_tree(process):
+    """
+    Kills a child process started by run_subprocess together with any processes it spawned.
+    """
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)  # The child leads its own session and process group
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_subprocess(args, timeout=None, token=None, **popen_kwargs):
+    """
+    Runs a command like subprocess.run, but kills it (and its children) when the task's token is cancelled
+    or its deadline passes.
+
+    Args:
+        args (list): The command to run.
+        timeout (float, optional): Seconds after which the command is killed, on top of the task's deadline.
+        token (CancellationToken, optional): Defaults to the current task's token.
+        popen_kwargs: Passed to subprocess.Popen (e.g. stdout=subprocess.PIPE).
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        TaskCancelled: If the command was killed because the task was cancelled.
+        TaskTimeout: If the command was killed at its timeout or the task's deadline.
+    """
+    token = token if token is not None else current_token()
+    if token is not None:
+        token.check()
+        remaining = token.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+    if os.name == 'posix':
+        popen_kwargs.setdefault('start_new_session', True)
+
+    with subprocess.Popen(args, **popen_kwargs) as process:
+        kill = lambda: _kill_process_tree(process)  # noqa: E731
+        if token is not None:
+            token.add_callback(kill)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill()
+            process.communicate()
+            if token is not None and token.deadline is not None and token.cancelled:
+                raise token.exception()
+            raise TaskTimeout(f"Command {args!r} timed out after {timeout} seconds")
+        finally:
+            if token is not None:
+                token.remove_callback(kill)
+    if token is not None and token.reason is not None:
+        raise token.exception()
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
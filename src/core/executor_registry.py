@@ -0,0 +1,119 @@
+"""
+executor_registry.py
+
+This module maps task types to the handlers that execute them. Handlers are registered by import path
+("module:function") and imported the first time a task of their type runs, so a worker only pays for the
+backends it actually uses: a file-only worker never imports pyautogui (and never touches the X display) or
+selenium. Workers that know which task types they serve can load them up front with preload().
+"""
+
+import importlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Handlers for the built-in task types. Each is called with the task dict.
+DEFAULT_EXECUTORS = {
+    'file': 'src.core.task_executor:execute_file_management',
+    'gui': 'src.core.task_executor:execute_gui_automation',
+    'gui_script': 'src.core.task_executor:execute_gui_script',
+    'macro': 'src.core.task_executor:execute_macro',
+    'application': 'src.core.task_executor:execute_application_management',
+    'browser': 'src.core.task_executor:execute_browser_automation',
+}
+
+
+class UnknownTaskType(LookupError):
+    """
+    Raised when a task's type has no registered executor.
+    """
+
+
+class ExecutorRegistry:
+    """
+    Task type -> handler plugins, imported on first use.
+    """
+
+    def __init__(self, executors=None):
+        """
+        Args:
+            executors (dict, optional): Task type -> handler or "module:function" path. Defaults to
+                DEFAULT_EXECUTORS; pass a subset to restrict a worker to some backends.
+        """
+        self._executors = dict(DEFAULT_EXECUTORS if executors is None else executors)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, task_type, handler):
+        """
+        Registers (or replaces) the handler for a task type. `handler` is a callable or a "module:function" path.
+        """
+        with self._lock:
+            self._executors[task_type] = handler
+            self._loaded.pop(task_type, None)
+
+    def unregister(self, task_type):
+        with self._lock:
+            self._executors.pop(task_type, None)
+            self._loaded.pop(task_type, None)
+
+    def __contains__(self, task_type):
+        return task_type in self._executors
+
+    def task_types(self):
+        return sorted(self._executors)
+
+    def loaded(self):
+        """
+        Returns the task types whose handlers have been imported.
+        """
+        return sorted(self._loaded)
+
+    def resolve(self, task_type):
+        """
+        Returns the handler for a task type, importing its module on first use.
+
+        Raises:
+            UnknownTaskType: If no handler is registered for the type.
+            ImportError: If the handler's backend cannot be imported.
+        """
+        handler = self._loaded.get(task_type)
+        if handler is not None:
+            return handler
+        with self._lock:
+            if task_type in self._loaded:
+                return self._loaded[task_type]
+            if task_type not in self._executors:
+                raise UnknownTaskType(f"No executor registered for task type {task_type!r}")
+            handler = self._executors[task_type]
+            if isinstance(handler, str):
+                module_name, _, attribute = handler.partition(':')
+                logger.info(f"Loading executor for {task_type!r} tasks from {module_name}")
+                handler = getattr(importlib.import_module(module_name), attribute)
+            self._loaded[task_type] = handler
+            return handler
+
+    def preload(self, task_types=None):
+        """
+        Imports the handlers of the given task types (all registered types by default) ahead of the first task.
+        """
+        for task_type in (self.task_types() if task_types is None else task_types):
+            self.resolve(task_type)
+
+    def execute(self, task):
+        """
+        Runs a task with the handler registered for task['type'].
+        """
+        return self.resolve(task.get('type'))(task)
+
+
+# Registry used by schedulers that are not given their own.
+default_registry = ExecutorRegistry()
+
+
+def register_executor(task_type, handler):
+    """
+    Registers a handler for a task type in the default registry.
+    """
+    default_registry.register(task_type, handler)
@@ -17,6 +17,18 @@ import logging
 # TODO: Configure logger with custom formatting for better traceability.
 logging.basicConfig(filename='feedback_log.txt', level=logging.INFO)
 
+_TIME_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def time_spent_seconds(time_spent):
+    """
+    Returns a time spent in seconds, given as a number of seconds or a string such as '2h', '45m' or '30s'.
+    """
+    if isinstance(time_spent, str):
+        return float(time_spent[:-1]) * _TIME_UNITS[time_spent[-1]]
+    return float(time_spent or 0)
+
+
 class FeedbackGenerator:
     def __init__(self, activity_data):
         """
@@ -25,6 +37,7 @@ class FeedbackGenerator:
 
         :param activity_data: List of dictionaries containing user activity
         Example: [{'app': 'Chrome', 'keystrokes': 120, 'time_spent': '2h'}]
+        ActivityStore.activity_data() produces this list from the activity store, with time_spent in seconds.
 
         TODO: Validate activity_data input for any corrupt or incomplete entries.
         """
@@ -53,7 +66,7 @@ class FeedbackGenerator:
                 logging.info(f"Suggested automation for {activity['app']}.")
 
             # Check for time spent on non-productive apps
-            if activity['app'] in ['YouTube', 'Social Media'] and activity['time_spent'] > '1h':
+            if activity['app'] in ['YouTube', 'Social Media'] and time_spent_seconds(activity.get('time_spent')) > 3600:
                 insight = f"High time spent on {activity['app']}. Consider reducing usage."
                 self.feedback.append(insight)
                 logging.info(f"Suggested reducing time on {activity['app']}.")
@@ -0,0 +1,537 @@
+"""
+file_operations.py
+
+This module is the in-process engine behind execute_file_management. Files are copied, moved and deleted with
+os and shutil calls instead of forking cp/mv/rm for every file, and failures raise instead of being ignored.
+Copies use the kernel's zero-copy paths where available (os.copy_file_range, which can also share extents on
+filesystems that support reflinks, then os.sendfile through shutil), so data does not pass through Python.
+
+Batch tasks (a 'sources' list of paths and glob patterns, or the 'rename' operation) run as one task and report a
+single aggregated result; copies of large files run on a bounded thread pool so their I/O overlaps.
+Copy and move tasks with 'sync' set only transfer files that changed since the last run (see file_sync.py).
+'compress' and 'extract' tasks stream archives in fixed-size chunks (see archives.py).
+"""
+
+import errno
+import glob
+import logging
+import os
+import re
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.core.archives import compress, extract
+from src.core.cancellation import check_cancelled, current_token, use_token
+from src.core.file_sync import HashCache, files_match
+from src.utils.constants import HASH_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied per zero-copy call. Cancellation is checked between chunks.
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Threads used by batch operations. File I/O releases the GIL, so this is well above the CPU count.
+BATCH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files smaller than this are copied by a batch on its own thread: for small files, handing the copy to a pool
+# thread costs more than the I/O it overlaps.
+INLINE_COPY_SIZE = 1024 * 1024
+
+# Threads compressing the members of a 'gz' archive task. Compression is CPU-bound, so one per CPU.
+COMPRESS_WORKERS = os.cpu_count() or 1
+
+# Seconds between progress reports of a batch operation.
+PROGRESS_INTERVAL = 1.0
+
+# Per-file errors kept in a batch result.
+MAX_REPORTED_ERRORS = 100
+
+# Errors that mean copy_file_range cannot be used for this pair of files, so the copy falls back to shutil.
+_COPY_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+def _target_path(source, destination):
+    """
+    Resolves the destination like cp and mv do: copying or moving into an existing directory keeps the name.
+    """
+    if os.path.isdir(destination):
+        return os.path.join(destination, os.path.basename(os.path.normpath(source)))
+    return destination
+
+
+def _copy_range(source_file, destination_file, size):
+    """
+    Copies with os.copy_file_range. Returns False, before writing anything, if the kernel or filesystem
+    does not support it for these files.
+    """
+    copied = 0
+    while copied < size:
+        check_cancelled()
+        try:
+            sent = os.copy_file_range(source_file.fileno(), destination_file.fileno(), min(COPY_CHUNK_SIZE, size - copied))
+        except OSError as e:
+            if copied == 0 and e.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+        if sent == 0:  # The source shrank while it was being copied
+            break
+        copied += sent
+    return True
+
+
+def copy_file(source, destination):
+    """
+    Copies a single file's contents and permission bits, like cp.
+
+    Args:
+        source (str): The file to copy.
+        destination (str): The target file, or an existing directory to copy into.
+
+    Returns:
+        int: Number of bytes copied.
+
+    Raises:
+        OSError: If the source cannot be read or the destination cannot be written.
+    """
+    target = _target_path(source, destination)
+    if os.path.exists(target) and os.path.samefile(source, target):
+        raise shutil.SameFileError(f"{source!r} and {target!r} are the same file")
+    size = os.stat(source).st_size
+    copied = False
+    if size and hasattr(os, 'copy_file_range'):
+        with open(source, 'rb') as source_file, open(target, 'wb') as destination_file:
+            copied = _copy_range(source_file, destination_file, size)
+    if not copied:
+        # shutil uses os.sendfile on Linux and fcopyfile on macOS, and falls back to a buffered copy.
+        check_cancelled()
+        shutil.copyfile(source, target)
+    shutil.copymode(source, target)
+    return size
+
+
+def copy_path(source, destination):
+    """
+    Copies a file, or a directory tree recursively.
+
+    Returns:
+        int: Number of bytes copied.
+    """
+    if not os.path.isdir(source):
+        return copy_file(source, destination)
+    target = _target_path(source, destination)
+    copied = 0
+
+    def copy_function(src, dst):
+        nonlocal copied
+        copied += copy_file(src, dst)
+
+    shutil.copytree(source, target, copy_function=copy_function, symlinks=True)
+    return copied
+
+
+def move_path(source, destination):
+    """
+    Moves a file or directory. Within a filesystem this is a single rename; across filesystems the data is
+    copied and the source removed.
+
+    Returns:
+        str: The path the source was moved to.
+    """
+    target = _target_path(source, destination)
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source, target, copy_function=copy_file)
+    return target
+
+
+def delete_path(path, recursive=False):
+    """
+    Deletes a file, or a directory tree if `recursive` is set.
+
+    Raises:
+        IsADirectoryError: If the path is a directory and `recursive` is not set.
+    """
+    if os.path.isdir(path) and not os.path.islink(path):
+        if not recursive:
+            raise IsADirectoryError(errno.EISDIR, "Is a directory (set 'recursive' to delete it)", path)
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+class BatchOperationError(Exception):
+    """
+    Raised when some items of a batch operation failed. `result` holds the aggregated result.
+    """
+
+    def __init__(self, result):
+        super().__init__(f"{result['failed']} of {result['total']} items failed in batch {result['operation']}: "
+                         f"{result['errors'][:3]}")
+        self.result = result
+
+
+def _glob_base(pattern):
+    """
+    Returns the leading part of a glob pattern that contains no wildcards; matches keep their path below it.
+    """
+    parts = []
+    for part in pattern.split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or os.curdir
+
+
+def expand_sources(sources, operation):
+    """
+    Expands a batch task's sources into (path, path relative to the destination) pairs.
+
+    Glob patterns ('*', '?', '[...]', and '**' for any depth) keep the matched path below the pattern's fixed
+    prefix. For copies, directories are expanded into the files they contain so each file is copied in
+    parallel; other operations treat a directory as a single item.
+    """
+    items = []
+    seen = set()
+
+    def add(path, relative):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            items.append((path, relative))
+
+    for source in sources:
+        if glob.has_magic(source):
+            base = _glob_base(source)
+            matches = sorted(glob.iglob(source, recursive=True))
+            pairs = [(path, os.path.relpath(path, base)) for path in matches]
+        elif os.path.lexists(source):
+            pairs = [(source, os.path.basename(os.path.normpath(source)))]
+        else:
+            raise FileNotFoundError(errno.ENOENT, "No such file or directory", source)
+
+        for path, relative in pairs:
+            if operation == 'copy' and os.path.isdir(path) and not os.path.islink(path):
+                for root, _, files in os.walk(path):
+                    for name in files:
+                        file_path = os.path.join(root, name)
+                        add(file_path, os.path.join(relative, os.path.relpath(file_path, path)))
+            else:
+                add(path, relative)
+    return items
+
+
+def _drop_nested(items):
+    """
+    Drops the items that lie inside a directory that is itself an item, such as the files a '**' pattern matches
+    below a matched directory: deleting or moving the directory already takes them along.
+    """
+    directories = {os.path.abspath(path) for path, _ in items if os.path.isdir(path) and not os.path.islink(path)}
+    if not directories:
+        return items
+    kept = []
+    for path, relative in items:
+        child = os.path.abspath(path)
+        parent = os.path.dirname(child)
+        while parent != child and parent not in directories:
+            child, parent = parent, os.path.dirname(parent)
+        if parent == child:  # Reached the root without meeting a selected directory
+            kept.append((path, relative))
+    return kept
+
+
+def _rename_targets(items, rules):
+    """
+    Applies rename rules to the base names of the items and returns (source, new path) pairs.
+
+    rules: {'pattern': regex, 'replace': replacement} applied with re.sub, and/or {'template': format string}
+    with the fields {stem}, {suffix}, {name} and {index} (position among the sorted sources, from 'start').
+    """
+    if not rules.get('pattern') and not rules.get('template'):
+        raise ValueError("Rename rules need a 'pattern' or a 'template'.")
+    pattern = re.compile(rules['pattern']) if rules.get('pattern') else None
+    renames = []
+    for index, (path, _) in enumerate(items, start=rules.get('start', 1)):
+        name = os.path.basename(os.path.normpath(path))
+        if pattern is not None:
+            name = pattern.sub(rules.get('replace', ''), name)
+        if rules.get('template'):
+            stem, suffix = os.path.splitext(name)
+            name = rules['template'].format(stem=stem, suffix=suffix, name=name, index=index)
+        renames.append((path, os.path.join(os.path.dirname(os.path.normpath(path)), name)))
+
+    sources = {os.path.abspath(path) for path, _ in renames}
+    targets = [os.path.abspath(target) for _, target in renames]
+    if len(set(targets)) != len(targets):
+        raise ValueError("Rename rules map several files to the same name.")
+    if any(target in sources and target != os.path.abspath(path) for (path, _), target in zip(renames, targets)):
+        raise ValueError("Rename rules would rename a file onto another file of the batch.")
+    return renames
+
+
+def _remove_empty_directories(sources):
+    """
+    Removes directories left empty under the given source directories after a synced move.
+    """
+    for source in sources:
+        if glob.has_magic(source) or not os.path.isdir(source):
+            continue
+        for root, _, _ in os.walk(source, topdown=False):
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass  # Not empty: some files could not be moved
+
+
+def run_batch_operation(task, progress=None, jobs=None):
+    """
+    Copies, moves, deletes or renames many files as one task. Copies of large files run on a bounded pool of
+    threads so their I/O overlaps, while files under INLINE_COPY_SIZE are copied on the calling thread; moves,
+    renames and deletes are metadata operations and run in order on the calling thread.
+
+    Args:
+        task (dict): 'operation' ('copy', 'move', 'delete' or 'rename'), 'sources' (paths and glob patterns),
+            'destination' (a directory, for copy and move), 'recursive' (to delete directories),
+            'rename' (rules for the rename operation, see _rename_targets) and optionally 'workers'.
+            Copies and moves with 'sync' set skip files whose target already has the same size and modification
+            time; with 'checksum' also set, same-size files are compared by content hash, using the hash cache
+            at 'hash_cache' (default HASH_CACHE_PATH). Synced files keep the source's modification time.
+        progress (callable, optional): Called as progress(done, total, bytes_copied) at most once per
+            PROGRESS_INTERVAL seconds and once at the end.
+        jobs (list, optional): (source, target) pairs of a copy or move, used instead of expanding 'sources'.
+
+    Returns:
+        dict: 'operation', 'total', 'succeeded', 'failed', 'bytes' (copied), 'skipped' and 'bytes_skipped'
+        (unchanged files left alone by a sync), 'elapsed' and up to MAX_REPORTED_ERRORS 'errors' as
+        (path, message) pairs.
+
+    Raises:
+        ValueError: If the task is malformed, or two sources of a copy or move have the same target.
+        BatchOperationError: If any item failed; the other items are still processed.
+    """
+    operation = task.get('operation')
+    if operation not in ('copy', 'move', 'delete', 'rename'):
+        raise ValueError(f"Unknown batch file operation: {operation}")
+    destination = task.get('destination')
+    if operation in ('copy', 'move') and not destination:
+        raise ValueError(f"Destination not provided for {operation} operation.")
+
+    sync = bool(task.get('sync')) and operation in ('copy', 'move')
+    if jobs is None:
+        # A synced move copies what changed and removes the sources, so it works file by file like a copy.
+        items = expand_sources(task.get('sources', ()), 'copy' if sync else operation)
+        if operation == 'move' and not sync or operation == 'delete' and task.get('recursive'):
+            items = _drop_nested(items)
+        if operation == 'rename':
+            jobs = _rename_targets(items, task.get('rename') or {})
+        elif operation == 'delete':
+            jobs = [(path, None) for path, _ in items]
+        else:
+            jobs = [(path, os.path.join(destination, relative)) for path, relative in items]
+    if operation in ('copy', 'move'):
+        targets = {}
+        for path, target in jobs:
+            key = os.path.normcase(os.path.normpath(target))
+            if key in targets:
+                raise ValueError(f"{targets[key]} and {path} would both be written to {target}.")
+            targets[key] = path
+        for parent in {os.path.dirname(target) for _, target in jobs}:
+            os.makedirs(parent, exist_ok=True)
+
+    hash_cache = HashCache(task.get('hash_cache', HASH_CACHE_PATH)) if sync and task.get('checksum') else None
+
+    def sync_one(source, target):
+        source_stat = os.stat(source)
+        if files_match(source, source_stat, target, hash_cache):
+            copied, skipped = 0, source_stat.st_size
+        else:
+            copied, skipped = copy_file(source, target), None
+            os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        if operation == 'move':
+            os.remove(source)
+        return copied, skipped
+
+    def run_one(source, target):
+        """Returns (bytes copied, bytes skipped), where bytes skipped is None unless a sync skipped the file."""
+        if sync:
+            return sync_one(source, target)
+        if operation == 'copy':
+            return copy_file(source, target), None
+        if operation == 'delete':
+            delete_path(source, recursive=task.get('recursive', False))
+        else:
+            move_path(source, target)
+        return 0, None
+
+    result = {'operation': operation, 'total': len(jobs), 'succeeded': 0, 'failed': 0, 'bytes': 0,
+              'skipped': 0, 'bytes_skipped': 0, 'errors': []}
+    start = last_report = time.monotonic()
+    token = current_token()
+    workers = max(1, task.get('workers', BATCH_WORKERS))
+
+    def report(final=False):
+        nonlocal last_report
+        now = time.monotonic()
+        if final or now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            done = result['succeeded'] + result['failed']
+            logger.info(f"Batch {operation}: {done}/{result['total']} items, {result['bytes']} bytes")
+            if progress is not None:
+                progress(done, result['total'], result['bytes'])
+
+    def record(source, outcome):
+        if isinstance(outcome, Exception):
+            result['failed'] += 1
+            if len(result['errors']) < MAX_REPORTED_ERRORS:
+                result['errors'].append((source, str(outcome)))
+        else:
+            copied, skipped = outcome
+            result['bytes'] += copied
+            if skipped is not None:
+                result['skipped'] += 1
+                result['bytes_skipped'] += skipped
+            result['succeeded'] += 1
+
+    def run_with_token(source, target):
+        with use_token(token):  # Pool threads do not inherit the task's context
+            return run_one(source, target)
+
+    if (operation != 'copy' and not sync) or workers == 1:
+        # Renames and unlinks are single metadata syscalls; handing them to a thread costs more than it overlaps.
+        for source, target in jobs:
+            check_cancelled()
+            try:
+                record(source, run_one(source, target))
+            except Exception as e:
+                record(source, e)
+            report()
+    else:
+        # At most a few jobs per worker are queued at once, so huge batches do not create a future per file up front.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='file-batch') as pool:
+            pending = {}
+            jobs_iter = iter(jobs)
+            while True:
+                while len(pending) < workers * 4 and (token is None or not token.cancelled):
+                    job = next(jobs_iter, None)
+                    if job is None:
+                        break
+                    try:
+                        small = os.path.getsize(job[0]) < INLINE_COPY_SIZE
+                    except OSError:
+                        small = True  # run_one reports the error
+                    if small:
+                        try:
+                            record(job[0], run_one(*job))
+                        except Exception as e:
+                            record(job[0], e)
+                        report()
+                    else:
+                        pending[pool.submit(run_with_token, *job)] = job[0]
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = e
+                    record(pending.pop(future), outcome)
+                report()
+    result['elapsed'] = time.monotonic() - start
+    if hash_cache is not None:
+        hash_cache.close()
+    if sync:
+        if operation == 'move':
+            _remove_empty_directories(task.get('sources', ()))
+        logger.info(f"Sync {operation}: copied {result['bytes']} bytes, skipped {result['skipped']} unchanged "
+                    f"files ({result['bytes_skipped']} bytes)")
+    report(final=True)
+    check_cancelled()
+    if result['failed']:
+        raise BatchOperationError(result)
+    return result
+
+
+def run_archive_operation(task):
+    """
+    Performs a 'compress' or 'extract' task.
+
+    Args:
+        task (dict): 'source' or 'sources' and 'destination' (the archive for compress, the directory for
+            extract), with optional 'format', 'level' and 'workers'.
+
+    Returns:
+        dict: The result of archives.compress or archives.extract, with the operation added.
+    """
+    operation = task['operation']
+    destination = task.get('destination')
+    sources = task.get('sources') or ([task['source']] if task.get('source') else [])
+    if not sources:
+        raise ValueError(f"Source not provided for {operation} operation.")
+    if not destination:
+        raise ValueError(f"Destination not provided for {operation} operation.")
+    if operation == 'compress':
+        result = compress(sources, destination, task.get('format'), task.get('level'),
+                          task.get('workers', COMPRESS_WORKERS))
+    else:
+        if len(sources) != 1:
+            raise ValueError("extract takes a single archive as its source.")
+        result = extract(sources[0], destination, task.get('format'))
+    return dict(result, operation=operation)
+
+
+def run_file_operation(task, progress=None):
+    """
+    Performs one file management task.
+
+    Args:
+        task (dict): 'operation' ('copy', 'move', 'delete' or 'create'), 'source', 'destination' for copy and
+            move, and 'recursive' to allow deleting a directory tree. Tasks with 'sources' (or the 'rename'
+            operation) are batch tasks and are handed to run_batch_operation. 'compress' and 'extract' tasks
+            are handed to the archives module.
+        progress (callable, optional): Progress callback for batch tasks.
+
+    Returns:
+        dict: The operation, source, destination (if any) and bytes copied, or the aggregated batch result.
+
+    Raises:
+        ValueError: If the task is malformed.
+        OSError: If the operation fails.
+        BatchOperationError: If items of a batch task failed.
+    """
+    operation = task.get('operation')
+    if operation in ('compress', 'extract'):
+        return run_archive_operation(task)
+    if 'sources' in task or operation == 'rename':
+        return run_batch_operation(task, progress)
+    source = task.get('source')
+    destination = task.get('destination')
+    if not source:
+        raise ValueError(f"Source not provided for {operation} operation.")
+    if operation in ('copy', 'move') and not destination:
+        raise ValueError(f"Destination not provided for {operation} operation.")
+
+    if task.get('sync'):
+        if os.path.isfile(source):
+            # A single file syncs to the same target as a plain copy or move: into an existing directory, or to
+            # the destination path itself.
+            return run_batch_operation(dict(task, sources=[source]), progress,
+                                       jobs=[(source, _target_path(source, destination))])
+        # A directory is synced into the destination directory, so repeated runs write to the same place.
+        return run_batch_operation(dict(task, sources=[source]), progress)
+    result = {'operation': operation, 'source': source, 'destination': destination, 'bytes': 0}
+    if operation == 'copy':
+        result['bytes'] = copy_path(source, destination)
+    elif operation == 'move':
+        result['destination'] = move_path(source, destination)
+    elif operation == 'delete':
+        delete_path(source, recursive=task.get('recursive', False))
+    elif operation == 'create':
+        os.makedirs(source, exist_ok=True)
+    else:
+        raise ValueError(f"Unknown file operation: {operation}")
+    logger.debug(f"File {operation} of {source} done.")
+    return result
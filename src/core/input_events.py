@@ -0,0 +1,166 @@
+"""
+input_events.py
+
+This module defines the timestamped input events captured from the keyboard and mouse, and the compact binary
+file format macros are stored in. Keys and buttons are stored by their PyAutoGUI names, so recorded events can be
+replayed through gui_control without translation.
+
+File layout (little-endian):
+    magic            8 bytes, MACRO_MAGIC
+    key count        uint16, then each key name as uint8 length + UTF-8 bytes
+    event count      uint32, then each event as EVENT_FORMAT:
+                     milliseconds since the start (uint32), kind (uint8), x, y (int16), code (int16)
+For key events the code indexes the key table; for mouse buttons it indexes MOUSE_BUTTONS; for scrolls it is the
+number of clicks. An event takes 11 bytes.
+"""
+
+import struct
+from collections import namedtuple
+
+MACRO_MAGIC = b'DAMACRO\x01'
+
+# Event kinds
+KEY_DOWN = 1
+KEY_UP = 2
+MOUSE_DOWN = 3
+MOUSE_UP = 4
+MOUSE_MOVE = 5
+SCROLL = 6
+
+EVENT_FORMAT = struct.Struct('<IBhhh')
+MOUSE_BUTTONS = ('left', 'middle', 'right')
+
+# pynput key names that PyAutoGUI spells differently. Other special keys ('enter', 'tab', 'f1', ...) match.
+PYNPUT_KEY_NAMES = {
+    'alt_l': 'altleft', 'alt_r': 'altright', 'alt_gr': 'altright',
+    'ctrl_l': 'ctrlleft', 'ctrl_r': 'ctrlright',
+    'shift_l': 'shiftleft', 'shift_r': 'shiftright',
+    'cmd': 'win', 'cmd_l': 'winleft', 'cmd_r': 'winright',
+    'page_up': 'pageup', 'page_down': 'pagedown',
+    'caps_lock': 'capslock', 'num_lock': 'numlock', 'scroll_lock': 'scrolllock',
+    'print_screen': 'printscreen',
+    'media_play_pause': 'playpause', 'media_next': 'nexttrack', 'media_previous': 'prevtrack',
+    'media_volume_up': 'volumeup', 'media_volume_down': 'volumedown', 'media_volume_mute': 'volumemute',
+}
+
+# An input event. `key` is a PyAutoGUI key name for key events, a button name for mouse button events,
+# and the scroll amount for scroll events; x and y are 0 for key events.
+InputEvent = namedtuple('InputEvent', 'time kind x y key')
+
+
+def key_name(key):
+    """
+    Returns the PyAutoGUI name of a pynput key (a KeyCode with a char, or a Key), or None if it has no name.
+
+    With Ctrl held, pynput on Windows reports letters as control characters ('\x13' for Ctrl+S), which PyAutoGUI
+    ignores; they are mapped back to the key that was pressed, as are KeyCodes with only a letter or digit
+    virtual key code.
+    """
+    char = getattr(key, 'char', None)
+    if char is not None:
+        if len(char) == 1 and ord(char) < 0x20:
+            return chr(ord(char) + 0x60) if 1 <= ord(char) <= 26 else chr(ord(char) + 0x40)
+        return char
+    name = getattr(key, 'name', None)
+    if name is None:
+        text = str(key)
+        if not text.startswith('Key.'):
+            vk = getattr(key, 'vk', None)
+            if vk is not None and (0x30 <= vk <= 0x39 or 0x41 <= vk <= 0x5A):
+                return chr(vk).lower()  # Windows virtual key codes of digits and letters are their ASCII codes
+            return None  # A KeyCode with only another virtual key code
+        name = text[len('Key.'):]
+    return PYNPUT_KEY_NAMES.get(name, name)
+
+
+def button_name(button):
+    """
+    Returns the PyAutoGUI name of a pynput mouse button ('left', 'middle' or 'right'), or None.
+    """
+    name = getattr(button, 'name', None) or str(button).rpartition('.')[2]
+    return name if name in MOUSE_BUTTONS else None
+
+
+def _clamp(value):
+    return max(-32768, min(32767, int(value)))
+
+
+def write_events(path, events):
+    """
+    Writes events to a macro file.
+
+    Args:
+        path (str): File to write.
+        events (iterable): InputEvents in time order. Times are seconds; they are stored relative to the first.
+
+    Returns:
+        int: Number of events written.
+    """
+    events = list(events)
+    keys = sorted({event.key for event in events if event.kind in (KEY_DOWN, KEY_UP)})
+    key_index = {key: index for index, key in enumerate(keys)}
+    start = events[0].time if events else 0.0
+
+    records = bytearray()
+    for event in events:
+        if event.kind in (KEY_DOWN, KEY_UP):
+            code = key_index[event.key]
+        elif event.kind in (MOUSE_DOWN, MOUSE_UP):
+            code = MOUSE_BUTTONS.index(event.key)
+        elif event.kind == SCROLL:
+            code = _clamp(event.key)
+        else:
+            code = 0
+        records += EVENT_FORMAT.pack(round((event.time - start) * 1000), event.kind,
+                                     _clamp(event.x), _clamp(event.y), code)
+
+    with open(path, 'wb') as f:
+        f.write(MACRO_MAGIC)
+        f.write(struct.pack('<H', len(keys)))
+        for key in keys:
+            encoded = key.encode('utf-8')
+            f.write(struct.pack('<B', len(encoded)) + encoded)
+        f.write(struct.pack('<I', len(events)))
+        f.write(records)
+    return len(events)
+
+
+def read_events(path):
+    """
+    Reads the events of a macro file, with times in seconds from the first event.
+
+    Raises:
+        ValueError: If the file is not a macro file or is truncated.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MACRO_MAGIC):
+        raise ValueError(f"{path} is not a macro file")
+    try:
+        offset = len(MACRO_MAGIC)
+        (key_count,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        keys = []
+        for _ in range(key_count):
+            length = data[offset]
+            keys.append(data[offset + 1:offset + 1 + length].decode('utf-8'))
+            offset += 1 + length
+        (event_count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        end = offset + event_count * EVENT_FORMAT.size
+        if end > len(data):
+            raise ValueError(f"{path} is truncated")
+        events = []
+        for milliseconds, kind, x, y, code in EVENT_FORMAT.iter_unpack(data[offset:end]):
+            if kind in (KEY_DOWN, KEY_UP):
+                key = keys[code]
+            elif kind in (MOUSE_DOWN, MOUSE_UP):
+                key = MOUSE_BUTTONS[code]
+            elif kind == SCROLL:
+                key = code
+            else:
+                key = None
+            events.append(InputEvent(milliseconds / 1000, kind, x, y, key))
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"{path} is not a valid macro file: {e}") from e
+    return events
@@ -0,0 +1,98 @@
+"""
+input_stats.py
+
+This module aggregates the keystrokes and clicks seen by the ActivityMonitor into periodic summaries, so the monitor
+logs one record per summary interval instead of one line per input event.
+
+InputStatistics counts keys and clicks overall and per application (the active window), and groups events into
+bursts (runs of events less than INPUT_BURST_GAP seconds apart) counted in a small histogram of burst sizes.
+Recording an event is a few integer updates; summary() returns the totals and starts a new period.
+"""
+
+import time
+from bisect import bisect_left
+
+from src.core.input_events import KEY_DOWN, MOUSE_DOWN
+from src.utils.constants import INPUT_BURST_GAP
+
+# Upper bounds of the burst size histogram bins; larger bursts fall in a final open bin.
+BURST_BINS = (1, 5, 20, 100)
+BURST_LABELS = ('1', '2-5', '6-20', '21-100', '>100')
+
+
+class InputStatistics:
+    """
+    Input event counters and burst histogram for the current summary period.
+    """
+
+    def __init__(self, burst_gap=INPUT_BURST_GAP, now=None):
+        """
+        Args:
+            burst_gap (float): Longest pause in seconds between two events of the same burst.
+            now (float, optional): Start of the first period; defaults to the current time.
+        """
+        self.burst_gap = burst_gap
+        self._reset(time.time() if now is None else now)
+
+    def _reset(self, now):
+        self.started = now
+        self.keys = 0
+        self.clicks = 0
+        self.apps = {}                  # app -> [keys, clicks]
+        self.bursts = [0] * len(BURST_LABELS)
+        self.longest_burst = 0
+        self._burst = 0                 # Events in the burst in progress
+        self._last_event = None
+
+    def _close_burst(self):
+        if self._burst:
+            self.bursts[bisect_left(BURST_BINS, self._burst)] += 1
+            self.longest_burst = max(self.longest_burst, self._burst)
+            self._burst = 0
+
+    def record(self, timestamp, kind, app=None):
+        """
+        Counts one key press (KEY_DOWN) or click (MOUSE_DOWN) made in `app`.
+        """
+        if kind != KEY_DOWN and kind != MOUSE_DOWN:
+            return
+        counts = self.apps.get(app)
+        if counts is None:
+            counts = self.apps[app] = [0, 0]
+        if kind == KEY_DOWN:
+            self.keys += 1
+            counts[0] += 1
+        else:
+            self.clicks += 1
+            counts[1] += 1
+        if self._last_event is not None and timestamp - self._last_event > self.burst_gap:
+            self._close_burst()
+        self._burst += 1
+        self._last_event = timestamp
+
+    def summary(self, now=None):
+        """
+        Returns the totals of the current period and starts a new one. A burst in progress is cut at the boundary.
+
+        Returns:
+            dict: 'start' and 'end' of the period, 'keys', 'clicks', 'keys_per_minute', 'clicks_per_minute',
+            'apps' (app -> {'keys', 'clicks'}, busiest first), 'bursts' (size bin label -> count) and
+            'longest_burst'.
+        """
+        now = time.time() if now is None else now
+        self._close_burst()
+        minutes = max(now - self.started, 1e-9) / 60
+        apps = sorted(self.apps.items(), key=lambda item: -(item[1][0] + item[1][1]))
+        summary = {
+            'start': self.started,
+            'end': now,
+            'keys': self.keys,
+            'clicks': self.clicks,
+            'keys_per_minute': self.keys / minutes,
+            'clicks_per_minute': self.clicks / minutes,
+            'apps': {app: {'keys': keys, 'clicks': clicks} for app, (keys, clicks) in apps},
+            'bursts': dict(zip(BURST_LABELS, self.bursts)),
+            'longest_burst': self.longest_burst,
+        }
+        self._reset(now)
+        return summary
@@ -0,0 +1,298 @@
+"""
+process_sampler.py
+
+This module samples the CPU and memory use of running processes for the ActivityMonitor and keeps a bounded
+history per application.
+
+ProcessSampler remembers every live pid between samples (its name, start time and cumulative CPU time), so a CPU
+percentage is the CPU time a process used since the previous sample rather than psutil's 0.0 on first touch. A new
+process is primed on first sight and reported from the next sample on, and a reused pid is recognised by its start
+time. The counters come from a process source: on Linux ProcfsSource reads one /proc/<pid>/stat file per process,
+elsewhere PsutilSource reads each cached psutil.Process inside oneshot().
+
+Each sample is summed per application (process name) and added to a RollupSeries: fixed-size ring arrays at several
+resolutions (by default 1s for 10 minutes, 1m for a day and 1h for 30 days), so the history of an application
+takes a fixed 55 KB however long it runs, and at most MAX_TRACKED_APPS applications (about 7 MB) are kept.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+
+try:
+    import psutil
+except ImportError:  # Only needed where /proc is not available
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# (seconds per bucket, buckets kept) of each rollup level.
+ROLLUP_LEVELS = ((1, 600), (60, 1440), (3600, 720))
+
+# Applications with a history; the least recently seen are forgotten beyond this.
+MAX_TRACKED_APPS = 128
+
+ProcessSample = namedtuple('ProcessSample', 'pid name cpu_percent rss')
+
+# Counters read from a process: start time (in the source's own unit), cumulative CPU seconds, RSS bytes.
+ProcessCounters = namedtuple('ProcessCounters', 'start cpu_time rss')
+
+
+class ProcfsSource:
+    """
+    Reads process counters from /proc/<pid>/stat: one small file per process and sample.
+    """
+
+    def __init__(self, proc='/proc'):
+        self.proc = proc
+        self._ticks = os.sysconf('SC_CLK_TCK')
+        self._page_size = os.sysconf('SC_PAGE_SIZE')
+
+    def pids(self):
+        return [int(entry) for entry in os.listdir(self.proc) if entry.isdigit()]
+
+    def _stat(self, pid):
+        with open(f'{self.proc}/{pid}/stat', 'rb') as f:
+            data = f.read()
+        end = data.rindex(b')')  # The command name may itself contain spaces and parentheses
+        return data[data.index(b'(') + 1:end], data[end + 2:].split()
+
+    def name(self, pid):
+        """
+        Returns the process name as psutil reports it: the command name, or the executable's name when the kernel
+        truncated the command name to 15 characters.
+        """
+        try:
+            comm = self._stat(pid)[0].decode('utf-8', 'replace')
+            if len(comm) >= 15:
+                with open(f'{self.proc}/{pid}/cmdline', 'rb') as f:
+                    argv0 = os.path.basename(f.read().split(b'\0', 1)[0].decode('utf-8', 'replace'))
+                if argv0.startswith(comm):
+                    return argv0
+            return comm
+        except (OSError, ValueError):
+            return None
+
+    def read(self, pid):
+        """
+        Returns the ProcessCounters of a process, or None if it has exited.
+        """
+        try:
+            fields = self._stat(pid)[1]
+        except (OSError, ValueError):
+            return None
+        # Fields after the name start at field 3 (state): utime 14, stime 15, starttime 22, rss 24.
+        return ProcessCounters(int(fields[19]), (int(fields[11]) + int(fields[12])) / self._ticks,
+                               int(fields[21]) * self._page_size)
+
+
+class PsutilSource:
+    """
+    Reads process counters through psutil, keeping one psutil.Process per pid.
+    """
+
+    def __init__(self):
+        if psutil is None:
+            raise RuntimeError("Sampling processes without /proc needs the psutil package.")
+        self._processes = {}
+
+    def pids(self):
+        pids = psutil.pids()
+        live = set(pids)
+        for pid in [pid for pid in self._processes if pid not in live]:
+            del self._processes[pid]
+        return pids
+
+    def _process(self, pid):
+        process = self._processes.get(pid)
+        if process is None:
+            process = self._processes[pid] = psutil.Process(pid)
+        return process
+
+    def name(self, pid):
+        try:
+            return self._process(pid).name()
+        except psutil.Error:
+            return None
+
+    def read(self, pid):
+        try:
+            process = self._process(pid)
+            with process.oneshot():
+                cpu = process.cpu_times()
+                return ProcessCounters(process.create_time(), cpu.user + cpu.system, process.memory_info().rss)
+        except psutil.Error:  # Exited, a zombie or not ours to read
+            self._processes.pop(pid, None)
+            return None
+
+
+def default_source():
+    """
+    Returns a ProcfsSource on Linux and a PsutilSource elsewhere.
+    """
+    if sys.platform.startswith('linux') and os.path.exists('/proc/self/stat'):
+        return ProcfsSource()
+    return PsutilSource()
+
+
+class RollupSeries:
+    """
+    CPU and RSS history of one application, averaged into fixed-size buckets at several resolutions.
+    """
+
+    def __init__(self, levels=ROLLUP_LEVELS):
+        self.levels = []
+        for step, size in levels:
+            self.levels.append({
+                'step': step,
+                'size': size,
+                'bucket': array('q', [-1]) * size,  # Bucket number held by each slot (time // step)
+                'count': array('I', bytes(4 * size)),
+                'cpu': array('f', bytes(4 * size)),  # Sum of CPU percent samples
+                'rss': array('f', bytes(4 * size)),  # Sum of RSS samples, in MiB
+            })
+
+    def nbytes(self):
+        """
+        Returns the bytes held by the series' arrays (fixed when it is created).
+        """
+        return sum(level[name].itemsize * level['size'] for level in self.levels
+                   for name in ('bucket', 'count', 'cpu', 'rss'))
+
+    def add(self, timestamp, cpu_percent, rss):
+        """
+        Adds one sample (CPU percent and RSS in bytes) to every resolution in O(1).
+        """
+        rss_mib = rss / (1024 * 1024)
+        for level in self.levels:
+            bucket = int(timestamp // level['step'])
+            slot = bucket % level['size']
+            if level['bucket'][slot] != bucket:  # The slot still holds an expired bucket
+                level['bucket'][slot] = bucket
+                level['count'][slot] = 0
+                level['cpu'][slot] = 0.0
+                level['rss'][slot] = 0.0
+            level['count'][slot] += 1
+            level['cpu'][slot] += cpu_percent
+            level['rss'][slot] += rss_mib
+
+    def history(self, step, since=None, now=None):
+        """
+        Returns the averaged buckets of one resolution, oldest first.
+
+        Args:
+            step (int): The resolution, in seconds per bucket (one of the configured levels).
+            since (float, optional): Only buckets starting at or after this time.
+            now (float, optional): Current time; buckets older than the level's span before it are excluded.
+
+        Returns:
+            list: (bucket start time, average CPU percent, average RSS in MiB) tuples.
+
+        Raises:
+            ValueError: If no level has this step.
+        """
+        level = next((level for level in self.levels if level['step'] == step), None)
+        if level is None:
+            raise ValueError(f"No rollup level with a {step}s step.")
+        newest = max(level['bucket'])
+        if newest < 0:
+            return []
+        if now is not None:
+            newest = max(newest, int(now // step))
+        oldest = newest - level['size'] + 1
+        if since is not None:
+            oldest = max(oldest, -int(-since // step))
+        result = []
+        for bucket in range(oldest, newest + 1):
+            slot = bucket % level['size']
+            count = level['count'][slot]
+            if level['bucket'][slot] == bucket and count:
+                result.append((bucket * step, level['cpu'][slot] / count, level['rss'][slot] / count))
+        return result
+
+
+class ProcessSampler:
+    """
+    Samples per-process CPU and RSS and records per-application history. sample() is thread-safe.
+    """
+
+    def __init__(self, source=None, levels=ROLLUP_LEVELS, max_apps=MAX_TRACKED_APPS, clock=time.time,
+                 timer=time.monotonic):
+        """
+        Args:
+            source (optional): Process source with pids(), name(pid) and read(pid); defaults to default_source().
+            levels (tuple): (seconds per bucket, buckets kept) of each rollup level.
+            max_apps (int): Applications with a history; the least recently seen are forgotten beyond this.
+            clock (callable): Wall-clock time used to place samples in history buckets.
+            timer (callable): Monotonic time used to measure the interval between samples.
+        """
+        self.source = source if source is not None else default_source()
+        self.levels = levels
+        self.max_apps = max_apps
+        self._clock = clock
+        self._timer = timer
+        self._last_sample = None
+        self._processes = {}          # pid -> [name, start, cpu_time] at the previous sample
+        self.history = OrderedDict()  # app name -> RollupSeries, least recently seen first
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """
+        Samples every process once and adds the per-application totals to the history.
+
+        Returns:
+            list: A ProcessSample for each process that was also seen at the previous sample; new processes are
+            only primed, since a CPU percentage needs two readings.
+        """
+        with self._lock:
+            now, elapsed = self._clock(), None
+            timer = self._timer()
+            if self._last_sample is not None:
+                elapsed = timer - self._last_sample
+            self._last_sample = timer
+
+            previous, current = self._processes, {}
+            samples = []
+            for pid in self.source.pids():
+                counters = self.source.read(pid)
+                if counters is None:
+                    continue
+                state = previous.get(pid)
+                if state is None or state[1] != counters.start:  # New process, or the pid was reused
+                    name = self.source.name(pid)
+                    if name is not None:
+                        current[pid] = [name, counters.start, counters.cpu_time]
+                    continue
+                current[pid] = state
+                if elapsed:
+                    cpu_percent = max(counters.cpu_time - state[2], 0.0) / elapsed * 100
+                    samples.append(ProcessSample(pid, state[0], cpu_percent, counters.rss))
+                state[2] = counters.cpu_time
+            self._processes = current
+
+            per_app = {}
+            for sample in samples:
+                cpu, rss = per_app.get(sample.name, (0.0, 0))
+                per_app[sample.name] = (cpu + sample.cpu_percent, rss + sample.rss)
+            for name, (cpu, rss) in per_app.items():
+                series = self.history.get(name)
+                if series is None:
+                    series = self.history[name] = RollupSeries(self.levels)
+                    if len(self.history) > self.max_apps:
+                        self.history.popitem(last=False)
+                else:
+                    self.history.move_to_end(name)
+                series.add(now, cpu, rss)
+            return samples
+
+    def app_history(self, name, step, since=None):
+        """
+        Returns the history of an application at one resolution (see RollupSeries.history), or [] if it has none.
+        """
+        with self._lock:
+            series = self.history.get(name)
+            return series.history(step, since, self._clock()) if series is not None else []
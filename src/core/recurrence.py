@@ -0,0 +1,180 @@
+"""
+recurrence.py
+
+This module implements recurring task schedules for the TaskScheduler. A task repeats when it carries either an
+'interval' (seconds between runs) or a 'cron' expression ("minute hour day-of-month month day-of-week").
+The scheduler keeps only the next occurrence of each recurring task in its delayed heap, so tens of thousands
+of triggers cost O(1) per scheduler tick and O(log n) per fire, rather than a scan of every task.
+
+Occurrences missed while the application was down or busy are handled by the task's 'catch_up' policy:
+- 'once' (default): run a single catch-up occurrence now, then continue on schedule.
+- 'all':  run every missed occurrence, back to back.
+- 'skip': drop missed occurrences and wait for the next scheduled one.
+"""
+
+import functools
+from datetime import datetime, timedelta
+
+CATCH_UP_POLICIES = ('once', 'all', 'skip')
+
+_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+}
+
+# (low, high) bounds of the five cron fields. Day-of-week accepts 7 as an alias for Sunday (0).
+_FIELD_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Upper bound on the date-stepping loop in next_after; any satisfiable expression matches well within it.
+_MAX_SEARCH_STEPS = 10000
+
+
+class CronSchedule:
+    """
+    A parsed five-field cron expression.
+
+    Each field accepts '*', numbers, ranges ('1-5'), steps ('*/15', '10-40/10') and comma-separated lists.
+    As in Vixie cron, when both day-of-month and day-of-week are restricted, a day matching either one fires.
+    Times are evaluated in local time.
+    """
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): The cron expression, or one of @hourly, @daily, @weekly, @monthly, @yearly.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        parsed = [_parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_BOUNDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays  # cron counts from Sunday = 0
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, timestamp):
+        """
+        Returns the first fire time strictly after the given timestamp.
+
+        Raises:
+            ValueError: If the expression can never fire (e.g. February 30th).
+        """
+        moment = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(_MAX_SEARCH_STEPS):
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
+
+
+def _parse_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        spec, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if spec == '*':
+            start, end = low, high
+        elif '-' in spec:
+            start, end = (int(bound) for bound in spec.split('-', 1))
+        else:
+            start = int(spec)
+            end = high if step > 1 else start
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"Invalid cron field {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_cron(expression):
+    """
+    Returns the CronSchedule for an expression, parsing each distinct expression only once.
+    """
+    return CronSchedule(expression)
+
+
+def is_recurring(task):
+    """
+    Returns True if the task repeats on an interval or cron schedule.
+    """
+    return bool(task.get('interval') or task.get('cron'))
+
+
+def next_occurrence(task, after):
+    """
+    Returns the first occurrence of a recurring task strictly after the given timestamp.
+    """
+    if task.get('cron'):
+        return parse_cron(task['cron']).next_after(after)
+    return after + task['interval']
+
+
+def first_occurrence(task, now):
+    """
+    Returns when a newly scheduled recurring task first fires: its timestamp if given, the next cron time,
+    or now for interval tasks.
+    """
+    if task.get('timestamp'):
+        return task['timestamp']
+    if task.get('cron'):
+        return parse_cron(task['cron']).next_after(now)
+    return now
+
+
+def resolve_missed(task, fire_time, now):
+    """
+    Applies the task's catch-up policy to an occurrence that may already be in the past.
+
+    Args:
+        task (dict): The recurring task.
+        fire_time (float): The occurrence to run next.
+        now (float): The current time.
+
+    Returns:
+        tuple: (fire_time, due) of the occurrence to schedule. fire_time is the schedule slot the run belongs to
+        (the next occurrence is computed from it); due is when it should actually run.
+    """
+    if fire_time > now:
+        return fire_time, fire_time
+    policy = task.get('catch_up', 'once')
+    if policy not in CATCH_UP_POLICIES:
+        raise ValueError(f"Unknown catch-up policy: {policy}")
+    if policy == 'all':
+        return fire_time, fire_time
+
+    # Find the latest missed occurrence; interval schedules can jump there directly.
+    if task.get('cron'):
+        last_missed = fire_time
+        following = next_occurrence(task, last_missed)
+        while following <= now:
+            last_missed, following = following, next_occurrence(task, following)
+    else:
+        interval = task['interval']
+        last_missed = fire_time + ((now - fire_time) // interval) * interval
+        following = last_missed + interval
+
+    if policy == 'skip':
+        return following, following
+    return last_missed, now
@@ -0,0 +1,169 @@
+"""
+ring_buffer.py
+
+This module provides EventRingBuffer, the fixed-capacity store for the keystrokes and mouse actions captured by
+the ActivityMonitor. Events are kept column-wise in preallocated typed arrays (timestamps, kinds, codes and
+coordinates), so an event costs 21 bytes and no Python objects, appends are O(1), and the memory of a long-running
+monitor stays flat: once the buffer is full (or events pass the retention period) the oldest events are overwritten.
+
+Key and button names are interned into a small code table; see src/core/input_events.py for the event kinds.
+Analysis code can read the columns without copying through views(), which returns NumPy arrays when NumPy is
+installed and memoryviews otherwise.
+"""
+
+import threading
+from array import array
+
+from src.core.input_events import KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP, InputEvent
+
+try:
+    import numpy
+except ImportError:  # views() falls back to memoryviews
+    numpy = None
+
+# Event kinds whose code is an interned key or button name.
+_NAMED_KINDS = (KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP)
+
+# Column name -> array typecode.
+COLUMNS = (('time', 'd'), ('kind', 'B'), ('code', 'i'), ('x', 'i'), ('y', 'i'))
+
+
+class EventRingBuffer:
+    """
+    Fixed-capacity ring buffer of input events stored in typed arrays. Appends and reads are thread-safe.
+    """
+
+    def __init__(self, capacity, retention=None):
+        """
+        Args:
+            capacity (int): Maximum number of events kept; the oldest are overwritten beyond it.
+            retention (float, optional): Seconds events are kept; older events are dropped as new ones arrive.
+        """
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1.")
+        self.capacity = capacity
+        self.retention = retention
+        for name, typecode in COLUMNS:
+            setattr(self, '_' + name, array(typecode, bytes(array(typecode).itemsize * capacity)))
+        self._start = 0       # Index of the oldest event
+        self._size = 0
+        self.dropped = 0      # Events overwritten or expired since creation
+        self._names = []      # code -> key or button name
+        self._codes = {}      # key or button name -> code
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def nbytes(self):
+        """
+        Returns the bytes held by the event columns (independent of how many events are stored).
+        """
+        return sum(getattr(self, '_' + name).itemsize * self.capacity for name, _ in COLUMNS)
+
+    def code(self, name):
+        """
+        Returns the interned code of a key or button name. Called with the lock held.
+        """
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def name(self, code):
+        return self._names[code]
+
+    def append(self, timestamp, kind, x=0, y=0, key=None, code=0):
+        """
+        Appends an event in O(1).
+
+        Args:
+            timestamp (float): Event time; events are expected in time order.
+            kind (int): Event kind from input_events.
+            x, y (int): Pointer coordinates for mouse events.
+            key (str, optional): Key or button name for key and button events; interned into the code.
+            code (int): Raw code for other kinds (e.g. the scroll amount).
+        """
+        with self._lock:
+            if key is not None:
+                code = self.code(key)
+            if self.retention is not None:
+                self._expire(timestamp - self.retention)
+            if self._size == self.capacity:
+                index = self._start
+                self._start = (self._start + 1) % self.capacity
+                self.dropped += 1
+            else:
+                index = (self._start + self._size) % self.capacity
+                self._size += 1
+            self._time[index] = timestamp
+            self._kind[index] = kind
+            self._code[index] = code
+            self._x[index] = x
+            self._y[index] = y
+
+    def _expire(self, cutoff):
+        while self._size and self._time[self._start] < cutoff:
+            self._start = (self._start + 1) % self.capacity
+            self._size -= 1
+            self.dropped += 1
+
+    def expire(self, now):
+        """
+        Drops events older than the retention period, for buffers that have not received events for a while.
+        """
+        if self.retention is not None:
+            with self._lock:
+                self._expire(now - self.retention)
+
+    def clear(self):
+        with self._lock:
+            self.dropped += self._size
+            self._start = self._size = 0
+
+    def _segments(self):
+        """
+        Returns the (start, stop) index ranges holding the events, oldest first: one range, or two if wrapped.
+        """
+        end = self._start + self._size
+        if end <= self.capacity:
+            return [(self._start, end)]
+        return [(self._start, self.capacity), (0, end - self.capacity)]
+
+    def views(self):
+        """
+        Returns the stored events column-wise without copying.
+
+        Returns:
+            list: One dict per contiguous segment (two when the buffer has wrapped around), oldest first, mapping
+            each column name ('time', 'kind', 'code', 'x', 'y') to a NumPy array (or memoryview without NumPy)
+            over the buffer's memory. The views change as events are appended; copy them to keep a snapshot.
+        """
+        with self._lock:
+            segments = self._segments() if self._size else []
+        result = []
+        for start, stop in segments:
+            columns = {}
+            for name, _ in COLUMNS:
+                column = memoryview(getattr(self, '_' + name))[start:stop]
+                columns[name] = numpy.frombuffer(column, dtype=column.format) if numpy is not None else column
+            result.append(columns)
+        return result
+
+    def __iter__(self):
+        """
+        Yields the stored events as InputEvents, oldest first, with key and button names restored.
+        """
+        with self._lock:
+            segments = self._segments() if self._size else []
+            rows = [(self._time[i], self._kind[i], self._x[i], self._y[i], self._code[i])
+                    for start, stop in segments for i in range(start, stop)]
+        for timestamp, kind, x, y, code in rows:
+            yield InputEvent(timestamp, kind, x, y, self._names[code] if kind in _NAMED_KINDS else code)
+
+    def since(self, timestamp):
+        """
+        Returns the events at or after `timestamp`, oldest first.
+        """
+        return [event for event in self if event.time >= timestamp]
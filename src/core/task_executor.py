@@ -3,11 +3,23 @@
 This module is responsible for executing advanced tasks on the desktop, such as file management, 
 opening/closing applications, and GUI automation. The task executor takes input from various parts 
 of the program (such as the activity monitor or user commands) and carries out these tasks.
+
+The executors are registered by task type in executor_registry.py. GUI and browser backends are imported on
+first use, so file tasks run on headless machines without pyautogui, an X display or selenium.
 """
 
-import os
-import pyautogui  # GUI automation library
-import subprocess  # For running system commands
+from src.core.application_manager import get_application_manager
+from src.core.file_operations import run_file_operation
+from src.utils.constants import GUI_SCRIPT_PACE
+
+
+def _pyautogui():
+    """
+    Returns the PyAutoGUI module, importing it on first use (importing it connects to the display).
+    """
+    import pyautogui  # GUI automation library
+    return pyautogui
+
 
 def execute_file_management(task):
     """
@@ -15,43 +27,27 @@ def execute_file_management(task):
     
     Logic:
     - Task parameter should specify the type of operation (copy, move, delete, etc.), the source path, and the destination path if applicable.
-    - Depending on the operation, execute the file management command.
+    - Depending on the operation, runs it in-process with the file operations engine (src/core/file_operations.py)
+      rather than forking cp/mv/rm, so bulk jobs do not spawn a process per file.
+    - Failures are raised to the caller (the scheduler retries failed tasks); nothing is silently ignored.
+    - Batch tasks list several paths or glob patterns in 'sources' (or use the 'rename' operation with rename
+      rules); they run on a bounded thread pool and return one aggregated result.
 
     Interacts with:
     - The overall program by receiving tasks from other modules (like self-learning or user commands).
     - The error_handler module to retry or log any failures in file management.
-    
-    TODO:
-    - Add better error handling for specific file operations.
-    - Implement detailed logging for success and failure.
-    - Support more advanced file operations (e.g., compressing files, batch renaming).
+
+    Returns:
+        dict: The operation, source, destination and number of bytes copied, the aggregated batch result, or
+        the archive written or extracted by 'compress' and 'extract'.
     """
-    operation = task.get('operation')
-    source = task.get('source')
-    destination = task.get('destination', None)
-    
     try:
-        if operation == 'copy':
-            if destination:
-                subprocess.run(['cp', source, destination])  # For Unix-like systems; modify for other OS
-            else:
-                raise ValueError("Destination not provided for copy operation.")
-        elif operation == 'move':
-            if destination:
-                subprocess.run(['mv', source, destination])
-            else:
-                raise ValueError("Destination not provided for move operation.")
-        elif operation == 'delete':
-            subprocess.run(['rm', source])
-        elif operation == 'create':
-            os.makedirs(source, exist_ok=True)
-        else:
-            raise ValueError(f"Unknown file operation: {operation}")
+        return run_file_operation(task)
     except Exception as e:
         # Call error handler (future implementation)
         print(f"Error in file management: {str(e)}")
         # TODO: Handle retries with self-learning module
-        pass
+        raise
 
 
 def execute_gui_automation(task):
@@ -69,7 +65,7 @@ def execute_gui_automation(task):
     TODO:
     - Add functionality for detecting elements on the screen (e.g., using image recognition).
     - Implement more detailed error handling and retries.
-    - Extend support for multi-step GUI automation tasks.
+    - Multi-step GUI tasks use the 'gui_script' task type (execute_gui_script).
     """
     action = task.get('action')
     coordinates = task.get('coordinates', None)
@@ -78,12 +74,12 @@ def execute_gui_automation(task):
     try:
         if action == 'click':
             if coordinates:
-                pyautogui.click(coordinates[0], coordinates[1])
+                _pyautogui().click(coordinates[0], coordinates[1])
             else:
                 raise ValueError("Coordinates not provided for click action.")
         elif action == 'type':
             if text:
-                pyautogui.typewrite(text)
+                _pyautogui().typewrite(text)
             else:
                 raise ValueError("Text not provided for type action.")
         else:
@@ -95,37 +91,125 @@ def execute_gui_automation(task):
         pass
 
 
+def execute_gui_script(task):
+    """
+    Executes a GUI action script: a list of click/move/type/press/hotkey/scroll/wait steps run as one task.
+
+    Logic:
+    - Task parameter has 'steps', and optionally 'pace' (seconds after each input event) and 'verify'
+      (a screen check run once after the last step).
+    - Runs the steps with gui_control.run_action_script, which coalesces adjacent input events, so a long form
+      fill costs one scheduled task instead of one per action.
+
+    Interacts with:
+    - src/modules/gui_automation/gui_control.py, which sends the events through PyAutoGUI.
+
+    Returns:
+        dict: Steps run, events sent, elapsed time and the result of the screen check.
+    """
+    from src.modules.gui_automation.gui_control import run_action_script
+
+    steps = task.get('steps')
+    if not steps:
+        raise ValueError("Steps not provided for GUI action script.")
+    return run_action_script(steps, pace=task.get('pace', GUI_SCRIPT_PACE), verify=task.get('verify'))
+
+
+def execute_macro(task):
+    """
+    Replays a recorded macro file.
+
+    Logic:
+    - Task parameter has 'macro' (the file written by MacroRecorder.save), and optionally 'speed'
+      (e.g. 10 for ten times faster), 'max_idle' (longest recorded pause kept, in seconds) and 'verify'.
+
+    Interacts with:
+    - src/modules/gui_automation/macro.py, which turns the events into a gui_control action script.
+
+    Returns:
+        dict: The replay result, including the recorded and replayed durations.
+    """
+    from src.modules.gui_automation.macro import replay_macro
+
+    if not task.get('macro'):
+        raise ValueError("Macro file not provided for macro task.")
+    return replay_macro(task['macro'], speed=task.get('speed', 1.0), max_idle=task.get('max_idle'),
+                        verify=task.get('verify'))
+
+
 def execute_application_management(task):
     """
     Manages opening, closing, and switching between applications on the system.
 
     Logic:
-    - Task parameter specifies the action (open, close, switch) and the application name or path.
-    - For 'open', subprocess is used to launch the application.
-    - For 'close', the system kill command is used to terminate the application.
-    
+    - Task parameter specifies the action (open, close, switch, status) and the application name or path
+      ('app_name'), or several applications ('app_names') for close and status.
+    - For 'open', the application is launched without waiting for it ('args' are passed on the command line).
+    - For 'close', every process of the applications is asked to exit and killed after 'grace_period' seconds
+      if it has not; bulk closes scan the process table once.
+    - Running processes are found through the process index in src/core/application_manager.py.
+
     Interacts with:
     - The activity monitor to track the status of applications.
     - The error handler to manage failures or retries.
 
+    Returns:
+        The pid of a launched application, or per-application close results or status.
+
     TODO:
     - Add support for switching applications in different operating systems.
-    - Improve process handling for closing applications gracefully.
     """
     action = task.get('action')
-    app_name = task.get('app_name', None)
-    
+    app_names = task.get('app_names') or ([task['app_name']] if task.get('app_name') else [])
+
     try:
+        if action == 'switch':
+            _pyautogui().hotkey('alt', 'tab')  # Example for switching between applications
+            return None
+        if not app_names:
+            raise ValueError(f"Application name not provided for {action} action.")
+        manager = get_application_manager()
         if action == 'open':
-            subprocess.run([app_name])  # Assumes app_name is a valid command or path
+            return manager.launch(app_names[0], task.get('args', ()))
         elif action == 'close':
-            subprocess.run(['pkill', app_name])  # Unix-based system command
-        elif action == 'switch':
-            pyautogui.hotkey('alt', 'tab')  # Example for switching between applications
+            return manager.close(app_names, task.get('grace_period'))
+        elif action == 'status':
+            return manager.status(app_names)
         else:
             raise ValueError(f"Unknown application management action: {action}")
     except Exception as e:
         # Call error handler (future implementation)
         print(f"Error in application management: {str(e)}")
         # TODO: Add platform-specific handling for closing apps and switching windows.
-        pass
+        raise
+
+
+def execute_browser_automation(task):
+    """
+    Executes browser automation tasks through the browser_control module.
+
+    Logic:
+    - Task parameter specifies the action (open, navigate, fill_form, click, close) and its data
+      ('browser' and 'headless' for open, 'url', 'selector' and 'value').
+    - Selenium is only imported when the first browser task runs.
+
+    Interacts with:
+    - src/modules/browser_automation/browser_control.py, which owns the WebDriver session.
+
+    Returns:
+        The value returned by the browser_control function.
+    """
+    from src.modules.browser_automation import browser_control
+
+    action = task.get('action')
+    if action == 'open':
+        return browser_control.open_browser(task.get('browser', 'chrome'), task.get('headless', False))
+    if action == 'navigate':
+        return browser_control.navigate_to_url(task['url'])
+    if action == 'fill_form':
+        return browser_control.fill_form(task['selector'], task['value'])
+    if action == 'click':
+        return browser_control.click_element(task['selector'])
+    if action == 'close':
+        return browser_control.close_browser()
+    raise ValueError(f"Unknown browser automation action: {action}")
@@ -4,128 +4,1042 @@ task_scheduler.py
 This module is responsible for scheduling and managing task execution. It maintains a queue of tasks and ensures that tasks are executed in an efficient manner, accounting for retries in case of failure.
 """
 
+import heapq
+import itertools
+import logging
+import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.core.cancellation import CANCELLED, TIMEOUT, CancellationToken, TaskCancelled, TaskTimeout, use_token
+from src.core.executor_registry import default_registry
+from src.core.recurrence import first_occurrence, is_recurring, next_occurrence, resolve_missed
+from src.utils.constants import DEFAULT_TASK_TIMEOUT, RETRY_DELAY, TASK_TYPE_RESOURCES
+
+logger = logging.getLogger(__name__)
+
+# Priority classes in the order they are served. Unknown priorities are treated as 'medium'.
+PRIORITY_LEVELS = ('high', 'medium', 'low')
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(PRIORITY_LEVELS)}
+
+# Priorities served strictly ahead of the rest, in this order. Weighted sharing applies between the classes of
+# one strict priority and between all the other classes.
+STRICT_PRIORITIES = ('high',)
+
+# Default share of dispatches each priority class gets while several classes of the same tier have ready tasks.
+PRIORITY_WEIGHTS = {'high': 16, 'medium': 4, 'low': 1}
+
+# Seconds a ready task may wait before it is served ahead of the weighted order.
+AGING_INTERVAL = 30.0
+
+MAX_TASK_RETRIES = 3
+
+
+def _execute_task_function(function, args, kwargs):
+    """
+    Calls a task's function. Module level so that it can be sent to a process pool.
+    """
+    return function(*args, **kwargs)
+
+
+def _run_with_token(function, task, token):
+    """
+    Runs function(task) with the task's cancellation token as the current token of the worker thread.
+    """
+    with use_token(token):
+        return function(task)
+
+
+def _timed_call(function, *args):
+    """
+    Runs function(*args) on a pool worker and reports which worker ran it and for how long.
+
+    Returns:
+        tuple: (worker_id, busy_seconds, result, error). Errors are returned rather than raised
+        so the busy time of failed tasks is still accounted for.
+    """
+    worker_id = f"{os.getpid()}:{threading.current_thread().name}"
+    start = time.perf_counter()
+    try:
+        result, error = function(*args), None
+    except Exception as e:
+        result, error = None, e
+    return worker_id, time.perf_counter() - start, result, error
+
+
+class TaskQueue:
+    """
+    Time-aware, weighted fair queue for scheduled tasks.
+
+    Ready tasks are grouped into classes by (priority, category). Within a class, tasks run in due order,
+    then FIFO. Classes whose priority is in `strict_priorities` form tiers that are served strictly ahead of
+    the others, so high priority tasks never wait behind medium or low ones. Within a tier, dispatches are
+    shared in proportion to the class weights using self-clocked fair queuing: each class carries a virtual
+    finish tag that advances by 1/weight every time it is served, and the class with the smallest tag goes
+    next. A steady stream of medium priority work therefore slows low priority work down but cannot starve it.
+
+    On top of that, tasks age: once the next task of a class has been ready for `aging_interval` seconds it is
+    served ahead of the tiers and the weighted order, longest-waiting first. As long as the workers keep up with
+    the offered load, this bounds the queueing delay of every class at roughly aging_interval. Under sustained
+    overload every task ages, and the queue degrades to first-come, first-served rather than starving anyone.
+
+    Tasks due in the future live in a separate delayed heap ordered by due time and join their class once
+    their time arrives. push is O(log n); pop is O(log n + classes in the served tier), plus a scan of every
+    class only when the oldest next task may have aged.
+    """
+
+    def __init__(self, clock=time.time, priority_weights=None, category_weights=None, aging_interval=AGING_INTERVAL,
+                 strict_priorities=STRICT_PRIORITIES):
+        """
+        Args:
+            clock (callable): Returns the current time in seconds; defaults to time.time.
+            priority_weights (dict, optional): Weight of each priority class; defaults to PRIORITY_WEIGHTS.
+            category_weights (dict, optional): Weight multiplier per task['category']; unlisted categories get 1.
+            aging_interval (float, optional): Seconds a ready task may wait before it is served ahead of
+                the weighted order. None disables aging.
+            strict_priorities (tuple): Priorities served strictly ahead of the others, highest first.
+        """
+        self._clock = clock
+        self.priority_weights = dict(PRIORITY_WEIGHTS if priority_weights is None else priority_weights)
+        self.category_weights = dict(category_weights or {})
+        self.aging_interval = aging_interval
+        self._tiers = {priority: tier for tier, priority in enumerate(strict_priorities)}
+        # (priority, category) -> [finish tag of the next task, heap of (due, seq, ready_at, task), stride, rank, tier]
+        self._classes = {}
+        self._tier_classes = [{} for _ in range(len(strict_priorities) + 1)]  # The same entries, per tier
+        self._ready_count = 0
+        self._virtual_time = [0.0] * (len(strict_priorities) + 1)  # Finish tag of the last class served, per tier
+        self._aging_due = float('inf')  # No class's next task can be overdue before this time
+        self._delayed = []  # Heap of (due, seq, task)
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return self._ready_count + len(self._delayed)
+
+    def __bool__(self):
+        return bool(self._ready_count or self._delayed)
+
+    def task_class(self, task):
+        """
+        Returns the (priority, category) class a task is queued in. Unknown priorities count as 'medium'.
+        """
+        priority = task.get('priority', 'medium')
+        if priority not in self.priority_weights:
+            priority = 'medium'
+        return priority, task.get('category')
+
+    def _make_ready(self, due, seq, task, ready_at):
+        key = self.task_class(task)
+        entry = self._classes.get(key)
+        if entry is None:
+            priority, category = key
+            weight = self.priority_weights.get(priority, 1) * self.category_weights.get(category, 1)
+            stride = 1.0 / max(weight, 1e-9)
+            tier = self._tiers.get(priority, len(self._tiers))
+            # An idle class rejoins at the current virtual time of its tier, so it cannot bank credit while idle.
+            entry = self._classes[key] = [self._virtual_time[tier] + stride, [], stride, PRIORITY_RANK.get(priority, 1),
+                                          tier]
+            self._tier_classes[tier][key] = entry
+        heapq.heappush(entry[1], (due, seq, ready_at, task))
+        self._ready_count += 1
+        if self.aging_interval is not None and ready_at + self.aging_interval < self._aging_due:
+            self._aging_due = ready_at + self.aging_interval
+
+    def push(self, task, due=None):
+        """
+        Adds a task to the queue.
+
+        Args:
+            task (dict): The task to queue.
+            due (float, optional): When the task may run. Defaults to task['timestamp'], or now.
+        """
+        if due is None:
+            due = task.get('timestamp') or self._clock()
+        seq = next(self._sequence)
+        now = self._clock()
+        if due <= now:
+            self._make_ready(due, seq, task, now)
+        else:
+            heapq.heappush(self._delayed, (due, seq, task))
+
+    def promote_due(self, now=None):
+        """
+        Moves every delayed task whose due time has passed into its ready class.
+        """
+        now = self._clock() if now is None else now
+        while self._delayed and self._delayed[0][0] <= now:
+            due, seq, task = heapq.heappop(self._delayed)
+            self._make_ready(due, seq, task, due)
+
+    def pop(self, now=None):
+        """
+        Removes and returns the next task to run, or None if no task is due yet.
+        """
+        if self._delayed:
+            self.promote_due(now)
+        if not self._ready_count:
+            return None
+
+        classes = self._classes
+        best = None
+        if len(classes) > 1 and self._aging_due <= (self._clock() if now is None else now):
+            best = self._overdue(self._clock() if now is None else now)
+        if best is None:
+            for tier in self._tier_classes:  # The highest tier with ready tasks wins
+                if tier:
+                    break
+            if len(tier) == 1:
+                best = next(iter(tier.values()))
+            else:
+                for entry in tier.values():
+                    # Smallest finish tag wins; ties go to the higher priority class.
+                    if best is None or entry[0] < best[0] or (entry[0] == best[0] and entry[3] < best[3]):
+                        best = entry
+
+        heap = best[1]
+        task = heapq.heappop(heap)[3]
+        self._ready_count -= 1
+        tag = best[0]
+        virtual_time = self._virtual_time
+        if tag > virtual_time[best[4]]:
+            virtual_time[best[4]] = tag
+        if heap:
+            best[0] = tag + best[2]
+            ready_at = heap[0][2]
+            if self.aging_interval is not None and ready_at + self.aging_interval < self._aging_due:
+                self._aging_due = ready_at + self.aging_interval
+        else:
+            key = self.task_class(task)
+            del classes[key]  # Only classes with ready tasks are scanned
+            del self._tier_classes[best[4]][key]
+        return task
+
+    def _overdue(self, now):
+        """
+        Returns the class whose next task has been ready longest if that is at least aging_interval, and
+        moves the next aging check to when the oldest next task becomes overdue.
+        """
+        overdue = None
+        oldest = float('inf')
+        for entry in self._classes.values():
+            ready_at = entry[1][0][2]
+            if ready_at < oldest:
+                oldest, overdue = ready_at, entry
+        self._aging_due = oldest + self.aging_interval
+        return overdue if self._aging_due <= now else None
+
+    def remove(self, task_name):
+        """
+        Removes a queued task by name. This is a linear scan, meant for rare operations such as cancellation.
+
+        Returns:
+            dict: The removed task, or None if no queued task has that name.
+        """
+        for index, (_, _, task) in enumerate(self._delayed):
+            if task['task_name'] == task_name:
+                self._delayed[index] = self._delayed[-1]
+                self._delayed.pop()
+                heapq.heapify(self._delayed)
+                return task
+        for key, entry in self._classes.items():
+            heap = entry[1]
+            for index, item in enumerate(heap):
+                if item[3]['task_name'] == task_name:
+                    heap[index] = heap[-1]
+                    heap.pop()
+                    heapq.heapify(heap)
+                    self._ready_count -= 1
+                    if not heap:
+                        del self._classes[key]
+                        del self._tier_classes[entry[4]][key]
+                    elif self.aging_interval is not None and heap[0][2] + self.aging_interval < self._aging_due:
+                        self._aging_due = heap[0][2] + self.aging_interval
+                    return item[3]
+        return None
+
+    def next_due_in(self, now=None):
+        """
+        Returns the number of seconds until the next task becomes due.
+
+        Returns 0 if a task is ready now, and None if the queue is empty.
+        """
+        if self._ready_count:
+            return 0
+        if not self._delayed:
+            return None
+        now = self._clock() if now is None else now
+        return max(0.0, self._delayed[0][0] - now)
+
+
+def task_resources(task):
+    """
+    Returns the exclusive resources a task needs while it runs.
+
+    Resources come from task['resources'] (e.g. 'input_devices', 'browser:<session>', 'fs:<path>') plus any
+    implied by the task's 'type' (GUI tasks always need the input devices). 'fs:' paths are normalized so
+    different spellings of the same path conflict.
+    """
+    resources = set(TASK_TYPE_RESOURCES.get(task.get('type'), ()))
+    for resource in task.get('resources', ()):
+        if resource.startswith('fs:'):
+            resource = 'fs:' + os.path.normpath(os.path.abspath(resource[3:]))
+        resources.add(resource)
+    return frozenset(resources)
+
+
+class ResourceLocks:
+    """
+    Tracks which exclusive resources are held by running tasks.
+
+    A task that needs a resource already in use is parked on that resource instead of being retried in a loop,
+    and is handed back to the caller when the resource is released.
+    """
 
-class TaskScheduler:
     def __init__(self):
+        self._holders = {}  # resource -> name of the task holding it
+        self._parked = {}   # resource -> deque of tasks waiting for it
+
+    def try_acquire(self, task):
+        """
+        Acquires every resource the task needs, or none of them.
+
+        Returns:
+            bool: True if the task may run now. If False, the task has been parked on a busy resource.
+        """
+        resources = task_resources(task)
+        for resource in resources:
+            if resource in self._holders:
+                self._parked.setdefault(resource, deque()).append(task)
+                return False
+        for resource in resources:
+            self._holders[resource] = task['task_name']
+        return True
+
+    def release(self, task):
+        """
+        Releases the task's resources.
+
+        Returns:
+            list: Tasks that were parked on the released resources and should be queued again.
+        """
+        unparked = []
+        for resource in task_resources(task):
+            if self._holders.get(resource) == task['task_name']:
+                del self._holders[resource]
+                unparked.extend(self._parked.pop(resource, ()))
+        return unparked
+
+    def unpark(self, task_name):
+        """
+        Removes a parked task by name.
+
+        Returns:
+            dict: The task, or None if no task with that name is parked.
+        """
+        for resource, parked in self._parked.items():
+            for task in parked:
+                if task['task_name'] == task_name:
+                    parked.remove(task)
+                    if not parked:
+                        del self._parked[resource]
+                    return task
+        return None
+
+    def held(self):
+        """
+        Returns a mapping of busy resources to the names of the tasks holding them.
+        """
+        return dict(self._holders)
+
+
+def find_dependency_cycle(graph):
+    """
+    Finds a cycle in a dependency graph.
+
+    Args:
+        graph (dict): task name -> iterable of the task names it depends on.
+
+    Returns:
+        list: Task names forming a cycle, in dependency order, or an empty list if the graph is acyclic.
+    """
+    visiting, done = set(), set()
+    for root in graph:
+        if root in done:
+            continue
+        path = [root]
+        stack = [iter(graph.get(root, ()))]
+        visiting.add(root)
+        while stack:
+            dependency = next(stack[-1], None)
+            if dependency is None:
+                stack.pop()
+                node = path.pop()
+                visiting.discard(node)
+                done.add(node)
+            elif dependency in visiting:
+                return path[path.index(dependency):] + [dependency]
+            elif dependency not in done:
+                visiting.add(dependency)
+                path.append(dependency)
+                stack.append(iter(graph.get(dependency, ())))
+    return []
+
+
+class TaskScheduler:
+    def __init__(self, workers=1, process_workers=0, clock=time.time, sleep=None, store=None, admission=None,
+                 priority_weights=None, category_weights=None, aging_interval=AGING_INTERVAL, executors=None):
         """
         Initializes the task scheduler with a task queue and parameters.
-        
+
         Enhancements:
         - Added support for task priority levels.
         - Added a dictionary to track task statuses.
+        - Replaced the per-priority lists with a heap-backed, time-aware TaskQueue.
+        - Priorities share the workers by weight, with aging, so a stream of high priority tasks cannot starve low ones.
+        - Tasks are dispatched to a pool of worker threads, and optionally a process pool for CPU-bound work.
+        - Tasks that need the same exclusive resource (see task_resources) never run at the same time.
+        - Tasks can depend on other tasks (task['depends_on']) and are held back until those complete.
+        - The queue can be persisted to a TaskStore and is recovered from it on start-up.
+        - Tasks can recur on an interval or cron schedule (see recurrence.py).
+        - Low-priority tasks can be deferred while the system is under load (see admission_control.py).
+        - Every task runs under a deadline (task['timeout'], default DEFAULT_TASK_TIMEOUT) and can be cancelled,
+          paused or rescheduled (see cancellation.py).
+        - Tasks without a 'function' run through the executor registered for their 'type' (see executor_registry.py).
+
+        Args:
+            workers (int): Number of worker threads that run tasks concurrently.
+            process_workers (int): Number of worker processes for tasks marked 'cpu_bound'. 0 disables the process pool.
+            clock (callable): Time source used for due times; defaults to time.time.
+            sleep (callable, optional): Used to wait for the next due task when nothing is running.
+                Defaults to waiting on the scheduler's condition, so newly scheduled tasks wake it up.
+            store (TaskStore, optional): Persistent store for the queue. Pending tasks found in it are resumed,
+                and tasks that were running when the application stopped are resumed with status 'retry'.
+            admission (AdmissionController, optional): Defers deferrable tasks while CPU, memory or disk I/O
+                are over their thresholds. Deferred tasks have status 'deferred' and are requeued as load recovers.
+            priority_weights (dict, optional): Dispatch share of each priority class; defaults to PRIORITY_WEIGHTS.
+            category_weights (dict, optional): Dispatch share multiplier per task['category'].
+            aging_interval (float, optional): Seconds of waiting that raise a task's effective priority by one
+                dispatch turn of a weight-1 class. None disables aging.
+            executors (ExecutorRegistry, optional): Handlers for tasks by 'type'; defaults to the shared registry.
+                Backends are imported on first use.
         """
-        self.task_queue = []
+        self.workers = max(1, workers)
+        self.process_workers = max(0, process_workers)
+        self._clock = clock
+        self._sleep = sleep
+        self.task_queue = TaskQueue(clock=clock, priority_weights=priority_weights,
+                                    category_weights=category_weights, aging_interval=aging_interval)
         self.task_status = {}  # Track the status of each task
-        self.priority_levels = {'high': [], 'medium': [], 'low': []}  # Separate queues for different priority levels
+        self.resource_locks = ResourceLocks()
+
+        # The condition guards the queue, task_status and the bookkeeping below. Worker threads
+        # only report completions through it; the dispatcher loop in execute_tasks owns all state changes.
+        self._condition = threading.Condition(threading.RLock())
+        self._completed = deque()  # (task, future) pairs reported by pool callbacks
+        self._in_flight = {}      # Names of tasks currently running on a worker -> their CancellationToken
+        self._deadlines = []      # Heap of (deadline, seq, task name, token) of running tasks
+        self._deadline_sequence = itertools.count()
+        self._paused = {}         # task name -> paused task
+        self._worker_busy = {}    # worker id -> seconds spent running tasks
+        self._waiting = {}        # task name -> (task, names of dependencies not yet completed)
+        self._dependents = {}     # task name -> names of waiting tasks that depend on it
+        self._deferred = deque()  # Tasks held back by admission control, in the order they were deferred
+        self.admission = admission
+        self.executors = executors if executors is not None else default_registry
+
+        self._run_started = None
+        self._run_elapsed = 0.0
+        self._stopping = False
+
+        self.store = store
+        self._recovering = False
+        if store is not None:
+            self._recover()
 
     def schedule_task(self, task):
         """
         Schedules a task for execution.
-    
+
         Args:
             task (dict): A dictionary containing task information, such as task name, execution time, and priority.
-    
+                Optional keys: 'function', 'args' and 'kwargs' for the work to run, 'cpu_bound' to route the
+                task to the process pool, 'resources' listing exclusive resources the task needs, and
+                'depends_on' listing the names of tasks that must complete before this one runs.
+                Recurring tasks set 'interval' (seconds) or 'cron' (expression), and optionally 'catch_up'.
+                'timeout' sets the task's deadline in seconds (default DEFAULT_TASK_TIMEOUT; None for no deadline).
+
         This function:
-        1. Adds the task to the appropriate priority queue.
-        2. Assigns a schedule time for the task.
-        3. Ensures that tasks are executed based on their priority or timing.
-    
+        1. Adds the task to the task queue, keyed by its priority and due time.
+        2. Assigns a schedule time for the task (task['timestamp'], defaulting to now).
+        3. For recurring tasks, schedules the first occurrence; later ones are scheduled as each run finishes.
+        4. Holds the task back (status 'waiting') until every task in 'depends_on' has completed, or marks it
+           'skipped' if one of them has already failed.
+        5. Wakes up the dispatcher so the task is picked up as soon as it is due.
+
+        Raises:
+            ValueError: If the task's dependencies would form a cycle with tasks that are already waiting.
+
         Interactions:
         - This function interacts with task_executor to actually run the task when its turn arrives.
         - It can interact with error_handler if a task fails and needs to be re-queued.
-    
+        - It is safe to call from running tasks and other threads.
+
         Enhancements:
         - Added support for task priority levels (high, medium, low).
-        - Implemented a basic scheduling algorithm.
+        - Tasks with a future timestamp are held back until they are due.
+        - Added support for task dependencies (execute task B only after task A succeeds).
         """
-        priority = task.get('priority', 'medium')
-        if priority in self.priority_levels:
-            self.priority_levels[priority].append(task)
-        else:
-            self.priority_levels['medium'].append(task)
-        self.task_status[task['task_name']] = 'scheduled'
-        print(f"Task {task['task_name']} scheduled at {task['timestamp']} with priority {priority}")
+        with self._condition:
+            task_name = task['task_name']
+            if is_recurring(task) and 'fire_time' not in task:
+                task['fire_time'] = task['timestamp'] = first_occurrence(task, self._clock())
+            task.setdefault('timestamp', self._clock())
+
+            pending = set()
+            for dependency in task.get('depends_on', ()):
+                status = self.task_status.get(dependency)
+                if status in ('failed', 'skipped', 'cancelled'):
+                    logger.warning(f"Task {task_name} skipped because its dependency {dependency} {status}.")
+                    self._save_task(task, 'skipped')
+                    self._skip_dependents(task_name)
+                    return
+                if status != 'completed':
+                    pending.add(dependency)
+
+            if pending:
+                graph = {name: deps for name, (_, deps) in self._waiting.items()}
+                graph[task_name] = pending
+                cycle = find_dependency_cycle(graph)
+                if cycle:
+                    raise ValueError(f"Task {task_name} would create a dependency cycle: {' -> '.join(cycle)}")
+                self._save_task(task, 'waiting')  # Raises before the task is registered if it cannot be stored
+                self._waiting[task_name] = (task, pending)
+                for dependency in pending:
+                    self._dependents.setdefault(dependency, set()).add(task_name)
+                logger.debug(f"Task {task_name} waiting for {sorted(pending)}")
+                return
+
+            self._save_task(task, 'scheduled')  # Raises before the task is queued if it cannot be stored
+            self.task_queue.push(task, due=task['timestamp'])
+            logger.debug(f"Task {task_name} scheduled at {task['timestamp']} with priority {task.get('priority', 'medium')}")
+            self._condition.notify_all()
+
+    def _save_task(self, task, status):
+        """
+        Records the status of a newly scheduled (or rescheduled) task, persisting the whole task if a store is set.
+
+        Raises:
+            TypeError: If the task cannot be persisted; its status is then left unchanged.
+        """
+        if self.store is not None and not self._recovering:
+            self.store.save(task, status)
+        self.task_status[task['task_name']] = status
+
+    def _set_status(self, task_name, status):
+        """
+        Records a status change of a known task, persisting it if a store is set.
+        """
+        self.task_status[task_name] = status
+        if self.store is not None and not self._recovering:
+            self.store.update_status(task_name, status)
+
+    def _recover(self):
+        """
+        Reloads the queue from the store after a restart.
+
+        Finished tasks only have their status restored so that dependencies on them resolve. Pending tasks are
+        scheduled again; those that were in flight when the application stopped keep the status 'retry' until they run.
+        """
+        start = time.perf_counter()
+        finished, pending = self.store.recover()
+        with self._condition:
+            self._recovering = True
+            try:
+                self.task_status.update(finished)
+                now = self._clock()
+                for task, status in pending:
+                    if status == 'paused':
+                        self._paused[task['task_name']] = task
+                        self.task_status[task['task_name']] = 'paused'
+                        continue
+                    if status == 'scheduled' and is_recurring(task) and 'fire_time' in task:
+                        # Apply the catch-up policy to occurrences missed while the application was down.
+                        task['fire_time'], task['timestamp'] = resolve_missed(task, task['fire_time'], now)
+                    if task.get('depends_on'):
+                        self.schedule_task(task)
+                    else:
+                        # Fast path for the common case: no dependencies to resolve.
+                        self.task_queue.push(task, due=task.get('timestamp') or self._clock())
+                        self.task_status[task['task_name']] = 'scheduled'
+                    if status == 'retry' and self.task_status[task['task_name']] == 'scheduled':
+                        self.task_status[task['task_name']] = 'retry'
+            finally:
+                self._recovering = False
+        logger.info(f"Recovered {len(pending)} pending tasks from {self.store.path} in {time.perf_counter() - start:.2f}s")
+
+    def schedule_workflow(self, tasks):
+        """
+        Schedules a group of tasks that depend on each other, checking the whole graph for cycles first.
+
+        Args:
+            tasks (list): Task dicts whose 'depends_on' entries refer to each other (or to already scheduled tasks).
+
+        Raises:
+            ValueError: If the dependencies contain a cycle. No task is scheduled in that case.
+        """
+        with self._condition:
+            graph = {name: deps for name, (_, deps) in self._waiting.items()}
+            for task in tasks:
+                graph[task['task_name']] = [
+                    dependency for dependency in task.get('depends_on', ())
+                    if self.task_status.get(dependency) != 'completed'
+                ]
+            cycle = find_dependency_cycle(graph)
+            if cycle:
+                raise ValueError(f"Workflow contains a dependency cycle: {' -> '.join(cycle)}")
+            for task in tasks:
+                self.schedule_task(task)
+
+    def _schedule_next_occurrence(self, task):
+        """
+        Schedules the next run of a recurring task once the current run has finished, whether it succeeded or failed.
+        """
+        if not is_recurring(task):
+            return
+        fire_time, due = resolve_missed(task, next_occurrence(task, task['fire_time']), self._clock())
+        occurrence = {key: value for key, value in task.items() if key != 'retry_count'}
+        occurrence['fire_time'] = fire_time
+        occurrence['timestamp'] = due
+        self.schedule_task(occurrence)
+
+    def stop(self):
+        """
+        Asks a running execute_tasks to return once the tasks already running have finished.
+        Queued tasks, including the next occurrences of recurring tasks, stay queued.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+
+    def cancel(self, task_name):
+        """
+        Cancels a task. A queued, waiting, deferred or paused task is removed right away; a running task has its
+        cancellation token cancelled, which kills commands it runs through run_subprocess and makes its checks
+        raise TaskCancelled. Either way the task ends with status 'cancelled', no retry, and its dependents are
+        skipped. Future occurrences of a cancelled recurring task are not scheduled.
+
+        Returns:
+            bool: True if the task was found.
+        """
+        with self._condition:
+            token = self._in_flight.get(task_name)
+            if token is not None:
+                token.cancel(CANCELLED)
+                return True
+            if self._withdraw(task_name) is None:
+                return False
+            self._set_status(task_name, 'cancelled')
+            logger.info(f"Task {task_name} was cancelled.")
+            self._skip_dependents(task_name)
+            self._condition.notify_all()
+            return True
+
+    def pause(self, task_name):
+        """
+        Holds a task that has not started yet (status 'paused') until resume() is called. Running tasks
+        cannot be paused.
+
+        Returns:
+            bool: True if the task was paused.
+        """
+        with self._condition:
+            task = self._withdraw(task_name)
+            if task is None:
+                return False
+            self._paused[task_name] = task
+            self._set_status(task_name, 'paused')
+            return True
+
+    def resume(self, task_name):
+        """
+        Schedules a paused task again.
+
+        Returns:
+            bool: True if the task was paused.
+        """
+        with self._condition:
+            task = self._paused.pop(task_name, None)
+            if task is None:
+                return False
+            self.schedule_task(task)
+            return True
+
+    def reschedule(self, task_name, timestamp=None, priority=None):
+        """
+        Moves a task that has not started yet to a new due time and/or priority. A paused task is resumed.
+
+        Args:
+            task_name (str): The task to move.
+            timestamp (float, optional): The new due time; defaults to now.
+            priority (str, optional): The new priority; unchanged if not given.
+
+        Returns:
+            bool: True if the task was found.
+        """
+        with self._condition:
+            task = self._paused.pop(task_name, None) or self._withdraw(task_name)
+            if task is None:
+                return False
+            task['timestamp'] = self._clock() if timestamp is None else timestamp
+            if priority is not None:
+                task['priority'] = priority
+            self.schedule_task(task)
+            return True
+
+    def _withdraw(self, task_name):
+        """
+        Removes a task that has not started from wherever it is held: the queue, the dependency wait list,
+        the deferred list, a resource it is parked on, or the paused tasks.
+
+        Returns:
+            dict: The task, or None if it is not held anywhere.
+        """
+        task = self.task_queue.remove(task_name)
+        if task is None and task_name in self._waiting:
+            task, pending = self._waiting.pop(task_name)
+            for dependency in pending:
+                self._dependents.get(dependency, set()).discard(task_name)
+        if task is None:
+            for deferred in self._deferred:
+                if deferred['task_name'] == task_name:
+                    self._deferred.remove(deferred)
+                    task = deferred
+                    break
+        if task is None:
+            task = self.resource_locks.unpark(task_name)
+        if task is None:
+            task = self._paused.pop(task_name, None)
+        return task
+
+    def _release_dependents(self, task_name):
+        """
+        Queues every waiting task whose last outstanding dependency was the task that just completed.
+        """
+        for dependent in self._dependents.pop(task_name, ()):
+            entry = self._waiting.get(dependent)
+            if entry is None:
+                continue
+            task, pending = entry
+            pending.discard(task_name)
+            if not pending:
+                del self._waiting[dependent]
+                self.task_queue.push(task, due=task['timestamp'])
+                self._set_status(dependent, 'scheduled')
+
+    def _skip_dependents(self, task_name):
+        """
+        Marks every task downstream of a failed or cancelled task as 'skipped'. Unrelated branches keep running.
+        """
+        stack = [task_name]
+        while stack:
+            for dependent in self._dependents.pop(stack.pop(), ()):
+                if self._waiting.pop(dependent, None) is not None:
+                    self._set_status(dependent, 'skipped')
+                    logger.warning(f"Task {dependent} skipped because an upstream task failed.")
+                    stack.append(dependent)
 
     def execute_tasks(self):
         """
         Executes all scheduled tasks in the queue.
-        
+
         This function:
-        1. Iterates over the task queue and runs each task in turn.
-        2. Tracks which tasks succeed or fail, passing failures to the error handler.
-        
+        1. Dispatches the highest priority due tasks to the worker pool, up to the number of workers.
+           A task whose resources are busy is parked until they are released, and the next task is tried instead.
+           With admission control, deferrable tasks are held back while the system is under load.
+        2. When nothing can be dispatched, waits for a running task to finish or the next delayed task to become due.
+        3. Tracks which tasks succeed or fail, requeueing failures for a delayed retry.
+        4. Returns once the queue is empty, no task is deferred and every running task has finished,
+           or once stop() is called.
+           With recurring tasks queued, it runs until stop() is called.
+
         Interactions:
         - This function executes tasks using task_executor and monitors their completion.
-        - If a task fails, it calls error_handler to log the error and determine the next steps.
-        
-        Enhancements:
-        - Added support for task dependencies (execute task B only after task A succeeds).
-        - Implemented basic functionality to pause, cancel, or reschedule tasks.
-        """
-        while any(self.priority_levels.values()):
-            for priority in ['high', 'medium', 'low']:
-                if self.priority_levels[priority]:
-                    task = self.priority_levels[priority].pop(0)
-                    print(f"Executing task: {task['task_name']} with priority {priority}")
-
-                    # Placeholder for executing the task
-                    try:
-                        self.run_task(task)
-                    except Exception as e:
-                        # If task fails, pass it to error handler
-                        from core import error_handler
-                        error_handler.handle_error(e, task)
-                        self.requeue_task(task)
-    
+        - If a task fails, it logs the error and determines the next steps.
+        """
+        capacity = self.workers + self.process_workers
+        thread_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='task-worker')
+        process_pool = ProcessPoolExecutor(max_workers=self.process_workers) if self.process_workers else None
+        self._run_started = time.perf_counter()
+        self._stopping = False
+        try:
+            with self._condition:
+                while True:
+                    self._process_completed()
+                    self._dispatch_ready(capacity, lambda task: self._dispatch(task, thread_pool, process_pool))
+                    if self._run_finished():
+                        break
+                    if self._completed:
+                        continue
+                    timeout = self._idle_timeout(capacity)
+                    if self._sleep and not self._in_flight:
+                        self._sleep(timeout)
+                    else:
+                        self._condition.wait(timeout)
+        finally:
+            thread_pool.shutdown(wait=True)
+            if process_pool:
+                process_pool.shutdown(wait=True)
+            self._run_elapsed += time.perf_counter() - self._run_started
+            self._run_started = None
+            if self.store is not None:
+                self.store.flush()
+        logger.info(f"Worker utilization: {self.worker_utilization()}")
+
+    def _dispatch_ready(self, capacity, start):
+        """
+        Starts due tasks in priority order until `capacity` tasks are in flight, calling start(task) for each.
+
+        Tasks whose resources are busy are parked by the resource locks, and deferrable tasks refused by
+        admission control are set aside until load recovers. Called with the condition held.
+        """
+        self._enforce_deadlines()
+        self._readmit_deferred()
+        while not self._stopping and len(self._in_flight) < capacity:
+            task = self.task_queue.pop()
+            if task is None:
+                break
+            if self.admission is not None and not self.admission.admit(task):
+                self._deferred.append(task)
+                self._set_status(task['task_name'], 'deferred')
+                continue
+            if not self.resource_locks.try_acquire(task):
+                continue
+            task_name = task['task_name']
+            logger.debug(f"Executing task: {task_name} with priority {task.get('priority', 'medium')}")
+            self._set_status(task_name, 'running')
+            timeout = task.get('timeout', DEFAULT_TASK_TIMEOUT)
+            deadline = self._clock() + timeout if timeout else None
+            token = CancellationToken(deadline=deadline, clock=self._clock)
+            self._in_flight[task_name] = token
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (deadline, next(self._deadline_sequence), task_name, token))
+            if self.admission is not None:
+                self.admission.task_started(task)
+            start(task)
+
+    def _enforce_deadlines(self):
+        """
+        Cancels the tokens of running tasks whose deadline has passed, which kills commands they run through
+        run_subprocess and interrupts their waits. The tasks are reported as timed out once they return.
+        """
+        now = self._clock()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, task_name, token = heapq.heappop(self._deadlines)
+            if self._in_flight.get(task_name) is token and token.cancel(TIMEOUT):
+                logger.warning(f"Task {task_name} exceeded its deadline; cancelling it.")
+
+    def _readmit_deferred(self, everything=False):
+        """
+        Samples the system load and returns deferred tasks to the queue as far as admission control allows.
+        """
+        if self.admission is None:
+            return
+        self.admission.update()
+        slots = None if everything else self.admission.available_slots()
+        while self._deferred and (slots is None or slots > 0):
+            task = self._deferred.popleft()
+            self._set_status(task['task_name'], 'scheduled')
+            self.task_queue.push(task, due=task['timestamp'])
+            if slots is not None:
+                slots -= 1
+
+    def _run_finished(self):
+        """
+        Returns True once the run loop should exit: nothing is in flight or awaiting processing, and either
+        stop() was called or no queued or deferred work is left.
+        """
+        if self._in_flight or self._completed:
+            return False
+        if self._stopping:
+            self._readmit_deferred(everything=True)  # Keep deferred tasks queued for the next run
+        elif self.task_queue or self._deferred:
+            return False
+        self._warn_unresolved()
+        return True
+
+    def _idle_timeout(self, capacity):
+        """
+        Flushes the store and returns how long the run loop may wait before it has work to do (None means
+        until woken up). While tasks are deferred the loop wakes up at least every admission sample interval.
+        """
+        timeout = None if len(self._in_flight) >= capacity else self.task_queue.next_due_in()
+        while self._deadlines and self._in_flight.get(self._deadlines[0][2]) is not self._deadlines[0][3]:
+            heapq.heappop(self._deadlines)  # The task has already finished
+        if self._deadlines:
+            until_deadline = max(0.0, self._deadlines[0][0] - self._clock())
+            timeout = until_deadline if timeout is None else min(timeout, until_deadline)
+        if self._deferred:
+            interval = self.admission.sample_interval
+            timeout = interval if timeout is None else min(timeout, interval)
+        if self.store is not None:
+            self.store.flush()
+        return timeout
+
+    def metrics(self):
+        """
+        Returns a snapshot of the scheduler's state.
+
+        Returns:
+            dict: Counts of 'queued', 'running', 'waiting' (on dependencies), 'deferred' and 'paused' tasks, the
+            'admission_state' and sampled 'load' (None without admission control), and 'worker_utilization'.
+        """
+        with self._condition:
+            return {
+                'queued': len(self.task_queue),
+                'running': len(self._in_flight),
+                'waiting': len(self._waiting),
+                'deferred': len(self._deferred),
+                'paused': len(self._paused),
+                'admission_state': self.admission.state if self.admission is not None else None,
+                'load': dict(self.admission.load) if self.admission is not None else None,
+                'worker_utilization': self.worker_utilization(),
+            }
+
+    def _warn_unresolved(self):
+        """
+        Logs tasks still waiting on dependencies that were never scheduled when a run ends.
+        """
+        for task_name, (_, pending) in self._waiting.items():
+            logger.warning(f"Task {task_name} is still waiting for unscheduled dependencies: {sorted(pending)}")
+
+    def _dispatch(self, task, thread_pool, process_pool):
+        """
+        Submits a task to the thread pool, or to the process pool if it is CPU-bound.
+        """
+        if process_pool and task.get('cpu_bound') and task.get('function'):
+            # Only the function and its arguments cross the process boundary, so they must be picklable.
+            future = process_pool.submit(
+                _timed_call, _execute_task_function, task['function'], task.get('args', ()), task.get('kwargs', {})
+            )
+        else:
+            future = thread_pool.submit(_timed_call, _run_with_token, self.run_task, task, self._in_flight[task['task_name']])
+        future.add_done_callback(lambda f, task=task: self._report_completion(task, f))
+
+    def _report_completion(self, task, future):
+        """
+        Pool callback: hands a finished task back to the dispatcher loop.
+        """
+        with self._condition:
+            self._completed.append((task, future))
+            self._condition.notify_all()
+
+    def _process_completed(self):
+        """
+        Records the outcome of every finished task. Called by the dispatcher with the condition held.
+        """
+        while self._completed:
+            task, future = self._completed.popleft()
+            task_name = task['task_name']
+            token = self._in_flight.pop(task_name, None)
+            if self.admission is not None:
+                self.admission.task_finished(task)
+            for unparked in self.resource_locks.release(task):
+                self.task_queue.push(unparked, due=unparked['timestamp'])
+            if future.cancelled():  # A coroutine task cancelled before it started
+                error = TaskCancelled("Task was cancelled before it started")
+            else:
+                try:
+                    worker_id, busy, _result, error = future.result()
+                    if worker_id is not None:
+                        self._worker_busy[worker_id] = self._worker_busy.get(worker_id, 0.0) + busy
+                except Exception as e:  # The pool itself failed, e.g. an unpicklable function or a dead process
+                    error = e
+
+            if token is not None and token.reason == CANCELLED:
+                self._set_status(task_name, 'cancelled')
+                logger.info(f"Task {task_name} was cancelled.")
+                self._skip_dependents(task_name)
+            elif error is None:
+                self._set_status(task_name, 'completed')
+                logger.info(f"Task {task_name} completed successfully.")
+                self._release_dependents(task_name)
+                self._schedule_next_occurrence(task)
+            else:
+                if token is not None and token.reason == TIMEOUT and not isinstance(error, TaskTimeout):
+                    error = TaskTimeout(f"Task exceeded its deadline ({error})")
+                self._set_status(task_name, 'failed')
+                logger.error(f"Task {task_name} failed with error: {error}")
+                self.requeue_task(task)
+
+    def worker_utilization(self):
+        """
+        Reports how busy each worker has been across execute_tasks runs.
+
+        Returns:
+            dict: worker id ("<pid>:<thread name>") -> fraction of wall-clock run time spent executing tasks.
+        """
+        with self._condition:
+            elapsed = self._run_elapsed
+            if self._run_started is not None:
+                elapsed += time.perf_counter() - self._run_started
+            if not elapsed:
+                return {}
+            return {worker: round(busy / elapsed, 3) for worker, busy in sorted(self._worker_busy.items())}
+
     def run_task(self, task):
         """
-        Runs an individual task.
-        
+        Runs an individual task on a worker thread.
+
         Args:
             task (dict): The task information to be executed.
-        
+
+        Returns:
+            The return value of the task's function, if any.
+
         This function:
-        1. Executes the task logic (this will depend on the specific task).
-        2. Handles success and failure of the task, and provides feedback for retries.
-        
+        1. Executes the task logic: task['function'] called with task['args'] and task['kwargs'], or else the
+           executor registered for task['type'], which is imported the first time it is needed.
+        2. Raises on failure; the scheduler records the outcome and provides feedback for retries.
+
         Interactions:
         - Interacts with the error_handler if the task fails.
         - Will eventually interact with the feedback_generator to analyze task success and generate insights.
-        
-        Enhancements:
-        - Implemented actual task logic.
-        - Added more robust feedback and tracking of task outcomes (success/failure).
         """
-        try:
-            # Placeholder: Task execution logic goes here
-            time.sleep(1)  # Simulate task duration
-            self.task_status[task['task_name']] = 'completed'
-            print(f"Task {task['task_name']} completed successfully.")
-        except Exception as e:
-            self.task_status[task['task_name']] = 'failed'
-            print(f"Task {task['task_name']} failed with error: {e}")
-            raise e
+        function = task.get('function')
+        if function is None and task.get('type') in self.executors:
+            return self.executors.execute(task)
+        if function is None:
+            # Placeholder: tasks without a function simulate their duration
+            time.sleep(1)
+            return None
+        return _execute_task_function(function, task.get('args', ()), task.get('kwargs', {}))
+
     def requeue_task(self, task):
         """
         Requeues a task for another attempt.
-        
+
         Args:
             task (dict): The task information that failed and needs to be retried.
-        
+
         This function:
         1. Adds the task back to the queue with a modified approach (if applicable).
         2. Can adjust the priority or timing for the reattempt.
-        
+
         Enhancements:
         - Added logic to adjust task parameters for retries (e.g., change wait times, alternative methods).
+        - The retry is held in the delayed queue until its new timestamp instead of running immediately.
         """
-        print(f"Requeueing task: {task['task_name']}")
-        task['retry_count'] = task.get('retry_count', 0) + 1
-        if task['retry_count'] > 3:
-            print(f"Task {task['task_name']} failed after 3 retries.")
-            self.task_status[task['task_name']] = 'failed'
-        else:
-            # Adjust task parameters for retry
-            task['timestamp'] = time.time() + 5  # Retry after 5 seconds
-            self.schedule_task(task)
+        with self._condition:
+            logger.info(f"Requeueing task: {task['task_name']}")
+            task['retry_count'] = task.get('retry_count', 0) + 1
+            if task['retry_count'] > MAX_TASK_RETRIES:
+                logger.error(f"Task {task['task_name']} failed after {MAX_TASK_RETRIES} retries.")
+                self._set_status(task['task_name'], 'failed')
+                self._skip_dependents(task['task_name'])
+                self._schedule_next_occurrence(task)
+            else:
+                # Adjust task parameters for retry
+                task['timestamp'] = self._clock() + RETRY_DELAY
+                self.schedule_task(task)
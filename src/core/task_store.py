@@ -0,0 +1,223 @@
+"""
+task_store.py
+
+This module provides a durable store for the TaskScheduler's queue. Tasks and their statuses are kept in an
+SQLite database in WAL mode so that pending and retrying tasks survive a crash or restart of the application.
+Writes are buffered and committed in groups, so bursts of thousands of enqueues cost a handful of commits.
+"""
+
+import functools
+import importlib
+import inspect
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from src.utils.constants import TASK_STORE_PATH
+
+logger = logging.getLogger(__name__)
+
+# Statuses of tasks that still have work to do and are resumed after a restart.
+PENDING_STATUSES = ('scheduled', 'waiting', 'deferred', 'paused', 'running', 'retry')
+# Statuses of tasks that are finished; kept so dependencies on them resolve after a restart.
+FINISHED_STATUSES = ('completed', 'failed', 'skipped', 'cancelled')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    name    TEXT PRIMARY KEY,
+    status  TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+"""
+
+_UPSERT = "INSERT OR REPLACE INTO tasks (name, status, payload, updated) VALUES (?, ?, ?, ?)"
+_UPDATE_STATUS = "UPDATE tasks SET status = ?, updated = ? WHERE name = ?"
+
+_CALLABLE_KEY = '__callable__'
+_UNPERSISTABLE_KEY = '__unpersistable__'
+
+
+def encode_task(task, transient_keys=()):
+    """
+    Serializes a task dict to JSON.
+
+    Module-level functions are stored by import path ("module:qualname"). Callables that cannot be imported
+    again (lambdas, closures, bound methods) are recorded as unpersistable so recovery can report them.
+    """
+    payload = {key: value for key, value in task.items() if key not in transient_keys}
+    function = payload.get('function')
+    if function is not None:
+        module = getattr(function, '__module__', None)
+        qualname = getattr(function, '__qualname__', '')
+        if module and qualname and '<' not in qualname and not inspect.ismethod(function):
+            payload['function'] = {_CALLABLE_KEY: f"{module}:{qualname}"}
+        else:
+            payload['function'] = {_UNPERSISTABLE_KEY: repr(function)}
+    return json.dumps(payload, separators=(',', ':'))
+
+
+def decode_task(payload):
+    """
+    Restores a task dict serialized by encode_task.
+
+    Raises:
+        ValueError: If the task's function cannot be restored.
+    """
+    task = json.loads(payload)
+    function = task.get('function')
+    if isinstance(function, dict):
+        if _CALLABLE_KEY not in function:
+            raise ValueError(f"function {function.get(_UNPERSISTABLE_KEY)} was not persisted")
+        task['function'] = _resolve_callable(function[_CALLABLE_KEY])
+    return task
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_callable(path):
+    """
+    Imports a callable from a "module:qualname" path. Cached, since a large queue repeats the same few functions.
+    """
+    module_name, _, qualname = path.partition(':')
+    target = importlib.import_module(module_name)
+    for attribute in qualname.split('.'):
+        target = getattr(target, attribute)
+    return target
+
+
+class TaskStore:
+    """
+    SQLite-backed persistent store for scheduled tasks.
+
+    Writes are buffered and committed as one transaction once `batch_size` writes are pending or the oldest
+    pending write is `commit_interval` seconds old, and whenever flush() is called (the scheduler flushes
+    before it goes idle). A crash can therefore lose at most the last uncommitted batch.
+    """
+
+    def __init__(self, path=TASK_STORE_PATH, batch_size=1000, commit_interval=0.05):
+        """
+        Args:
+            path (str): Database file path.
+            batch_size (int): Pending writes that trigger a group commit.
+            commit_interval (float): Maximum age in seconds of a pending write before the next write commits it.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        self._pending = []  # (sql, params) in write order
+        self._oldest_pending = None
+
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL keeps the database consistent after a crash; only the last commits may be lost on power failure.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def save(self, task, status, transient_keys=()):
+        """
+        Buffers an insert or replacement of a task and its status.
+
+        Raises:
+            TypeError: If the task holds values that cannot be serialized to JSON.
+        """
+        self._write(_UPSERT, (task['task_name'], status, encode_task(task, transient_keys), time.time()))
+
+    def update_status(self, task_name, status):
+        """
+        Buffers a status change for a stored task.
+        """
+        self._write(_UPDATE_STATUS, (status, time.time(), task_name))
+
+    def _write(self, sql, params):
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            self._pending.append((sql, params))
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._oldest_pending >= self.commit_interval:
+                self._commit()
+
+    def flush(self):
+        """
+        Commits every buffered write.
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        cursor = self._connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            # Consecutive writes of the same kind go through one executemany; order is preserved.
+            start = 0
+            for end in range(1, len(pending) + 1):
+                if end == len(pending) or pending[end][0] != pending[start][0]:
+                    cursor.executemany(pending[start][0], [params for _, params in pending[start:end]])
+                    start = end
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def recover(self):
+        """
+        Loads the persisted queue after a restart.
+
+        Tasks that were running when the application stopped are marked 'retry'.
+
+        Returns:
+            tuple: (finished, pending) where finished maps task names to their final status and
+            pending is a list of (task, status) for tasks that still have to run. Tasks whose function
+            cannot be restored are marked 'failed' and reported in finished.
+        """
+        self.flush()
+        with self._lock:
+            self._connection.execute("UPDATE tasks SET status = 'retry' WHERE status = 'running'")
+            finished = dict(self._connection.execute(
+                f"SELECT name, status FROM tasks WHERE status IN ({','.join('?' * len(FINISHED_STATUSES))})",
+                FINISHED_STATUSES,
+            ))
+            rows = self._connection.execute(
+                f"SELECT name, status, payload FROM tasks WHERE status IN ({','.join('?' * len(PENDING_STATUSES))})",
+                PENDING_STATUSES,
+            ).fetchall()
+
+        pending = []
+        for name, status, payload in rows:
+            try:
+                pending.append((decode_task(payload), status))
+            except Exception as e:
+                logger.error(f"Task {name} could not be recovered: {e}")
+                finished[name] = 'failed'
+                self.update_status(name, 'failed')
+        self.flush()
+        return finished, pending
+
+    def purge_finished(self, older_than=None):
+        """
+        Deletes finished tasks, optionally only those last updated before the given timestamp.
+
+        Returns:
+            int: Number of tasks deleted.
+        """
+        self.flush()
+        with self._lock:
+            sql = f"DELETE FROM tasks WHERE status IN ({','.join('?' * len(FINISHED_STATUSES))})"
+            params = list(FINISHED_STATUSES)
+            if older_than is not None:
+                sql += " AND updated < ?"
+                params.append(older_than)
+            return self._connection.execute(sql, params).rowcount
+
+    def close(self):
+        """
+        Flushes pending writes and closes the database.
+        """
+        self.flush()
+        self._connection.close()
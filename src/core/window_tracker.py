@@ -0,0 +1,179 @@
+"""
+window_tracker.py
+
+This module reports changes of the focused window to the ActivityMonitor. On X11 the X11WindowTracker holds one
+connection to the X server and listens for PropertyNotify events on the root window's _NET_ACTIVE_WINDOW (set by
+the window manager on every focus change) and on the focused window's title, so changes are reported as they
+happen, without polling or forking. Without python-xlib or a display it falls back to PollingWindowTracker, which
+reads the title with xdotool every check interval as the monitor always did.
+
+Trackers are threads: start() begins tracking, stop() ends it, and on_change(title) is called from the tracker
+thread with each new title.
+"""
+
+import logging
+import os
+import select
+import threading
+
+try:
+    from Xlib import X, Xatom, display as xdisplay, error as xerror
+except ImportError:  # Without python-xlib the window is polled with xdotool
+    xdisplay = None
+
+logger = logging.getLogger(__name__)
+
+
+def read_active_window_xdotool():
+    """
+    Returns the title of the focused window by running xdotool.
+    """
+    return os.popen('xdotool getwindowfocus getwindowname').read().strip()
+
+
+class WindowTracker(threading.Thread):
+    """
+    Base class of the window trackers: reports a title to on_change whenever it differs from the last one.
+    """
+
+    def __init__(self, on_change):
+        super().__init__(name='window-tracker', daemon=True)
+        self.on_change = on_change
+        self.title = None
+        self._stopping = threading.Event()
+
+    def _report(self, title):
+        if title != self.title:
+            self.title = title
+            self.on_change(title)
+
+    def stop(self):
+        self._stopping.set()
+
+
+class PollingWindowTracker(WindowTracker):
+    """
+    Reads the focused window's title every `interval` seconds.
+    """
+
+    def __init__(self, on_change, read=read_active_window_xdotool, interval=5.0):
+        super().__init__(on_change)
+        self._read = read
+        self.interval = interval
+
+    def run(self):
+        while not self._stopping.is_set():
+            try:
+                self._report(self._read())
+            except Exception as e:
+                logger.error(f"Error retrieving active window: {e}")
+            self._stopping.wait(self.interval)
+
+
+class X11WindowTracker(WindowTracker):
+    """
+    Follows focus and title changes through X11 property change events on a single connection.
+    """
+
+    def __init__(self, on_change, display_name=None):
+        """
+        Args:
+            on_change (callable): Called with the new title of the focused window.
+            display_name (str, optional): X display to connect to; defaults to $DISPLAY.
+
+        Raises:
+            Xlib.error.DisplayError: If the X server cannot be reached.
+        """
+        super().__init__(on_change)
+        self._display = xdisplay.Display(display_name)
+        self._root = self._display.screen().root
+        self._net_active_window = self._display.intern_atom('_NET_ACTIVE_WINDOW')
+        self._net_wm_name = self._display.intern_atom('_NET_WM_NAME')
+        self._utf8_string = self._display.intern_atom('UTF8_STRING')
+        self._window = None
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._wake_read, self._wake_write = os.pipe()  # Written by stop() to interrupt select()
+        self._close_lock = threading.Lock()
+
+    def _active_window(self):
+        prop = self._root.get_full_property(self._net_active_window, X.AnyPropertyType)
+        if prop is None or not len(prop.value) or not prop.value[0]:
+            return None
+        return self._display.create_resource_object('window', prop.value[0])
+
+    def _title(self, window):
+        try:
+            prop = window.get_full_property(self._net_wm_name, self._utf8_string)
+            if prop is not None and prop.value:
+                value = prop.value
+                return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+            name = window.get_wm_name()
+            return name.decode('latin-1') if isinstance(name, bytes) else (name or '')
+        except xerror.XError:  # The window was destroyed
+            return ''
+
+    def _refresh(self):
+        """
+        Reads the focused window and its title, and follows title changes of a newly focused window.
+        """
+        window = self._active_window()
+        if window is not None and (self._window is None or window.id != self._window.id):
+            window.change_attributes(event_mask=X.PropertyChangeMask, onerror=xerror.CatchError())
+        if self._window is not None and (window is None or window.id != self._window.id):
+            self._window.change_attributes(event_mask=X.NoEventMask, onerror=xerror.CatchError())
+        self._window = window
+        self._report(self._title(window) if window is not None else '')
+        self._display.flush()
+
+    def run(self):
+        watched = (self._net_active_window, self._net_wm_name, Xatom.WM_NAME)
+        try:
+            self._refresh()
+            while not self._stopping.is_set():
+                # Replies to our own requests can leave events queued inside Xlib, so only block when none are.
+                if not self._display.pending_events():
+                    readable, _, _ = select.select([self._display, self._wake_read], [], [])
+                    if self._wake_read in readable:
+                        break
+                changed = False
+                while self._display.pending_events():
+                    event = self._display.next_event()
+                    if event.type == X.PropertyNotify and event.atom in watched:
+                        changed = True
+                if changed:
+                    self._refresh()
+        except Exception as e:
+            logger.error(f"X11 window tracking stopped: {e}")
+        finally:
+            self._close()
+
+    def _close(self):
+        with self._close_lock:
+            if self._wake_write is None:
+                return
+            self._display.close()
+            os.close(self._wake_read)
+            os.close(self._wake_write)
+            self._wake_write = None
+
+    def stop(self):
+        super().stop()
+        if self.ident is None:  # Never started
+            self._close()
+            return
+        with self._close_lock:
+            if self._wake_write is not None:
+                os.write(self._wake_write, b'\0')
+
+
+def create_window_tracker(on_change, read=read_active_window_xdotool, interval=5.0):
+    """
+    Returns an X11WindowTracker if python-xlib is installed and the X display can be opened, and a
+    PollingWindowTracker using `read` every `interval` seconds otherwise.
+    """
+    if xdisplay is not None and os.environ.get('DISPLAY'):
+        try:
+            return X11WindowTracker(on_change)
+        except Exception as e:
+            logger.warning(f"Cannot connect to the X display ({e}); polling the active window instead.")
+    return PollingWindowTracker(on_change, read, interval)
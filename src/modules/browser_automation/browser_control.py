@@ -13,6 +13,8 @@ from selenium.webdriver.support import expected_conditions as EC
 import time
 import re
 
+from src.core.cancellation import TaskCancelled, bounded_timeout
+
 # Placeholder for the browser driver (e.g., ChromeDriver)
 driver = None
 
@@ -86,9 +88,11 @@ def navigate_to_url(url):
         try:
             driver.get(url)
             print(f"Navigated to {url}")
-            WebDriverWait(driver, 10).until(
+            WebDriverWait(driver, bounded_timeout(10)).until(
                 EC.presence_of_element_located((By.TAG_NAME, 'body'))
             )
+        except TaskCancelled:
+            raise
         except Exception as e:
             print(f"Error occurred while navigating to {url}: {e}")
     else:
@@ -116,12 +120,14 @@ def fill_form(input_selector, input_value):
     """
     if driver:
         try:
-            input_element = WebDriverWait(driver, 10).until(
+            input_element = WebDriverWait(driver, bounded_timeout(10)).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, input_selector))
             )
             input_element.clear()
             input_element.send_keys(input_value)
             print(f"Filled form input with {input_value}.")
+        except TaskCancelled:
+            raise
         except Exception as e:
             print(f"Error occurred while filling form: {e}")
     else:
@@ -147,11 +153,13 @@ def click_element(button_selector):
     """
     if driver:
         try:
-            button_element = WebDriverWait(driver, 10).until(
+            button_element = WebDriverWait(driver, bounded_timeout(10)).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, button_selector))
             )
             button_element.click()
             print(f"Clicked element with selector {button_selector}.")
+        except TaskCancelled:
+            raise
         except Exception as e:
             print(f"Error occurred while clicking the element: {e}")
     else:
@@ -4,9 +4,27 @@
 This file contains methods for controlling the GUI (Graphical User Interface) of the desktop.
 It provides functions to simulate mouse clicks, keyboard inputs, and other interactions with
 the desktop environment.
+
+Multi-step interactions such as form fills run as one action script (run_action_script), which coalesces
+input events and paces them instead of paying PyAutoGUI's pause and a log line per call.
 """
 
-import pyautogui  # A library for GUI automation.
+import logging
+import time
+
+from src.core.cancellation import check_cancelled, current_token
+from src.utils.constants import GUI_SCRIPT_PACE
+
+logger = logging.getLogger(__name__)
+
+
+def _pyautogui():
+    """
+    Returns the PyAutoGUI module, imported on first use so that importing this module does not need a display.
+    """
+    import pyautogui  # A library for GUI automation.
+    return pyautogui
+
 
 def mouse_click(x, y, button="left"):
     """
@@ -33,7 +51,7 @@ def mouse_click(x, y, button="left"):
     """
     try:
         print(f"Clicking at ({x}, {y}) with {button} button.")
-        pyautogui.click(x=x, y=y, button=button)
+        _pyautogui().click(x=x, y=y, button=button)
     except Exception as e:
         print(f"Error during mouse click: {e}")
         # TODO: Implement error handling and retry logic.
@@ -63,7 +81,7 @@ def keyboard_input(text):
     """
     try:
         print(f"Typing text: {text}")
-        pyautogui.typewrite(text)
+        _pyautogui().typewrite(text)
     except Exception as e:
         print(f"Error during keyboard input: {e}")
         # TODO: Implement error handling and retry logic.
@@ -94,7 +112,7 @@ def move_mouse(x, y):
     """
     try:
         print(f"Moving mouse to ({x}, {y}).")
-        pyautogui.moveTo(x=x, y=y)
+        _pyautogui().moveTo(x=x, y=y)
     except Exception as e:
         print(f"Error during mouse move: {e}")
         # TODO: Implement error handling and retry logic.
@@ -123,8 +141,147 @@ def scroll_mouse(amount):
     """
     try:
         print(f"Scrolling mouse by {amount}.")
-        pyautogui.scroll(amount)
+        _pyautogui().scroll(amount)
     except Exception as e:
         print(f"Error during mouse scroll: {e}")
         # TODO: Implement error handling and retry logic.
         pass
+
+
+# Actions understood by run_action_script (the arguments of each are described in its docstring).
+ACTION_SCRIPT_STEPS = ('click', 'move', 'type', 'press', 'hotkey', 'scroll', 'wait',
+                       'key_down', 'key_up', 'mouse_down', 'mouse_up')
+
+
+class ActionScriptError(Exception):
+    """
+    Raised when an action script is malformed or its final screen check fails.
+    """
+
+
+def _coalesce_steps(steps):
+    """
+    Merges steps that can be sent to the display as one event stream:
+    - consecutive 'type' steps become one typewrite call;
+    - consecutive presses of the same key become one press call with a repeat count;
+    - a 'move' immediately followed by a 'move', or by a click at explicit coordinates, is dropped.
+
+    Returns:
+        list: The coalesced steps (new dicts; the script itself is not modified).
+    """
+    coalesced = []
+    for step in steps:
+        action = step.get('action')
+        if action not in ACTION_SCRIPT_STEPS:
+            raise ActionScriptError(f"Unknown action script step: {action}")
+        previous = coalesced[-1] if coalesced else None
+        if previous is not None:
+            if action == 'type' and previous['action'] == 'type' and step.get('interval') == previous.get('interval'):
+                previous['text'] += step['text']
+                continue
+            if action == 'press' and previous['action'] == 'press' and previous['key'] == step['key']:
+                previous['presses'] = previous.get('presses', 1) + step.get('presses', 1)
+                continue
+            if previous['action'] == 'move' and not previous.get('duration') and (
+                    action == 'move' or (action == 'click' and step.get('x') is not None)):
+                coalesced.pop()
+        coalesced.append(dict(step))
+    return coalesced
+
+
+def _check_screen(backend, verify):
+    """
+    Performs the final screen check of an action script.
+
+    verify is {'image': path, 'confidence': float, 'region': (x, y, w, h)} to look for an image on screen,
+    or {'pixel': (x, y), 'color': (r, g, b), 'tolerance': int} to compare a single pixel.
+    """
+    if 'image' in verify:
+        options = {key: verify[key] for key in ('confidence', 'region', 'grayscale') if key in verify}
+        try:
+            found = backend.locateOnScreen(verify['image'], **options)
+        except Exception as e:  # PyAutoGUI raises ImageNotFoundException in newer releases
+            if type(e).__name__ != 'ImageNotFoundException':
+                raise
+            found = None
+        if found is None:
+            raise ActionScriptError(f"Screen check failed: {verify['image']} is not on screen")
+        return found
+    x, y = verify['pixel']
+    if not backend.pixelMatchesColor(x, y, tuple(verify['color']), tolerance=verify.get('tolerance', 0)):
+        raise ActionScriptError(f"Screen check failed: pixel ({x}, {y}) is not {tuple(verify['color'])}")
+    return True
+
+
+def run_action_script(steps, pace=GUI_SCRIPT_PACE, verify=None, backend=None):
+    """
+    Runs a list of GUI steps as one unit.
+
+    Parameters:
+    - steps (list): Step dicts with an 'action' of
+        'click' (x, y, button, clicks), 'move' (x, y, duration), 'type' (text, interval),
+        'press' (key, presses), 'hotkey' (keys), 'scroll' (amount, x, y), 'wait' (seconds), or the raw
+        'key_down'/'key_up' (key) and 'mouse_down'/'mouse_up' (x, y, button) used to replay macros.
+    - pace (float): Seconds to pause after each event sent to the display. This replaces pyautogui.PAUSE
+      (0.1s by default) for the duration of the script; set it to what the target application keeps up with.
+    - verify (dict, optional): A single screen check run after the last step (see _check_screen).
+    - backend (module, optional): The PyAutoGUI module or a stand-in with the same functions; used by tests.
+
+    Logic:
+    1. Coalesce the steps: adjacent text is typed in one call, repeated key presses are sent with a repeat
+       count, and mouse moves that a later move or click supersedes are dropped.
+    2. Send the events with the given pacing, checking between steps whether the task has been cancelled.
+       'wait' steps wake up early on cancellation.
+    3. Check the screen once at the end, instead of after every step.
+    4. Log one line for the whole script.
+
+    Returns:
+    - dict: 'steps' (as given), 'events' (sent after coalescing), 'elapsed' seconds and 'verified'.
+
+    Interactions with the system:
+    - Run by the 'gui_script' task type (see task_executor.execute_gui_script), so a whole form fill
+      is a single scheduled task holding the input devices, rather than one task per keystroke.
+    """
+    backend = backend if backend is not None else _pyautogui()
+    coalesced = _coalesce_steps(steps)
+    start = time.perf_counter()
+    previous_pause = backend.PAUSE
+    backend.PAUSE = pace
+    try:
+        for step in coalesced:
+            check_cancelled()
+            action = step['action']
+            if action == 'click':
+                backend.click(x=step.get('x'), y=step.get('y'), button=step.get('button', 'left'),
+                              clicks=step.get('clicks', 1))
+            elif action == 'move':
+                backend.moveTo(step['x'], step['y'], duration=step.get('duration', 0))
+            elif action == 'type':
+                backend.typewrite(step['text'], interval=step.get('interval', 0))
+            elif action == 'press':
+                backend.press(step['key'], presses=step.get('presses', 1))
+            elif action == 'hotkey':
+                backend.hotkey(*step['keys'])
+            elif action == 'scroll':
+                backend.scroll(step['amount'], x=step.get('x'), y=step.get('y'))
+            elif action == 'key_down':
+                backend.keyDown(step['key'])
+            elif action == 'key_up':
+                backend.keyUp(step['key'])
+            elif action == 'mouse_down':
+                backend.mouseDown(x=step.get('x'), y=step.get('y'), button=step.get('button', 'left'))
+            elif action == 'mouse_up':
+                backend.mouseUp(x=step.get('x'), y=step.get('y'), button=step.get('button', 'left'))
+            elif action == 'wait':
+                token = current_token()
+                if token is not None:
+                    token.wait(step['seconds'])
+                else:
+                    time.sleep(step['seconds'])
+        check_cancelled()
+        verified = _check_screen(backend, verify) if verify else None
+    finally:
+        backend.PAUSE = previous_pause
+    elapsed = time.perf_counter() - start
+    logger.info(f"Ran GUI action script: {len(steps)} steps as {len(coalesced)} events in {elapsed:.2f}s")
+    return {'steps': len(steps), 'events': len(coalesced), 'elapsed': elapsed, 'verified': verified}
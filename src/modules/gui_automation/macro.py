@@ -0,0 +1,172 @@
+# /DesktopAutomationAI/src/modules/gui_automation/macro.py
+
+"""
+This file contains the macro recorder and replayer. The recorder collects the keyboard and mouse events
+captured by the ActivityMonitor (or any pynput listener) with their timestamps and saves them to a compact
+binary macro file (see src/core/input_events.py). The replayer turns a macro back into a gui_control action
+script, optionally faster than it was recorded and with long idle gaps shortened, so repetitive work done once
+by hand can be repeated many times faster.
+"""
+
+import logging
+import threading
+import time
+
+from src.core.input_events import (
+    KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_MOVE, MOUSE_UP, SCROLL, InputEvent, button_name, key_name, read_events,
+    write_events,
+)
+from src.modules.gui_automation.gui_control import run_action_script
+
+logger = logging.getLogger(__name__)
+
+# Gaps shorter than this are carried over to the next wait rather than slept on their own.
+MIN_REPLAY_WAIT = 0.002
+
+# Minimum seconds between two recorded mouse moves; the moves in between are dropped.
+MOVE_SAMPLE_INTERVAL = 0.02
+
+
+class MacroRecorder:
+    """
+    Records input events. Its callbacks have the signatures of pynput's listener callbacks, so it can be attached
+    to an ActivityMonitor (attach) or passed to pynput listeners directly.
+    """
+
+    def __init__(self, record_moves=True, move_interval=MOVE_SAMPLE_INTERVAL, clock=time.monotonic):
+        """
+        Parameters:
+        - record_moves (bool): Whether to record mouse movement between clicks. Clicks always record their position.
+        - move_interval (float): Minimum seconds between two recorded moves.
+        - clock (callable): Time source for the event timestamps.
+        """
+        self.events = []
+        self.record_moves = record_moves
+        self.move_interval = move_interval
+        self._clock = clock
+        self._last_move = None
+        self._recording = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._recording = True
+
+    def stop(self):
+        self._recording = False
+
+    def attach(self, monitor):
+        """
+        Subscribes the recorder to an ActivityMonitor's input events and starts recording.
+        """
+        monitor.add_input_listener(self)
+        self.start()
+
+    def _record(self, kind, x=0, y=0, key=None):
+        if not self._recording:
+            return
+        with self._lock:
+            self.events.append(InputEvent(self._clock(), kind, x, y, key))
+
+    def on_key_press(self, key):
+        name = key_name(key)
+        if name is not None:
+            self._record(KEY_DOWN, key=name)
+
+    def on_key_release(self, key):
+        name = key_name(key)
+        if name is not None:
+            self._record(KEY_UP, key=name)
+
+    def on_click(self, x, y, button, pressed):
+        name = button_name(button)
+        if name is not None:
+            self._record(MOUSE_DOWN if pressed else MOUSE_UP, x, y, name)
+
+    def on_move(self, x, y):
+        if not self.record_moves:
+            return
+        now = self._clock()
+        if self._last_move is not None and now - self._last_move < self.move_interval:
+            return
+        self._last_move = now
+        self._record(MOUSE_MOVE, x, y)
+
+    def on_scroll(self, x, y, dx, dy):
+        if dy:
+            self._record(SCROLL, x, y, dy)
+
+    def save(self, path):
+        """
+        Writes the recorded events to a macro file and returns the number of events written.
+        """
+        with self._lock:
+            events = list(self.events)
+        count = write_events(path, events)
+        logger.info(f"Saved macro with {count} events to {path}")
+        return count
+
+
+def macro_steps(events, speed=1.0, max_idle=None):
+    """
+    Converts recorded events into gui_control action script steps.
+
+    Parameters:
+    - events (list): InputEvents in time order.
+    - speed (float): Replay speed multiplier; 10 replays ten times faster than recorded.
+    - max_idle (float, optional): Longest pause, in recorded seconds, kept between two events. Longer idle gaps
+      (the user reading, thinking or away) are shortened to this before the speed multiplier is applied.
+
+    Returns:
+    - list: Steps for run_action_script, with 'wait' steps reproducing the (scaled) timing.
+    """
+    if speed <= 0:
+        raise ValueError("Replay speed must be positive.")
+    steps = []
+    pending_wait = 0.0
+    previous_time = events[0].time if events else 0.0
+    for event in events:
+        gap = event.time - previous_time
+        previous_time = event.time
+        if max_idle is not None:
+            gap = min(gap, max_idle)
+        pending_wait += gap / speed
+        if pending_wait >= MIN_REPLAY_WAIT:
+            steps.append({'action': 'wait', 'seconds': pending_wait})
+            pending_wait = 0.0
+
+        if event.kind == KEY_DOWN:
+            steps.append({'action': 'key_down', 'key': event.key})
+        elif event.kind == KEY_UP:
+            steps.append({'action': 'key_up', 'key': event.key})
+        elif event.kind == MOUSE_DOWN:
+            steps.append({'action': 'mouse_down', 'x': event.x, 'y': event.y, 'button': event.key})
+        elif event.kind == MOUSE_UP:
+            steps.append({'action': 'mouse_up', 'x': event.x, 'y': event.y, 'button': event.key})
+        elif event.kind == MOUSE_MOVE:
+            steps.append({'action': 'move', 'x': event.x, 'y': event.y})
+        elif event.kind == SCROLL:
+            steps.append({'action': 'scroll', 'amount': event.key, 'x': event.x, 'y': event.y})
+    return steps
+
+
+def replay_macro(macro, speed=1.0, max_idle=None, verify=None, backend=None):
+    """
+    Replays a macro through gui_control.
+
+    Parameters:
+    - macro (str or list): A macro file path or a list of InputEvents.
+    - speed (float): Replay speed multiplier.
+    - max_idle (float, optional): Longest recorded pause kept between events (see macro_steps).
+    - verify (dict, optional): Screen check run once after the replay, as for run_action_script.
+    - backend (module, optional): PyAutoGUI stand-in, for tests.
+
+    Returns:
+    - dict: The run_action_script result, with 'recorded' (seconds the recording took).
+    """
+    events = read_events(macro) if isinstance(macro, str) else list(macro)
+    steps = macro_steps(events, speed=speed, max_idle=max_idle)
+    result = run_action_script(steps, pace=0.0, verify=verify, backend=backend)
+    result['recorded'] = events[-1].time - events[0].time if events else 0.0
+    logger.info(f"Replayed {len(events)} events recorded over {result['recorded']:.1f}s "
+                f"in {result['elapsed']:.1f}s")
+    return result
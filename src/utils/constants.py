@@ -7,10 +7,28 @@ and provide a centralized place for configuration and shared settings.
 # Time-related constants
 DEFAULT_TASK_TIMEOUT = 30  # Default timeout (in seconds) for task execution across the entire program.
 RETRY_DELAY = 5            # Delay (in seconds) between retries for failed tasks.
+GUI_SCRIPT_PACE = 0.01     # Pause (in seconds) after each input event of a GUI action script.
 
 # Path-related constants
 LOGS_PATH = "./data/logs/"  # Directory path for storing log files.
 MODELS_PATH = "./data/models/"  # Directory path for storing machine learning models.
+TASK_STORE_PATH = "./data/task_queue.db"  # SQLite database backing the persistent task queue.
+HASH_CACHE_PATH = "./data/hash_cache.db"  # SQLite cache of file content hashes used by incremental sync.
+ACTIVITY_STORE_PATH = "./data/activity/"  # Day-partitioned columnar store of captured activity.
+
+# Activity monitoring
+INPUT_BUFFER_CAPACITY = 262144  # Keystrokes (and, separately, mouse actions) kept in memory by the ActivityMonitor.
+INPUT_RETENTION = 24 * 3600     # Seconds captured input events are kept in memory.
+INPUT_SUMMARY_INTERVAL = 60     # Seconds between the ActivityMonitor's input activity summaries.
+INPUT_BURST_GAP = 1.0           # Longest pause (in seconds) between input events of the same burst.
+ACTIVITY_BATCH_SIZE = 4096      # Captured events buffered before they are written to the activity store.
+ACTIVITY_FLUSH_INTERVAL = 30    # Seconds buffered activity events wait at most before they are written.
+ACTIVITY_RECORD_KEYS = False    # Store which key was pressed in the activity store (a keylog); off keeps counts only.
+MONITOR_MIN_INTERVAL = 1.0      # Seconds between activity samples while the user is typing or clicking.
+MONITOR_MAX_INTERVAL = 300.0    # Longest interval the sampling backs off to while the user is idle.
+MONITOR_IDLE_AFTER = 60.0       # Seconds without input after which the user counts as idle.
+MONITOR_CPU_BUDGET = 0.005      # Share of one CPU the ActivityMonitor's sampling may use (0.5%).
+MONITOR_BATTERY_FACTOR = 2.0    # Sampling intervals are stretched by this factor while on battery power.
 
 # API-related constants
 CHATGPT_API_ENDPOINT = "https://api.openai.com/v1/engines/chatgpt-4/completions"  # API endpoint for ChatGPT-4.
@@ -22,6 +40,14 @@ STATUS_SUCCESS = "SUCCESS"
 STATUS_FAILED = "FAILED"
 STATUS_RETRY = "RETRY"
 
+# Task resources
+INPUT_DEVICES_RESOURCE = "input_devices"  # The single mouse and keyboard shared by all GUI automation.
+TASK_TYPE_RESOURCES = {                   # Exclusive resources implied by a task's 'type', in addition to task['resources'].
+    "gui": (INPUT_DEVICES_RESOURCE,),
+    "gui_script": (INPUT_DEVICES_RESOURCE,),
+    "macro": (INPUT_DEVICES_RESOURCE,),
+}
+
 # TODO: Future constants
 # - Add more constants as the project grows, such as error codes, user preference settings, or configurable options.
 # - Separate constants into multiple files if different modules need their own set of constants.
@@ -5,10 +5,13 @@ reusable snippets of code that perform basic tasks such as data formatting, time
 operations. The goal is to keep the core logic clean and focused by offloading these auxiliary tasks.
 """
 
+import asyncio
 import time
 import os
 import json
 
+from src.utils.constants import RETRY_DELAY
+
 def format_time(seconds):
     """
     Converts time in seconds into a more human-readable format (HH:MM:SS).
@@ -127,6 +130,28 @@ def retry_function(func, max_retries=3, delay=RETRY_DELAY):
     raise Exception(f"Function failed after {max_retries} retries.")
 
 
+async def async_retry_function(func, max_retries=3, delay=RETRY_DELAY):
+    """
+    Retries a coroutine function up to a specified number of times if it fails, without blocking the event loop.
+    
+    Logic:
+    1. Takes a coroutine function (`func`) and the number of retries (`max_retries`) as input.
+    2. Awaits the function, and if it raises an exception, waits `delay` seconds with `asyncio.sleep` before retrying.
+    3. Returns the function's result if successful, or raises an exception after the final failure.
+    
+    Interaction with the program:
+    - The asyncio counterpart of `retry_function`, used by tasks running on the AsyncTaskScheduler so that
+      a retry delay does not stall every other in-flight task.
+    """
+    for attempt in range(max_retries):
+        try:
+            return await func()
+        except Exception as e:
+            print(f"Attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(delay)
+    raise Exception(f"Function failed after {max_retries} retries.")
+
+
 # TODO: Add more helper functions as the program scales.
 # - Consider adding utility functions for data validation, file I/O operations, and API response formatting.
 # - Add more detailed error reporting for complex operations.
@@ -4,7 +4,10 @@ Unit tests for the activity_monitor module.
 These tests verify the functionality of the ActivityMonitor class to ensure it accurately tracks user activity and correctly integrates with other components of the system.
 """
 
+import time
 import unittest
+from types import SimpleNamespace
+
 from src.core.activity_monitor import ActivityMonitor
 
 class TestActivityMonitor(unittest.TestCase):
@@ -61,5 +64,56 @@ class TestActivityMonitor(unittest.TestCase):
         self.activity_monitor.save_activity_log()  # Placeholder save log action
         self.assertTrue(os.path.exists('activity_log.txt'))  # Placeholder assertion
 
+class TestMonitorLifecycle(unittest.TestCase):
+
+    def test_start_and_stop(self):
+        """
+        start() returns at once, input callbacks only queue events, and stop() drains the queue in bounded time.
+        """
+        monitor = ActivityMonitor()
+        monitor.check_interval = 0.05
+        monitor.read_active_window = lambda: 'Editor'
+        monitor.sample_processes = lambda: []
+        seen = []
+        monitor.add_input_listener(SimpleNamespace(on_key_press=seen.append))
+
+        monitor.start()
+        self.assertTrue(monitor.running)
+        on_press = monitor._enqueuer('key_press')
+        on_click = monitor._enqueuer('click')
+        start = time.perf_counter()
+        for i in range(1000):
+            on_press(SimpleNamespace(char='abc'[i % 3]))
+        per_event = (time.perf_counter() - start) / 1000
+        on_click(10, 20, SimpleNamespace(name='left'), True)
+        time.sleep(0.1)
+
+        start = time.perf_counter()
+        self.assertTrue(monitor.stop(timeout=2))
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertFalse(monitor.running)
+        self.assertLess(per_event, 0.0005)
+        self.assertEqual(len(monitor.key_strokes), 1000)
+        self.assertEqual([event.key for event in monitor.key_strokes][:4], ['a', 'b', 'c', 'a'])
+        self.assertEqual(next(iter(monitor.mouse_actions))[2:], (10, 20, 'left'))
+        self.assertEqual(len(seen), 1000)
+        self.assertEqual(monitor.active_window_name, 'Editor')
+
+    def test_input_is_summarised_not_logged_per_event(self):
+        """
+        Input events produce no INFO records of their own, only one periodic summary.
+        """
+        monitor = ActivityMonitor()
+        monitor.active_window_name = 'Editor'
+        with self.assertLogs('src.core.activity_monitor', level='INFO') as logs:
+            for i in range(50):
+                monitor.on_key_press(SimpleNamespace(char='a'), timestamp=1000 + i * 0.02)
+            monitor.on_click(10, 20, SimpleNamespace(name='left'), True, timestamp=1001)
+            summary = monitor.log_input_summary(now=monitor.input_stats.started + 60)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('50 keys', logs.output[0])
+        self.assertEqual(summary['apps'], {'Editor': {'keys': 50, 'clicks': 1}})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for the activity_store module.
+
+These tests verify that the sink batches events into day partitions, that the store streams columns in chunks and
+ignores rows left incomplete by an interrupted or failed flush, that key names are only stored when asked for, that
+an idle batch is flushed after the flush interval, that per-application totals are kept per day, and that the
+ActivityMonitor persists key presses, clicks and focus time through its event sink.
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from src.core.activity_monitor import ActivityMonitor
+from src.core.activity_store import FOCUS, ActivitySink, ActivityStore
+from src.core.input_events import KEY_DOWN, MOUSE_DOWN, SCROLL
+
+
+class TestActivityStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.first = datetime(2026, 3, 1, 12).timestamp()
+        self.second = datetime(2026, 3, 2, 9).timestamp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_batches_partitions_and_reads(self):
+        sink = ActivitySink(self.directory, batch_size=4, flush_interval=3600)
+        for i in range(3):
+            sink.add(self.first + i, KEY_DOWN, 'Editor', key='a')
+        self.assertEqual(os.listdir(self.directory), [])  # Still buffered
+        sink.add(self.first + 3, MOUSE_DOWN, 'Browser', key='left', x=10, y=20)
+        sink.add(self.first + 4, FOCUS, 'Editor', value=90.0)
+        sink.add(self.second, SCROLL, 'Browser', code=-3)
+        sink.flush()
+
+        store = ActivityStore(self.directory)
+        self.assertEqual(store.days(), ['2026-03-01', '2026-03-02'])
+        self.assertEqual(store.days(first='2026-03-02'), ['2026-03-02'])
+        chunks = list(store.read(('kind', 'app', 'x'), last='2026-03-01', chunk_size=2))
+        self.assertEqual([len(chunk['kind']) for _, _, chunk in chunks], [2, 2, 1])
+        day, names, chunk = chunks[1]
+        self.assertEqual((day, names[chunk['app'][1]], chunk['x'][1]), ('2026-03-01', 'Browser', 10))
+
+        self.assertEqual(store.app_totals(), {'Editor': {'keys': 3, 'clicks': 0, 'seconds': 90.0},
+                                              'Browser': {'keys': 0, 'clicks': 1, 'seconds': 0.0}})
+        self.assertEqual(store.activity_data()[0], {'app': 'Editor', 'keystrokes': 3, 'clicks': 0, 'time_spent': 90.0})
+        with self.assertRaises(ValueError):
+            next(store.read(('duration',)))
+
+    def test_interrupted_flush_keeps_complete_rows(self):
+        sink = ActivitySink(self.directory, record_keys=True)
+        sink.add(self.first, KEY_DOWN, 'Editor', key='a')
+        sink.add(self.first + 1, KEY_DOWN, 'Editor', key='b')
+        sink.flush()
+        with open(os.path.join(self.directory, '2026-03-01', 'time'), 'ab') as f:
+            f.write(b'\0' * 8)  # A row whose other columns were never written
+
+        store = ActivityStore(self.directory)
+        self.assertEqual(store.rows('2026-03-01'), 2)
+        (_, names, chunk), = store.read(('code',))
+        self.assertEqual([names[code] for code in chunk['code']], ['a', 'b'])
+
+        sink = ActivitySink(self.directory, record_keys=True)  # A restarted sink appends after the complete rows
+        sink.add(self.first + 2, KEY_DOWN, 'Editor', key='c')
+        sink.flush()
+        (_, names, chunk), = store.read(('time', 'code'))
+        self.assertEqual([names[code] for code in chunk['code']], ['a', 'b', 'c'])
+        self.assertEqual(list(chunk['time']), [self.first, self.first + 1, self.first + 2])
+
+    def test_failed_flush_is_retried_without_misaligning_columns(self):
+        sink = ActivitySink(self.directory, record_keys=True)
+        sink.add(self.first, KEY_DOWN, 'Editor', key='a')
+
+        def failing_open(path, *args, **kwargs):
+            if os.path.basename(path) == 'app':  # The columns before it are already appended
+                raise OSError(errno.ENOSPC, "No space left on device")
+            return open(path, *args, **kwargs)
+
+        with mock.patch('src.core.activity_store.open', failing_open, create=True), \
+                self.assertLogs('src.core.activity_store', 'ERROR'):
+            sink.flush()
+        sink.add(self.first + 1, KEY_DOWN, 'Editor', key='b')
+        sink.flush()
+        (_, names, chunk), = ActivityStore(self.directory).read(('time', 'code'))
+        self.assertEqual([names[code] for code in chunk['code']], ['a', 'b'])
+        self.assertEqual(list(chunk['time']), [self.first, self.first + 1])
+
+    def test_key_names_are_not_stored_by_default(self):
+        sink = ActivitySink(self.directory)
+        sink.add(self.first, KEY_DOWN, 'Editor', key='p')
+        sink.add(self.first + 1, MOUSE_DOWN, 'Editor', key='left')
+        sink.flush()
+        store = ActivityStore(self.directory)
+        self.assertEqual(store.names('2026-03-01'), ['Editor', 'left'])
+        (_, _, chunk), = store.read(('code',))
+        self.assertEqual(list(chunk['code']), [-1, 1])
+        self.assertEqual(store.app_totals()['Editor']['keys'], 1)
+
+    def test_idle_batch_is_flushed_after_interval(self):
+        sink = ActivitySink(self.directory, flush_interval=0.1)
+        sink.add(self.first, KEY_DOWN, 'Editor', key='a')
+        self.assertEqual(os.listdir(self.directory), [])
+        time.sleep(0.5)  # No further events arrive
+        self.assertEqual(ActivityStore(self.directory).rows('2026-03-01'), 1)
+
+    def test_monitor_persists_activity(self):
+        monitor = ActivityMonitor(event_sink=ActivitySink(self.directory))
+        monitor._on_window('Editor', timestamp=self.first)
+        monitor.on_key_press(SimpleNamespace(char='x'), timestamp=self.first + 1)
+        monitor.on_click(5, 6, SimpleNamespace(name='left'), True, timestamp=self.first + 2)
+        monitor._on_window('Browser', timestamp=self.first + 60)
+        monitor.event_sink.flush()
+
+        totals = ActivityStore(self.directory).app_totals()
+        self.assertEqual(totals['Editor'], {'keys': 1, 'clicks': 1, 'seconds': 60.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the adaptive_interval module.
+
+These tests verify that the sampling interval shortens during bursts of input, backs off exponentially while the
+user is idle, stretches on battery power, never exceeds the CPU budget, and that input after a backoff wakes the
+sampler.
+"""
+
+import threading
+import time
+import unittest
+
+from src.core.adaptive_interval import AdaptiveInterval
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.battery = False
+        self.polling = AdaptiveInterval(base=5, min_interval=1, max_interval=60, idle_after=30, burst_window=10,
+                                        cpu_budget=None, power=lambda: self.battery, clock=self.clock)
+
+    def test_burst_active_and_idle_backoff(self):
+        self.polling.note_input(0.0)
+        self.clock.now = 2
+        self.assertEqual(self.polling.next(), 1)   # Burst
+        self.clock.now = 15
+        self.assertEqual(self.polling.next(), 5)   # Active
+        self.clock.now = 40
+        self.assertEqual([self.polling.next() for _ in range(5)], [10, 20, 40, 60, 60])  # Idle
+        self.polling.note_input(41)
+        self.assertEqual(self.polling.next(), 1)
+
+    def test_battery_and_cpu_budget(self):
+        self.clock.now = 15
+        self.battery = True
+        self.assertEqual(self.polling.next(), 10)
+        self.polling.cpu_budget = 0.005
+        self.assertAlmostEqual(self.polling.next(cost=0.1), 20)  # 0.1s of CPU per sample at most 0.5% of a CPU
+        self.assertEqual(self.polling.next(cost=0.001), 10)
+
+    def test_input_wakes_backed_off_sampler(self):
+        self.clock.now = 40
+        self.polling.next()
+        woken = []
+        sampler = threading.Thread(target=lambda: woken.append(self.polling.wait(10)))
+        start = time.perf_counter()
+        sampler.start()
+        self.polling.note_input(41)
+        sampler.join()
+        self.assertEqual(woken, [True])
+        self.assertLess(time.perf_counter() - start, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
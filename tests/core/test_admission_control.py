@@ -0,0 +1,112 @@
+"""
+Unit tests for the admission_control module.
+
+These tests verify that the AdmissionController throttles deferrable tasks when load crosses a threshold, ramps back up with hysteresis, and that the TaskScheduler defers and later runs low-priority tasks.
+"""
+
+import unittest
+
+from src.core.admission_control import (
+    ADMISSION_OPEN, ADMISSION_RAMPING, ADMISSION_THROTTLED, AdmissionController,
+)
+from src.core.task_scheduler import TaskScheduler
+
+
+class FakeLoad:
+    """
+    Sampler returning a controllable load and a clock that advances by one second per sample.
+    """
+
+    def __init__(self, cpu=10.0):
+        self.cpu = cpu
+        self.now = 0.0
+
+    def __call__(self):
+        return {'cpu': self.cpu, 'memory': 20.0, 'disk_io': 0.0}
+
+    def clock(self):
+        self.now += 1.0
+        return self.now
+
+
+class TestAdmissionController(unittest.TestCase):
+
+    def setUp(self):
+        self.load = FakeLoad()
+        self.controller = AdmissionController(cpu_threshold=80, hysteresis=10, sample_interval=1.0, ramp_max=4,
+                                              sampler=self.load, clock=self.load.clock)
+
+    def test_throttles_then_ramps_up_with_hysteresis(self):
+        """
+        High load throttles low-priority tasks only; admission ramps back up once load is below threshold - hysteresis.
+        """
+        low, high = {'priority': 'low'}, {'priority': 'high'}
+        self.load.cpu = 95
+        self.assertEqual(self.controller.update(), ADMISSION_THROTTLED)
+        self.assertFalse(self.controller.admit(low))
+        self.assertTrue(self.controller.admit(high))
+
+        self.load.cpu = 75  # Below the threshold but inside the hysteresis band
+        self.assertEqual(self.controller.update(), ADMISSION_THROTTLED)
+
+        self.load.cpu = 60
+        self.assertEqual(self.controller.update(), ADMISSION_RAMPING)
+        self.assertEqual(self.controller.available_slots(), 1)
+        self.controller.task_started(low)
+        self.assertFalse(self.controller.admit(low))
+
+        self.assertEqual(self.controller.update(), ADMISSION_RAMPING)
+        self.assertEqual(self.controller.available_slots(), 1)
+        self.assertEqual(self.controller.update(), ADMISSION_OPEN)
+        self.assertIsNone(self.controller.available_slots())
+
+
+class TestSchedulerAdmission(unittest.TestCase):
+
+    def test_low_priority_tasks_are_deferred_under_load(self):
+        """
+        Under load, high priority tasks run right away while low-priority ones wait until load drops.
+        """
+        load = FakeLoad(cpu=95)
+        admission = AdmissionController(sample_interval=0.01, ramp_max=2, sampler=load, clock=load.clock)
+        scheduler = TaskScheduler(workers=2, admission=admission)
+        order = []
+
+        def work(name):
+            order.append(name)
+            load.cpu = 10  # Load drops once the urgent work has finished
+
+        scheduler.schedule_task({'task_name': 'background', 'priority': 'low', 'function': work, 'args': ('background',)})
+        scheduler.schedule_task({'task_name': 'urgent', 'priority': 'high', 'function': work, 'args': ('urgent',)})
+        scheduler.execute_tasks()
+
+        self.assertEqual(order, ['urgent', 'background'])
+        self.assertEqual(scheduler.task_status, {'urgent': 'completed', 'background': 'completed'})
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics['deferred'], 0)
+        self.assertEqual(metrics['admission_state'], ADMISSION_OPEN)
+
+    def test_metrics_report_deferred_tasks(self):
+        """
+        Deferred tasks are counted in the metrics and stay queued when the scheduler is stopped.
+        """
+        load = FakeLoad(cpu=95)
+        scheduler = TaskScheduler(workers=2, admission=AdmissionController(sampler=load, clock=load.clock))
+        snapshots = []
+
+        def check_and_stop():
+            snapshots.append(scheduler.metrics())
+            scheduler.stop()
+
+        scheduler.schedule_task({'task_name': 'background', 'priority': 'low', 'function': lambda: None})
+        scheduler.schedule_task({'task_name': 'stopper', 'priority': 'high', 'function': check_and_stop})
+        scheduler.execute_tasks()
+
+        self.assertEqual((snapshots[0]['deferred'], snapshots[0]['running']), (1, 1))
+        self.assertEqual(snapshots[0]['admission_state'], ADMISSION_THROTTLED)
+        self.assertEqual(scheduler.metrics()['queued'], 1)
+        self.assertEqual(scheduler.task_status['background'], 'scheduled')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the application_manager module.
+
+These tests verify that the process index only inspects new processes on each refresh and reuses a recent refresh, and (with psutil installed) that applications are launched without blocking and closed gracefully in bulk with a single process scan.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from src.core import application_manager
+from src.core.application_manager import ApplicationManager, ProcessIndex, ProcessInfo
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProcessSource:
+    def __init__(self, processes):
+        self.processes = dict(processes)  # pid -> name
+        self.described = []
+
+    def pids(self):
+        return list(self.processes)
+
+    def describe(self, pid):
+        self.described.append(pid)
+        name = self.processes[pid]
+        return ProcessInfo(pid, name, f'/usr/bin/{name}', float(pid))
+
+
+class TestProcessIndex(unittest.TestCase):
+
+    def test_refresh_is_incremental_and_rate_limited(self):
+        source = FakeProcessSource({1: 'init', 20: 'firefox', 21: 'firefox', 30: 'Code'})
+        clock = FakeClock()
+        index = ProcessIndex(source=source, max_age=1.0, clock=clock)
+
+        self.assertEqual([info.pid for info in index.find('firefox')], [20, 21])
+        self.assertEqual([info.pid for info in index.find('code')], [30])  # Reuses the refresh
+        self.assertEqual((index.scans, len(source.described)), (1, 4))
+
+        del source.processes[20]
+        source.processes[40] = 'firefox'
+        clock.now = 2.0
+        self.assertEqual([info.pid for info in index.find('/usr/bin/firefox')], [21, 40])
+        self.assertEqual((index.scans, source.described[4:]), (2, [40]))  # Only the new pid was inspected
+
+
+@unittest.skipIf(application_manager.psutil is None, "psutil is not installed")
+class TestApplicationManager(unittest.TestCase):
+
+    def setUp(self):
+        # Applications get unique names, so closing them by name cannot touch other processes.
+        self.directory = tempfile.mkdtemp()
+        self.sleeper = os.path.join(self.directory, 'damgr-sleeper')
+        shutil.copy(shutil.which('sleep'), self.sleeper)
+        self.stubborn = os.path.join(self.directory, 'damgr-stubborn')
+        with open(self.stubborn, 'w') as f:
+            f.write("#!/bin/sh\ntrap '' TERM\nwhile :; do sleep 0.1; done\n")
+        os.chmod(self.stubborn, 0o755)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_launch_status_and_bulk_close(self):
+        manager = ApplicationManager(grace_period=0.5)
+        start = time.perf_counter()
+        pids = [manager.launch(self.sleeper, ['30']) for _ in range(3)]
+        manager.launch(self.stubborn)
+        self.assertLess(time.perf_counter() - start, 5)
+        time.sleep(0.3)  # Let the shell install its trap
+
+        status = manager.status('damgr-sleeper')['damgr-sleeper']
+        self.assertTrue(status['running'])
+        self.assertEqual(set(status['pids']), set(pids))
+
+        scans = manager.index.scans
+        result = manager.close(['damgr-sleeper', 'damgr-stubborn'])
+        self.assertEqual(manager.index.scans, scans + 1)
+        self.assertEqual(result, {'damgr-sleeper': {'terminated': 3, 'killed': 0},
+                                  'damgr-stubborn': {'terminated': 0, 'killed': 1}})
+        self.assertFalse(manager.status('damgr-sleeper')['damgr-sleeper']['running'])
+
+    def test_close_never_signals_its_own_process(self):
+        manager = ApplicationManager(grace_period=0.1)
+        own = ProcessInfo(os.getpid(), 'python', '/usr/bin/python', application_manager.psutil.Process().create_time())
+        with mock.patch.object(manager.index, 'find', return_value=[own]), \
+                self.assertLogs('src.core.application_manager', 'WARNING'):
+            result = manager.close('python')
+        self.assertEqual(result, {'python': {'terminated': 0, 'killed': 0}})
+
+
+if __name__ == '__main__':
+    unittest.main()
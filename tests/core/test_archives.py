@@ -0,0 +1,135 @@
+"""
+Unit tests for the archives module.
+
+These tests verify that each archive format round-trips files and directory trees, that unsafe members are refused on extraction, that hard links resolve from the archive root, that cancellation stops a stream between chunks, and that memory use stays flat as the input grows.
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import tracemalloc
+import unittest
+
+from src.core import archives
+from src.core.archives import compress, extract
+from src.core.cancellation import CancellationToken, TaskCancelled, use_token
+from src.core.file_operations import run_file_operation
+
+
+class TestArchives(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(self.path('tree', 'sub'))
+        self.write(os.path.join('tree', 'a.txt'), b'alpha' * 1000)
+        self.write(os.path.join('tree', 'sub', 'b.bin'), os.urandom(300_000))
+        os.chmod(self.path('tree', 'a.txt'), 0o640)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def write(self, name, data):
+        with open(self.path(name), 'wb') as f:
+            f.write(data)
+        return self.path(name)
+
+    def assertSameTree(self, expected, actual):
+        for root, _, files in os.walk(expected):
+            for name in files:
+                source = os.path.join(root, name)
+                target = os.path.join(actual, os.path.relpath(source, expected))
+                with open(source, 'rb') as a, open(target, 'rb') as b:
+                    self.assertEqual(a.read(), b.read())
+                self.assertEqual(os.stat(source).st_mode, os.stat(target).st_mode)
+
+    def test_round_trip(self):
+        """
+        zip, tar and tar.gz archives (and tar.zst with zstandard installed) extract to the original tree.
+        """
+        names = ['out.zip', 'out.tar', 'out.tar.gz'] + (['out.tar.zst'] if archives.zstandard else [])
+        for name in names:
+            with self.subTest(name=name):
+                result = run_file_operation({'operation': 'compress', 'source': self.path('tree'),
+                                             'destination': self.path(name)})
+                self.assertEqual((result['files'], result['bytes_in']), (2, 305_000))
+
+                result = run_file_operation({'operation': 'extract', 'source': self.path(name),
+                                             'destination': self.path(name + '.d')})
+                self.assertEqual((result['files'], result['bytes']), (2, 305_000))
+                self.assertSameTree(self.path('tree'), self.path(name + '.d', 'tree'))
+
+    def test_parallel_gz(self):
+        """
+        The 'gz' format compresses each file to its own .gz on several threads.
+        """
+        os.mkdir(self.path('gz'))
+        result = compress([self.path('tree')], self.path('gz'), workers=4)
+        self.assertEqual((result['format'], result['files']), ('gz', 2))
+
+        extract(self.path('gz', 'tree', 'sub', 'b.bin.gz'), self.path('restored'))
+        with open(self.path('tree', 'sub', 'b.bin'), 'rb') as a, open(self.path('restored', 'b.bin'), 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_unsafe_members_are_refused(self):
+        with tarfile.open(self.path('evil.tar'), 'w') as tar:
+            tar.add(self.path('tree', 'a.txt'), arcname='../escape.txt')
+        with self.assertRaises(ValueError):
+            extract(self.path('evil.tar'), self.path('out'))
+        self.assertFalse(os.path.exists(self.path('escape.txt')))
+
+    def test_hard_links_resolve_from_the_archive_root(self):
+        with tarfile.open(self.path('links.tar'), 'w') as tar:
+            tar.add(self.path('tree', 'sub', 'b.bin'), arcname='tree/sub/b.bin')
+            link = tarfile.TarInfo('tree/sub/copy.bin')
+            link.type, link.linkname = tarfile.LNKTYPE, 'tree/sub/b.bin'
+            tar.addfile(link)
+        extract(self.path('links.tar'), self.path('out'))
+        with open(self.path('tree', 'sub', 'b.bin'), 'rb') as a, open(self.path('out', 'tree', 'sub', 'copy.bin'), 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+        with tarfile.open(self.path('evil-link.tar'), 'w') as tar:
+            link = tarfile.TarInfo('sub/link')
+            link.type, link.linkname = tarfile.LNKTYPE, '../outside.txt'
+            tar.addfile(link)
+        with self.assertRaises(ValueError):
+            extract(self.path('evil-link.tar'), self.path('evil-out'))
+
+    def test_compress_stops_when_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        with use_token(token), self.assertRaises(TaskCancelled):
+            compress([self.path('tree')], self.path('out.zip'))
+
+    def test_memory_stays_flat(self):
+        """
+        Peak memory while compressing and extracting does not grow with the size of the input.
+        """
+        block = os.urandom(1024 * 1024)
+
+        def peak(size_mb, name):
+            source = self.path(f'big-{size_mb}.bin')
+            with open(source, 'wb') as f:
+                for _ in range(size_mb):
+                    f.write(block)
+            tracemalloc.start()
+            try:
+                compress([source], self.path(name), level=1)
+                extract(self.path(name), self.path(name + '.d'))
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                os.remove(source)
+
+        for name in ('big.zip', 'big.tar.gz'):
+            with self.subTest(name=name):
+                small, large = peak(4, 'small-' + name), peak(64, 'large-' + name)
+                self.assertLess(large, 8 * archives.ARCHIVE_CHUNK_SIZE)
+                self.assertLess(large, small * 1.5 + archives.ARCHIVE_CHUNK_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
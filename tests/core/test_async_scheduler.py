@@ -0,0 +1,72 @@
+"""
+Unit tests for the async_scheduler module.
+
+These tests verify that the AsyncTaskScheduler runs coroutine tasks concurrently on one event loop, offloads blocking tasks to threads, and accepts tasks from existing schedule_task callers.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.core.async_scheduler import AsyncTaskScheduler
+
+
+class TestAsyncTaskScheduler(unittest.TestCase):
+
+    def test_thousands_of_waits_share_one_loop(self):
+        """
+        Many concurrent coroutine waits finish in roughly the time of one wait, without a thread each.
+        """
+        scheduler = AsyncTaskScheduler(max_concurrency=5000)
+        for i in range(2000):
+            scheduler.schedule_task({'task_name': f'wait-{i}', 'function': asyncio.sleep, 'args': (0.2,)})
+
+        threads_before = threading.active_count()
+        start = time.perf_counter()
+        scheduler.execute_tasks()
+
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+        self.assertEqual(set(scheduler.task_status.values()), {'completed'})
+
+    def test_submit_and_blocking_offload(self):
+        """
+        Tasks submitted from a coroutine run alongside blocking functions offloaded to the thread pool.
+        """
+        scheduler = AsyncTaskScheduler(workers=2)
+        thread_names = []
+
+        def blocking_copy():
+            thread_names.append(threading.current_thread().name)
+
+        async def main():
+            await scheduler.submit({'task_name': 'copy', 'function': blocking_copy})
+            await scheduler.submit({'task_name': 'api', 'function': asyncio.sleep, 'args': (0.01,)})
+            await scheduler.run()
+
+        asyncio.run(main())
+
+        self.assertEqual(scheduler.task_status, {'copy': 'completed', 'api': 'completed'})
+        self.assertTrue(thread_names[0].startswith('task-offload'))
+
+    def test_failed_coroutine_is_requeued(self):
+        """
+        A failing coroutine task goes through the usual retry path.
+        """
+        scheduler = AsyncTaskScheduler(clock=lambda: 0.0)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            raise RuntimeError("API unavailable")
+
+        scheduler.schedule_task({'task_name': 'flaky', 'function': flaky, 'retry_count': 3})
+        scheduler.execute_tasks()
+
+        self.assertEqual(len(attempts), 1)
+        self.assertEqual(scheduler.task_status['flaky'], 'failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for the cancellation module and the TaskScheduler's deadline, cancel, pause and reschedule support.
+
+These tests verify that deadlines interrupt cooperative waits and kill subprocesses, that a cancelled API query raises, that running and queued tasks can be cancelled, and that queued tasks can be paused, resumed and rescheduled.
+"""
+
+import asyncio
+import importlib.util
+import threading
+import time
+import unittest
+
+from src.core.async_scheduler import AsyncTaskScheduler
+from src.core.cancellation import (
+    CancellationToken, TaskCancelled, TaskTimeout, bounded_timeout, current_token, run_subprocess, use_token,
+)
+from src.core.task_scheduler import TaskScheduler
+
+
+def wait_for_cancellation():
+    current_token().wait(10)
+    current_token().check()
+
+
+class TestCancellationToken(unittest.TestCase):
+
+    def test_deadline_bounds_timeouts_and_kills_subprocess(self):
+        """
+        A token's deadline shortens timeouts and kills a running subprocess when it passes.
+        """
+        token = CancellationToken(deadline=time.monotonic() + 0.3)
+        with use_token(token):
+            self.assertLessEqual(bounded_timeout(10), 0.3)
+            start = time.monotonic()
+            with self.assertRaises(TaskTimeout):
+                run_subprocess(['sleep', '10'])
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_cancel_runs_callbacks_once(self):
+        token = CancellationToken()
+        calls = []
+        token.add_callback(lambda: calls.append('first'))
+        self.assertTrue(token.cancel())
+        self.assertFalse(token.cancel())
+        token.add_callback(lambda: calls.append('late'))  # Already cancelled: runs immediately
+        self.assertEqual(calls, ['first', 'late'])
+        with self.assertRaises(TaskCancelled):
+            token.check()
+
+
+@unittest.skipIf(importlib.util.find_spec('openai') is None, "openai is not installed")
+class TestCancelledApiQuery(unittest.TestCase):
+
+    def test_cancelled_query_raises_instead_of_returning_an_error(self):
+        """
+        An API query made by a cancelled task raises TaskCancelled rather than reporting the failure as its result.
+        """
+        from src.core.api_communicator import send_query_to_chatgpt4
+
+        token = CancellationToken()
+        token.cancel()
+        with use_token(token), self.assertRaises(TaskCancelled):
+            send_query_to_chatgpt4('What next?')
+
+
+class TestSchedulerCancellation(unittest.TestCase):
+
+    def test_hung_tasks_are_stopped_at_their_deadline(self):
+        """
+        Tasks past their deadline are interrupted, so a hung subprocess does not block the scheduler.
+        """
+        scheduler = TaskScheduler(workers=2)
+        scheduler.schedule_task({'task_name': 'hung-wait', 'function': wait_for_cancellation,
+                                 'timeout': 0.2, 'retry_count': 3})
+        scheduler.schedule_task({'task_name': 'hung-command', 'function': run_subprocess, 'args': (['sleep', '30'],),
+                                 'timeout': 0.2, 'retry_count': 3})
+        scheduler.schedule_task({'task_name': 'quick', 'function': lambda: None})
+        start = time.monotonic()
+        scheduler.execute_tasks()
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(scheduler.task_status, {'hung-wait': 'failed', 'hung-command': 'failed', 'quick': 'completed'})
+
+    def test_cancel_running_and_queued_tasks(self):
+        """
+        Cancelling a running task interrupts it; cancelling a queued task removes it and skips its dependents.
+        """
+        scheduler = TaskScheduler(workers=1)
+        started = threading.Event()
+
+        def long_running():
+            started.set()
+            wait_for_cancellation()
+
+        def cancel_all():
+            started.wait(5)
+            scheduler.cancel('running')
+            scheduler.cancel('later')
+
+        scheduler.schedule_task({'task_name': 'running', 'function': long_running, 'timeout': None})
+        scheduler.schedule_task({'task_name': 'later', 'function': lambda: None, 'timestamp': time.time() + 3600})
+        scheduler.schedule_task({'task_name': 'after-later', 'function': lambda: None, 'depends_on': ['later']})
+        canceller = threading.Thread(target=cancel_all)
+        canceller.start()
+        scheduler.execute_tasks()
+        canceller.join()
+
+        self.assertEqual(scheduler.task_status, {'running': 'cancelled', 'later': 'cancelled', 'after-later': 'skipped'})
+        self.assertFalse(scheduler.cancel('unknown'))
+
+    def test_pause_resume_and_reschedule(self):
+        """
+        Paused tasks are held out of the queue until resumed; rescheduling moves a task's due time and priority.
+        """
+        scheduler = TaskScheduler()
+        scheduler.schedule_task({'task_name': 'paused', 'function': lambda: None})
+        scheduler.schedule_task({'task_name': 'moved', 'function': lambda: None, 'timestamp': time.time() + 3600})
+        self.assertTrue(scheduler.pause('paused'))
+        self.assertTrue(scheduler.reschedule('moved', priority='high'))
+        scheduler.execute_tasks()
+        self.assertEqual(scheduler.task_status, {'paused': 'paused', 'moved': 'completed'})
+        self.assertEqual(scheduler.metrics()['paused'], 1)
+
+        self.assertTrue(scheduler.resume('paused'))
+        scheduler.execute_tasks()
+        self.assertEqual(scheduler.task_status['paused'], 'completed')
+
+    def test_async_coroutine_is_cancelled_at_deadline(self):
+        """
+        Coroutine tasks are interrupted at their next await when their deadline passes.
+        """
+        scheduler = AsyncTaskScheduler()
+
+        async def stuck():
+            await asyncio.sleep(30)
+
+        scheduler.schedule_task({'task_name': 'stuck', 'function': stuck, 'timeout': 0.2, 'retry_count': 3})
+        start = time.monotonic()
+        scheduler.execute_tasks()
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(scheduler.task_status['stuck'], 'failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
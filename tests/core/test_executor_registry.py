@@ -0,0 +1,72 @@
+"""
+Unit tests for the executor_registry module.
+
+These tests verify that task types are dispatched to their registered handlers, that handler modules are only imported when the first task of their type runs, and that the scheduler runs typed tasks through the registry.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src.core.executor_registry import ExecutorRegistry, UnknownTaskType
+from src.core.task_scheduler import TaskScheduler
+
+
+class TestExecutorRegistry(unittest.TestCase):
+
+    def test_handlers_are_imported_on_first_use(self):
+        registry = ExecutorRegistry({'json': 'json:dumps', 'missing': 'no_such_backend:run'})
+        self.assertEqual(registry.loaded(), [])
+
+        self.assertEqual(registry.execute({'type': 'json', 'value': 1}), '{"type": "json", "value": 1}')
+        self.assertEqual(registry.loaded(), ['json'])
+        with self.assertRaises(ImportError):
+            registry.resolve('missing')
+        with self.assertRaises(UnknownTaskType):
+            registry.execute({'type': 'video'})
+
+        registry.register('video', lambda task: 'played')
+        self.assertEqual(registry.execute({'type': 'video'}), 'played')
+
+    def test_file_worker_does_not_import_gui_or_browser_backends(self):
+        """
+        A fresh interpreter that runs a file task never imports pyautogui or selenium.
+        """
+        code = (
+            "import sys\n"
+            "from src.core.executor_registry import default_registry\n"
+            "default_registry.preload(['file'])\n"
+            "print(sorted(name for name in ('pyautogui', 'selenium') if name in sys.modules))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), '[]')
+
+    def test_scheduler_runs_typed_tasks_through_the_registry(self):
+        directory = tempfile.mkdtemp()
+        try:
+            source = os.path.join(directory, 'a.txt')
+            with open(source, 'w') as f:
+                f.write('hello')
+            calls = []
+            registry = ExecutorRegistry({'file': 'src.core.task_executor:execute_file_management'})
+            registry.register('note', calls.append)
+
+            scheduler = TaskScheduler(executors=registry)
+            scheduler.schedule_task({'task_name': 'copy', 'type': 'file', 'operation': 'copy',
+                                     'source': source, 'destination': os.path.join(directory, 'b.txt')})
+            scheduler.schedule_task({'task_name': 'note', 'type': 'note'})
+            scheduler.execute_tasks()
+
+            self.assertEqual(scheduler.task_status, {'copy': 'completed', 'note': 'completed'})
+            self.assertTrue(os.path.exists(os.path.join(directory, 'b.txt')))
+            self.assertEqual([task['task_name'] for task in calls], ['note'])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
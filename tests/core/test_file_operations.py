@@ -0,0 +1,222 @@
+"""
+Unit tests for the file_operations module.
+
+These tests verify that files and directory trees are copied, moved and deleted in-process, that cp/mv-style destination directories are honoured, that failures are raised rather than swallowed, that batch tasks expand globs and trees and aggregate their results, and that sync tasks only copy what changed.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core.cancellation import CancellationToken, TaskCancelled, use_token
+from src.core import file_operations
+from src.core.file_operations import BatchOperationError, copy_file, run_file_operation
+
+
+class TestFileOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def write(self, name, data=b'hello'):
+        with open(self.path(name), 'wb') as f:
+            f.write(data)
+        return self.path(name)
+
+    def test_copy_move_and_delete(self):
+        """
+        Copying into a directory keeps the file name and mode; moving and deleting act on the file itself.
+        """
+        source = self.write('a.txt', b'x' * 100_000)
+        os.chmod(source, 0o640)
+        os.mkdir(self.path('out'))
+
+        result = run_file_operation({'operation': 'copy', 'source': source, 'destination': self.path('out')})
+        self.assertEqual(result['bytes'], 100_000)
+        with open(self.path('out', 'a.txt'), 'rb') as f:
+            self.assertEqual(f.read(), b'x' * 100_000)
+        self.assertEqual(os.stat(self.path('out', 'a.txt')).st_mode & 0o777, 0o640)
+
+        run_file_operation({'operation': 'move', 'source': self.path('out', 'a.txt'), 'destination': self.path('b.txt')})
+        self.assertTrue(os.path.exists(self.path('b.txt')))
+        self.assertFalse(os.path.exists(self.path('out', 'a.txt')))
+
+        run_file_operation({'operation': 'delete', 'source': self.path('b.txt')})
+        self.assertFalse(os.path.exists(self.path('b.txt')))
+
+    def test_directory_trees(self):
+        """
+        Directories are copied recursively, but deleting one requires 'recursive'.
+        """
+        os.makedirs(self.path('tree', 'sub'))
+        self.write(os.path.join('tree', 'sub', 'c.txt'))
+        result = run_file_operation({'operation': 'copy', 'source': self.path('tree'), 'destination': self.path('copy')})
+        self.assertEqual(result['bytes'], 5)
+        self.assertTrue(os.path.exists(self.path('copy', 'sub', 'c.txt')))
+
+        with self.assertRaises(IsADirectoryError):
+            run_file_operation({'operation': 'delete', 'source': self.path('copy')})
+        run_file_operation({'operation': 'delete', 'source': self.path('copy'), 'recursive': True})
+        self.assertFalse(os.path.exists(self.path('copy')))
+
+    def test_errors_are_raised(self):
+        with self.assertRaises(FileNotFoundError):
+            run_file_operation({'operation': 'copy', 'source': self.path('missing'), 'destination': self.path('x')})
+        with self.assertRaises(ValueError):
+            run_file_operation({'operation': 'move', 'source': self.write('a.txt')})
+        with self.assertRaises(ValueError):
+            run_file_operation({'operation': 'shred', 'source': self.path('a.txt')})
+
+    def test_copy_stops_when_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        with use_token(token), self.assertRaises(TaskCancelled):
+            copy_file(self.write('a.txt'), self.path('b.txt'))
+
+
+class TestBatchOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for relative in ('logs/a.log', 'logs/b.log', 'logs/keep.txt', 'logs/old/c.log', 'photos/x.jpg', 'photos/y.jpg'):
+            path = os.path.join(self.directory, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(relative)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def listing(self, relative):
+        root = os.path.join(self.directory, relative)
+        return sorted(os.path.relpath(os.path.join(base, name), root)
+                      for base, _, names in os.walk(root) for name in names)
+
+    def test_copy_globs_and_trees_in_parallel(self):
+        """
+        Glob matches keep their path below the pattern's fixed prefix, and directories are copied file by file.
+        """
+        reports = []
+        with mock.patch.object(file_operations, 'INLINE_COPY_SIZE', 0):  # Send every file to the pool
+            result = run_file_operation({
+            'operation': 'copy',
+                'sources': [os.path.join(self.directory, 'logs', '**', '*.log'), os.path.join(self.directory, 'photos')],
+                'destination': os.path.join(self.directory, 'backup'),
+                'workers': 4,
+            }, progress=lambda *args: reports.append(args))
+
+        self.assertEqual(self.listing('backup'), ['a.log', 'b.log', 'old/c.log', 'photos/x.jpg', 'photos/y.jpg'])
+        self.assertEqual((result['total'], result['succeeded'], result['failed']), (5, 5, 0))
+        self.assertEqual(result['bytes'], sum(len(name) for name in ('logs/a.log', 'logs/b.log', 'logs/old/c.log', 'photos/x.jpg', 'photos/y.jpg')))
+        self.assertEqual(reports[-1][:2], (5, 5))
+
+    def test_sources_with_the_same_target_are_rejected(self):
+        with open(os.path.join(self.directory, 'photos', 'a.log'), 'w') as f:
+            f.write('another a.log')
+        with self.assertRaises(ValueError):
+            run_file_operation({
+                'operation': 'copy',
+                'sources': [os.path.join(self.directory, 'logs', 'a.log'), os.path.join(self.directory, 'photos', 'a.log')],
+                'destination': os.path.join(self.directory, 'backup'),
+            })
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'backup')))
+
+    def test_rename_rules(self):
+        result = run_file_operation({
+            'operation': 'rename',
+            'sources': [os.path.join(self.directory, 'photos', '*.jpg')],
+            'rename': {'pattern': r'\.jpg$', 'replace': '', 'template': 'holiday-{index:02d}-{stem}.jpg'},
+        })
+        self.assertEqual(result['succeeded'], 2)
+        self.assertEqual(self.listing('photos'), ['holiday-01-x.jpg', 'holiday-02-y.jpg'])
+
+        with self.assertRaises(ValueError):
+            run_file_operation({'operation': 'rename', 'sources': [os.path.join(self.directory, 'photos', '*')],
+                                'rename': {'template': 'same.jpg'}})
+
+    def test_failures_are_aggregated(self):
+        """
+        One failing item does not stop the rest, and the batch raises with the aggregated result.
+        """
+        with self.assertRaises(BatchOperationError) as raised:
+            run_file_operation({'operation': 'delete', 'sources': [os.path.join(self.directory, 'logs', '*')]})
+        result = raised.exception.result
+        self.assertEqual((result['total'], result['succeeded'], result['failed']), (4, 3, 1))
+        self.assertIn('old', result['errors'][0][0])
+        self.assertEqual(self.listing('logs'), ['old/c.log'])
+
+    def test_recursive_delete_skips_matches_inside_deleted_directories(self):
+        pattern = os.path.join(self.directory, 'logs', '**', '*')  # Matches 'old' and 'old/c.log'
+        result = run_file_operation({'operation': 'delete', 'sources': [pattern], 'recursive': True})
+        self.assertEqual((result['total'], result['failed']), (4, 0))
+        self.assertEqual(os.listdir(os.path.join(self.directory, 'logs')), [])
+
+
+class TestIncrementalSync(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, 'folder')
+        os.makedirs(os.path.join(self.source, 'sub'))
+        for name in ('a.txt', 'b.txt', os.path.join('sub', 'c.txt')):
+            with open(os.path.join(self.source, name), 'w') as f:
+                f.write(name * 100)
+        self.task = {'operation': 'copy', 'source': self.source, 'destination': os.path.join(self.directory, 'backup'),
+                     'sync': True, 'checksum': True, 'hash_cache': os.path.join(self.directory, 'hashes.db')}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_repeated_runs_only_copy_changes(self):
+        """
+        A second run skips everything; afterwards only modified files are copied, and touched files are matched by hash.
+        """
+        first = run_file_operation(self.task)
+        self.assertEqual((first['bytes'], first['skipped']), (1900, 0))
+
+        second = run_file_operation(self.task)
+        self.assertEqual((second['bytes'], second['skipped'], second['bytes_skipped']), (0, 3, 1900))
+
+        with open(os.path.join(self.source, 'a.txt'), 'w') as f:
+            f.write('changed')
+        os.utime(os.path.join(self.source, 'b.txt'), (1, 1))  # Same content, new modification time
+        third = run_file_operation(self.task)
+        self.assertEqual((third['bytes'], third['skipped']), (7, 2))
+        with open(os.path.join(self.directory, 'backup', 'folder', 'a.txt')) as f:
+            self.assertEqual(f.read(), 'changed')
+        self.assertEqual(os.stat(os.path.join(self.directory, 'backup', 'folder', 'b.txt')).st_mtime, 1)
+
+    def test_single_file_sync_targets_match_plain_copy(self):
+        """
+        A file synced to a path that does not exist yet is written to that path, as a plain copy is.
+        """
+        source = os.path.join(self.source, 'a.txt')
+        for name, sync in (('plain.txt', False), ('synced.txt', True)):
+            target = os.path.join(self.directory, name)
+            run_file_operation({'operation': 'copy', 'source': source, 'destination': target, 'sync': sync})
+            self.assertTrue(os.path.isfile(target))
+        second = run_file_operation({'operation': 'copy', 'source': source, 'sync': True,
+                                     'destination': os.path.join(self.directory, 'synced.txt')})
+        self.assertEqual(second['skipped'], 1)
+
+    def test_sync_without_source_or_destination_is_rejected(self):
+        for task in ({'operation': 'copy', 'destination': self.directory}, {'operation': 'copy', 'source': self.source}):
+            with self.assertRaises(ValueError):
+                run_file_operation(dict(task, sync=True))
+
+    def test_synced_move_removes_sources(self):
+        run_file_operation(dict(self.task, operation='move'))
+        self.assertFalse(os.path.exists(self.source))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'backup', 'folder', 'sub', 'c.txt')))
+
+
+if __name__ == '__main__':
+    unittest.main()
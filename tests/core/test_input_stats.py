@@ -0,0 +1,39 @@
+"""
+Unit tests for the input_stats module.
+
+These tests verify that keystrokes and clicks are counted overall and per application, that bursts are measured
+into the size histogram, and that a summary starts a new period.
+"""
+
+import unittest
+
+from src.core.input_events import KEY_DOWN, MOUSE_DOWN, MOUSE_MOVE
+from src.core.input_stats import InputStatistics
+
+
+class TestInputStatistics(unittest.TestCase):
+
+    def test_counts_rates_and_bursts(self):
+        stats = InputStatistics(burst_gap=1.0, now=0.0)
+        for i in range(6):  # One burst of 6 key presses
+            stats.record(10 + i * 0.2, KEY_DOWN, 'Editor')
+        stats.record(20.0, MOUSE_DOWN, 'Browser')  # A lone click
+        stats.record(20.5, MOUSE_MOVE, 'Browser')         # Not counted
+        stats.record(21.0, MOUSE_MOVE, 'Terminal')        # Not counted, and not listed as an app
+        stats.record(30.0, MOUSE_DOWN, 'Editor')
+        stats.record(30.5, KEY_DOWN, 'Editor')
+
+        summary = stats.summary(now=60.0)
+        self.assertEqual((summary['keys'], summary['clicks']), (7, 2))
+        self.assertEqual((summary['keys_per_minute'], summary['clicks_per_minute']), (7.0, 2.0))
+        self.assertEqual(summary['apps'], {'Editor': {'keys': 7, 'clicks': 1}, 'Browser': {'keys': 0, 'clicks': 1}})
+        self.assertEqual(list(summary['apps']), ['Editor', 'Browser'])
+        self.assertEqual(summary['bursts'], {'1': 1, '2-5': 1, '6-20': 1, '21-100': 0, '>100': 0})
+        self.assertEqual(summary['longest_burst'], 6)
+
+        summary = stats.summary(now=120.0)
+        self.assertEqual((summary['start'], summary['keys'], summary['apps']), (60.0, 0, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
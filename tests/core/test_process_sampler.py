@@ -0,0 +1,113 @@
+"""
+Unit tests for the process_sampler module.
+
+These tests verify that CPU usage is measured between samples (new and reused pids are primed rather than reported
+as 0%), that samples are rolled up per application into fixed-size histories, and that the procfs source reads
+the running interpreter correctly.
+"""
+
+import os
+import unittest
+
+from src.core.process_sampler import ProcessCounters, ProcessSampler, ProcfsSource, RollupSeries
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProcessSource:
+    def __init__(self):
+        self.processes = {}  # pid -> [name, start, cpu_time, rss]
+        self.named = []
+
+    def pids(self):
+        return list(self.processes)
+
+    def name(self, pid):
+        self.named.append(pid)
+        return self.processes[pid][0]
+
+    def read(self, pid):
+        _, start, cpu_time, rss = self.processes[pid]
+        return ProcessCounters(start, cpu_time, rss)
+
+
+class TestRollupSeries(unittest.TestCase):
+
+    def test_buckets_average_and_wrap(self):
+        series = RollupSeries(levels=((1, 4), (60, 2)))
+        self.assertEqual(series.nbytes(), 6 * (8 + 4 + 4 + 4))
+        for second in range(10):
+            series.add(second + 0.5, cpu_percent=second, rss=(second + 1) * 1024 * 1024)
+        series.add(9.9, cpu_percent=19, rss=0)
+
+        self.assertEqual(series.history(1), [(6, 6.0, 7.0), (7, 7.0, 8.0), (8, 8.0, 9.0), (9, 14.0, 5.0)])
+        self.assertEqual(series.history(1, since=8.5), [(9, 14.0, 5.0)])
+        self.assertEqual(series.history(1, now=12.0), [(9, 14.0, 5.0)])  # Older buckets left the 4s window
+        self.assertEqual(series.history(60), [(0, 64 / 11, 55 / 11)])
+        with self.assertRaises(ValueError):
+            series.history(5)
+
+
+class TestProcessSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.source = FakeProcessSource()
+        self.clock = FakeClock()
+        self.sampler = ProcessSampler(source=self.source, levels=((1, 60),), max_apps=2,
+                                      clock=self.clock, timer=self.clock)
+
+    def tick(self, seconds=1.0):
+        self.clock.now += seconds
+        return {sample.pid: sample for sample in self.sampler.sample()}
+
+    def test_cpu_percent_between_samples(self):
+        self.source.processes = {1: ['editor', 5, 10.0, 100], 2: ['editor', 6, 3.0, 50]}
+        self.assertEqual(self.tick(), {})  # Primed only
+        self.source.processes[1][2] = 10.5
+        self.source.processes[2][2] = 3.25
+        samples = self.tick(2.0)
+        self.assertEqual((samples[1].cpu_percent, samples[2].cpu_percent), (25.0, 12.5))
+
+        self.source.processes[2] = ['shell', 7, 0.0, 10]  # pid 2 was reused
+        self.source.processes[3] = ['shell', 8, 1.0, 10]
+        samples = self.tick()
+        self.assertEqual(set(samples), {1})
+        self.assertEqual(self.source.named, [1, 2, 2, 3])  # Names are only read for new processes
+
+    def test_history_per_application(self):
+        self.source.processes = {1: ['editor', 5, 0.0, 1024 * 1024], 2: ['editor', 6, 0.0, 1024 * 1024]}
+        self.tick()
+        self.source.processes[1][2] = 0.5
+        self.tick()
+        self.assertEqual(self.sampler.app_history('editor', 1), [(1002, 50.0, 2.0)])
+
+        self.source.processes = {3: ['shell', 1, 0.0, 0], 4: ['browser', 1, 0.0, 0]}
+        self.tick()
+        self.tick()
+        self.assertEqual(list(self.sampler.history), ['shell', 'browser'])  # 'editor' was evicted
+        self.assertEqual(self.sampler.app_history('editor', 1), [])
+
+
+@unittest.skipUnless(os.path.exists('/proc/self/stat'), "/proc is not available")
+class TestProcfsSource(unittest.TestCase):
+
+    def test_reads_own_process(self):
+        source = ProcfsSource()
+        pid = os.getpid()
+        self.assertIn(pid, source.pids())
+        counters = source.read(pid)
+        self.assertGreater(counters.cpu_time, 0)
+        self.assertGreater(counters.rss, 1024 * 1024)
+        self.assertEqual(source.read(pid).start, counters.start)
+        self.assertTrue(source.name(pid))
+        self.assertIsNone(source.read(2 ** 22 + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Unit tests for the recurrence module.
+
+These tests verify cron parsing, the catch-up policies for missed occurrences, and that the TaskScheduler re-arms recurring tasks after each run.
+"""
+
+import unittest
+from datetime import datetime
+
+from src.core.recurrence import CronSchedule, resolve_missed
+from src.core.task_scheduler import TaskScheduler
+
+
+def at(*args):
+    return datetime(*args).timestamp()
+
+
+class TestCronSchedule(unittest.TestCase):
+
+    def test_next_after(self):
+        """
+        Steps, ranges, weekdays and aliases resolve to the expected next fire time.
+        """
+        self.assertEqual(CronSchedule('*/15 * * * *').next_after(at(2024, 9, 20, 10, 7)), at(2024, 9, 20, 10, 15))
+        # 2024-09-20 is a Friday; the next weekday morning is Monday the 23rd.
+        self.assertEqual(CronSchedule('0 9 * * 1-5').next_after(at(2024, 9, 20, 10, 0)), at(2024, 9, 23, 9, 0))
+        self.assertEqual(CronSchedule('@daily').next_after(at(2024, 12, 31, 23, 59)), at(2025, 1, 1, 0, 0))
+        # Restricting both day fields fires on either: the 1st of the month or any Sunday.
+        self.assertEqual(CronSchedule('0 0 1 * 0').next_after(at(2024, 9, 20)), at(2024, 9, 22))
+
+    def test_invalid_expressions(self):
+        """
+        Malformed or unsatisfiable expressions are rejected.
+        """
+        for expression in ('* * * *', '61 * * * *', '*/0 * * * *', '5-1 * * * *'):
+            with self.assertRaises(ValueError):
+                CronSchedule(expression)
+        with self.assertRaises(ValueError):
+            CronSchedule('0 0 30 2 *').next_after(at(2024, 1, 1))
+
+
+class TestCatchUp(unittest.TestCase):
+
+    def test_policies(self):
+        """
+        After missing occurrences at 100, 110 and 120 (now = 125), each policy picks a different next run.
+        """
+        task = {'interval': 10}
+        self.assertEqual(resolve_missed(dict(task, catch_up='once'), 100, 125), (120, 125))
+        self.assertEqual(resolve_missed(dict(task, catch_up='all'), 100, 125), (100, 100))
+        self.assertEqual(resolve_missed(dict(task, catch_up='skip'), 100, 125), (130, 130))
+        self.assertEqual(resolve_missed(task, 130, 125), (130, 130))
+
+    def test_cron_catch_up(self):
+        """
+        Cron schedules find the latest missed occurrence by stepping through the schedule.
+        """
+        task = {'cron': '0 * * * *', 'catch_up': 'once'}
+        now = at(2024, 9, 20, 15, 30)
+        self.assertEqual(resolve_missed(task, at(2024, 9, 20, 10, 0), now), (at(2024, 9, 20, 15, 0), now))
+
+
+class FakeClock:
+
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRecurringTasks(unittest.TestCase):
+
+    def test_interval_task_rearms_until_stopped(self):
+        """
+        An interval task runs on schedule until stop() is called, and its next occurrence stays queued.
+        """
+        clock = FakeClock()
+        scheduler = TaskScheduler(clock=clock, sleep=clock.sleep)
+        runs = []
+
+        def tick():
+            runs.append(clock.now)
+            if len(runs) == 3:
+                scheduler.stop()
+
+        scheduler.schedule_task({'task_name': 'cleanup_temp_files', 'interval': 10, 'function': tick})
+        scheduler.execute_tasks()
+
+        self.assertEqual(runs, [1000.0, 1010.0, 1020.0])
+        self.assertEqual(scheduler.task_status['cleanup_temp_files'], 'scheduled')
+        self.assertEqual(scheduler.task_queue.next_due_in(), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Unit tests for the ring_buffer module.
+
+These tests verify that EventRingBuffer keeps the newest events in order once it wraps around, drops events past the retention period, exposes its columns without copying, and does not allocate per event however many events it receives.
+"""
+
+import tracemalloc
+import unittest
+
+from src.core.input_events import KEY_DOWN, MOUSE_DOWN, SCROLL
+from src.core.ring_buffer import EventRingBuffer
+
+
+class TestEventRingBuffer(unittest.TestCase):
+
+    def test_wraps_around_keeping_the_newest_events(self):
+        buffer = EventRingBuffer(4)
+        for i in range(6):
+            buffer.append(float(i), KEY_DOWN, key='ab'[i % 2])
+        buffer.append(6.0, SCROLL, 10, 20, code=-3)
+
+        events = list(buffer)
+        self.assertEqual([event.time for event in events], [3.0, 4.0, 5.0, 6.0])
+        self.assertEqual([event.key for event in events], ['b', 'a', 'b', -3])
+        self.assertEqual((len(buffer), buffer.dropped), (4, 3))
+        self.assertEqual([event.time for event in buffer.since(5.0)], [5.0, 6.0])
+
+    def test_retention(self):
+        buffer = EventRingBuffer(100, retention=10)
+        for second in range(20):
+            buffer.append(float(second), MOUSE_DOWN, second, second, key='left')
+        self.assertEqual(next(iter(buffer)).time, 9.0)
+        buffer.expire(100.0)
+        self.assertEqual(len(buffer), 0)
+
+    def test_views_share_the_buffer_memory(self):
+        buffer = EventRingBuffer(4)
+        for i in range(6):
+            buffer.append(float(i), MOUSE_DOWN, i, -i, key='left')
+        segments = buffer.views()
+        self.assertEqual([list(segment['time']) for segment in segments], [[2.0, 3.0], [4.0, 5.0]])
+        self.assertEqual(list(segments[1]['y']), [-4, -5])
+
+        buffer.append(6.0, MOUSE_DOWN, 6, -6, key='left')  # Overwrites the slot of event 2
+        self.assertEqual(segments[0]['time'][0], 6.0)
+
+    def test_memory_is_flat(self):
+        buffer = EventRingBuffer(10_000)
+        tracemalloc.start()
+        try:
+            for i in range(200_000):
+                buffer.append(float(i), KEY_DOWN, key=chr(97 + i % 26))
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(current, 16 * 1024)
+        self.assertEqual(buffer.nbytes(), 21 * 10_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,364 @@
+"""
+Unit tests for the task_scheduler module.
+
+These tests verify that the TaskScheduler orders tasks by priority and due time, shares workers fairly across priorities, that delayed tasks are held back until they are due, that tasks run concurrently on the worker pool, and that task dependencies are honoured.
+"""
+
+import os
+import random
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.core.task_scheduler import ResourceLocks, TaskQueue, TaskScheduler, find_dependency_cycle, task_resources
+
+
+class FakeClock:
+    """
+    Controllable time source; sleeping advances the clock instead of blocking.
+    """
+
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTaskQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.queue = TaskQueue(clock=self.clock)
+
+    def test_priority_then_due_order(self):
+        """
+        Ready tasks are served by priority first, then by due time, then FIFO.
+        """
+        self.queue.push({'task_name': 'low', 'priority': 'low'}, due=990)
+        self.queue.push({'task_name': 'medium-late', 'priority': 'medium'}, due=995)
+        self.queue.push({'task_name': 'medium-early', 'priority': 'medium'}, due=980)
+        self.queue.push({'task_name': 'high', 'priority': 'high'}, due=999)
+        self.queue.push({'task_name': 'unknown', 'priority': 'urgent'}, due=996)
+
+        order = [self.queue.pop()['task_name'] for _ in range(5)]
+        self.assertEqual(order, ['high', 'medium-early', 'medium-late', 'unknown', 'low'])
+        self.assertIsNone(self.queue.pop())
+        self.assertFalse(self.queue)
+
+    def test_delayed_task_is_held_until_due(self):
+        """
+        A task due in the future is not returned until the clock reaches its due time.
+        """
+        self.queue.push({'task_name': 'later', 'priority': 'high'}, due=1005)
+        self.assertIsNone(self.queue.pop())
+        self.assertEqual(self.queue.next_due_in(), 5)
+        self.assertEqual(len(self.queue), 1)
+
+        self.clock.now = 1005
+        self.assertEqual(self.queue.pop()['task_name'], 'later')
+        self.assertIsNone(self.queue.next_due_in())
+
+    def test_weighted_share_prevents_starvation(self):
+        """
+        With a steady backlog of medium priority tasks, low priority tasks still get their weighted share.
+        """
+        queue = TaskQueue(clock=self.clock, priority_weights={'high': 16, 'medium': 8, 'low': 1}, aging_interval=None)
+        for i in range(80):
+            queue.push({'task_name': f'medium-{i}', 'priority': 'medium'})
+        for i in range(10):
+            queue.push({'task_name': f'low-{i}', 'priority': 'low'})
+
+        served = [queue.pop()['priority'] for _ in range(45)]
+        self.assertEqual(served.count('low'), 5)  # Weights 8:1
+        self.assertEqual(served[:8], ['medium'] * 8)
+
+    def test_skewed_load_keeps_latency_in_priority_order(self):
+        """
+        Under a mostly high priority load close to capacity, high priority tasks still wait the least.
+        """
+        rng = random.Random(7)
+        arrivals, now = [], self.clock.now
+        for i in range(5000):
+            now += rng.expovariate(0.98 / 0.1)  # One worker, 0.1s per task
+            arrivals.append((now, rng.choices(('high', 'medium', 'low'), (0.80, 0.15, 0.05))[0]))
+
+        waits = {'high': [], 'medium': [], 'low': []}
+        pending = 0
+        while pending < len(arrivals) or self.queue:
+            if not self.queue:
+                self.clock.now = max(self.clock.now, arrivals[pending][0])
+            while pending < len(arrivals) and arrivals[pending][0] <= self.clock.now:
+                arrived, priority = arrivals[pending]
+                self.queue.push({'task_name': f'task-{pending}', 'priority': priority, 'arrived': arrived}, due=arrived)
+                pending += 1
+            task = self.queue.pop()
+            waits[task['priority']].append(self.clock.now - task['arrived'])
+            self.clock.now += 0.1
+
+        def percentile(values, fraction):
+            return sorted(values)[int(fraction * (len(values) - 1))]
+
+        medians = [percentile(waits[priority], 0.5) for priority in ('high', 'medium', 'low')]
+        self.assertEqual(medians, sorted(medians))
+        self.assertLess(percentile(waits['high'], 0.99), percentile(waits['medium'], 0.99))
+
+    def test_category_weights_and_aging(self):
+        """
+        Category weights scale a class's share, and a task that has waited long enough jumps ahead.
+        """
+        queue = TaskQueue(clock=self.clock, category_weights={'cleanup': 8})
+        queue.push({'task_name': 'cleanup', 'priority': 'low', 'category': 'cleanup'})
+        queue.push({'task_name': 'medium', 'priority': 'medium'})
+        self.assertEqual(queue.pop()['task_name'], 'cleanup')  # Weight 1 * 8 beats medium's 4
+        self.assertEqual(queue.pop()['task_name'], 'medium')
+
+        queue.push({'task_name': 'old', 'priority': 'low'})
+        self.clock.now += 60  # 'old' has waited past the aging interval
+        for i in range(5):
+            queue.push({'task_name': f'fresh-{i}', 'priority': 'high'})
+        self.assertEqual(queue.pop()['task_name'], 'old')
+
+
+class TestTaskScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = TaskScheduler(clock=self.clock, sleep=self.clock.sleep)
+        self.executed = []
+
+        def fake_run_task(task):
+            self.executed.append((task['task_name'], self.clock.now))
+
+        patcher = mock.patch.object(self.scheduler, 'run_task', side_effect=fake_run_task)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sleeps_until_next_due_task(self):
+        """
+        The scheduler runs due tasks first and sleeps exactly until a delayed task becomes due.
+        """
+        self.scheduler.schedule_task({'task_name': 'delayed', 'priority': 'high', 'timestamp': 1010})
+        self.scheduler.schedule_task({'task_name': 'now', 'priority': 'low'})
+        self.scheduler.execute_tasks()
+
+        self.assertEqual(self.executed, [('now', 1000.0), ('delayed', 1010)])
+        self.assertEqual(self.clock.sleeps, [10])
+        self.assertEqual(self.scheduler.task_status['delayed'], 'completed')
+
+    def test_failed_task_is_retried_after_delay(self):
+        """
+        A failing task is requeued with a future timestamp rather than being retried immediately.
+        """
+        attempts = []
+
+        def flaky(task):
+            attempts.append(self.clock.now)
+            if len(attempts) < 2:
+                raise RuntimeError("transient failure")
+
+        self.scheduler.run_task.side_effect = flaky
+        self.scheduler.schedule_task({'task_name': 'flaky'})
+        self.scheduler.execute_tasks()
+
+        self.assertEqual(len(attempts), 2)
+        self.assertGreater(attempts[1], attempts[0])
+        self.assertEqual(self.scheduler.task_status['flaky'], 'completed')
+
+    def test_real_clock_defaults(self):
+        """
+        Tasks scheduled without a timestamp are due immediately with the default clock.
+        """
+        scheduler = TaskScheduler()
+        task = {'task_name': 'immediate'}
+        scheduler.schedule_task(task)
+        self.assertLessEqual(task['timestamp'], time.time())
+        self.assertIs(scheduler.task_queue.pop(), task)
+
+
+class TestConcurrentExecution(unittest.TestCase):
+
+    def test_tasks_overlap_on_worker_threads(self):
+        """
+        With several workers, blocking tasks run at the same time and each worker reports its utilization.
+        """
+        scheduler = TaskScheduler(workers=4)
+        barrier = threading.Barrier(4, timeout=5)
+        for i in range(4):
+            scheduler.schedule_task({'task_name': f'io-{i}', 'function': barrier.wait})
+
+        start = time.perf_counter()
+        scheduler.execute_tasks()
+
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(set(scheduler.task_status.values()), {'completed'})
+        utilization = scheduler.worker_utilization()
+        self.assertEqual(len(utilization), 4)
+        self.assertTrue(all(0 <= value <= 1 for value in utilization.values()))
+
+    def test_task_can_schedule_follow_up_work(self):
+        """
+        A task that schedules another task from a worker thread wakes up the dispatcher.
+        """
+        scheduler = TaskScheduler(workers=2)
+        follow_up = {'task_name': 'follow-up', 'function': lambda: None}
+        scheduler.schedule_task({'task_name': 'parent', 'function': scheduler.schedule_task, 'args': (follow_up,)})
+        scheduler.execute_tasks()
+
+        self.assertEqual(scheduler.task_status, {'parent': 'completed', 'follow-up': 'completed'})
+
+    def test_cpu_bound_task_runs_in_process_pool(self):
+        """
+        Tasks marked cpu_bound are executed by a separate worker process.
+        """
+        scheduler = TaskScheduler(workers=1, process_workers=1)
+        scheduler.schedule_task({'task_name': 'crunch', 'function': sum, 'args': (range(1000),), 'cpu_bound': True})
+        scheduler.execute_tasks()
+
+        self.assertEqual(scheduler.task_status['crunch'], 'completed')
+        worker_pids = {worker.split(':')[0] for worker in scheduler.worker_utilization()}
+        self.assertNotIn(str(os.getpid()), worker_pids)
+
+
+class TestResourceLocks(unittest.TestCase):
+
+    def test_gui_tasks_need_input_devices(self):
+        """
+        GUI tasks implicitly need the input devices, and fs paths are normalized.
+        """
+        resources = task_resources({'type': 'gui', 'resources': ['fs:/tmp/a/../b']})
+        self.assertEqual(resources, {'input_devices', 'fs:/tmp/b'})
+
+    def test_conflicting_task_is_parked_until_release(self):
+        """
+        A task needing a busy resource is parked and handed back when the holder releases it.
+        """
+        locks = ResourceLocks()
+        first = {'task_name': 'first', 'resources': ['browser:main']}
+        second = {'task_name': 'second', 'resources': ['browser:main', 'fs:/tmp/x']}
+
+        self.assertTrue(locks.try_acquire(first))
+        self.assertFalse(locks.try_acquire(second))
+        self.assertEqual(locks.held(), {'browser:main': 'first'})
+        self.assertEqual(locks.release(first), [second])
+        self.assertTrue(locks.try_acquire(second))
+
+    def test_gui_tasks_serialize_while_file_tasks_run_in_parallel(self):
+        """
+        Tasks sharing the input devices never overlap, but unrelated tasks run alongside them.
+        """
+        scheduler = TaskScheduler(workers=4)
+        lock = threading.Lock()
+        running = {'gui': 0, 'total': 0}
+        peaks = {'gui': 0, 'total': 0}
+
+        def work(kind):
+            with lock:
+                for key in (kind, 'total'):
+                    running[key] = running.get(key, 0) + 1
+                    peaks[key] = max(peaks.get(key, 0), running[key])
+            time.sleep(0.05)
+            with lock:
+                for key in (kind, 'total'):
+                    running[key] -= 1
+
+        for i in range(3):
+            scheduler.schedule_task({'task_name': f'gui-{i}', 'type': 'gui', 'function': work, 'args': ('gui',)})
+            scheduler.schedule_task({'task_name': f'file-{i}', 'resources': [f'fs:/tmp/{i}'], 'function': work, 'args': ('file',)})
+        scheduler.execute_tasks()
+
+        self.assertEqual(set(scheduler.task_status.values()), {'completed'})
+        self.assertEqual(peaks['gui'], 1)
+        self.assertGreater(peaks['total'], 1)
+
+
+class TestTaskDependencies(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = TaskScheduler(workers=4)
+        self.events = []
+        self.lock = threading.Lock()
+
+    def record(self, name, event):
+        with self.lock:
+            self.events.append((name, event))
+
+    def step(self, name, depends_on=(), function=None):
+        def work():
+            self.record(name, 'start')
+            if function:
+                function()
+            self.record(name, 'end')
+        return {'task_name': name, 'depends_on': list(depends_on), 'function': work}
+
+    def test_independent_branches_run_concurrently(self):
+        """
+        In a diamond A -> (B, C) -> D, B and C run together and D starts only after both finish.
+        """
+        barrier = threading.Barrier(2, timeout=5)
+        self.scheduler.schedule_workflow([
+            self.step('D', depends_on=['B', 'C']),
+            self.step('B', depends_on=['A'], function=barrier.wait),
+            self.step('C', depends_on=['A'], function=barrier.wait),
+            self.step('A'),
+        ])
+        self.assertEqual(self.scheduler.task_status['D'], 'waiting')
+        self.scheduler.execute_tasks()
+
+        self.assertEqual(set(self.scheduler.task_status.values()), {'completed'})
+        order = [name for name, event in self.events if event == 'start']
+        self.assertEqual(order[0], 'A')
+        self.assertEqual(order[-1], 'D')
+        self.assertLess(self.events.index(('A', 'end')), self.events.index(('B', 'start')))
+        self.assertLess(max(self.events.index(('B', 'end')), self.events.index(('C', 'end'))),
+                        self.events.index(('D', 'start')))
+
+    def test_cycle_is_rejected_up_front(self):
+        """
+        A workflow with a cycle is rejected before any of its tasks is scheduled.
+        """
+        with self.assertRaises(ValueError):
+            self.scheduler.schedule_workflow([
+                self.step('A', depends_on=['C']),
+                self.step('B', depends_on=['A']),
+                self.step('C', depends_on=['B']),
+            ])
+        self.assertEqual(self.scheduler.task_status, {})
+
+        self.scheduler.schedule_task(self.step('X', depends_on=['Y']))
+        with self.assertRaises(ValueError):
+            self.scheduler.schedule_task(self.step('Y', depends_on=['X']))
+        self.assertEqual(find_dependency_cycle({'a': ['b'], 'b': []}), [])
+
+    def test_failure_prunes_only_downstream_tasks(self):
+        """
+        When a task fails for good, its dependents are skipped but unrelated tasks still run.
+        """
+        def fail():
+            raise RuntimeError("disk full")
+
+        failing = self.step('extract', function=fail)
+        failing['retry_count'] = 3  # No retries left
+        self.scheduler.schedule_workflow([
+            failing,
+            self.step('transform', depends_on=['extract']),
+            self.step('load', depends_on=['transform']),
+            self.step('report'),
+        ])
+        self.scheduler.execute_tasks()
+
+        self.assertEqual(self.scheduler.task_status, {
+            'extract': 'failed', 'transform': 'skipped', 'load': 'skipped', 'report': 'completed',
+        })
+        self.scheduler.schedule_task(self.step('late', depends_on=['load']))
+        self.assertEqual(self.scheduler.task_status['late'], 'skipped')
+
+
+if __name__ == '__main__':
+    unittest.main()
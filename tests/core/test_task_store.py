@@ -0,0 +1,94 @@
+"""
+Unit tests for the task_store module.
+
+These tests verify that the TaskStore persists the scheduler's queue and that a restarted TaskScheduler resumes pending and in-flight tasks.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from src.core.task_scheduler import TaskScheduler
+from src.core.task_store import TaskStore, decode_task, encode_task
+
+
+class TestTaskStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'queue.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_functions_are_stored_by_import_path(self):
+        """
+        Module-level functions survive a round trip; lambdas are flagged as unpersistable.
+        """
+        task = decode_task(encode_task({'task_name': 'join', 'function': os.path.join, 'args': ['a', 'b']}))
+        self.assertIs(task['function'], os.path.join)
+        self.assertEqual(task['args'], ['a', 'b'])
+        with self.assertRaises(ValueError):
+            decode_task(encode_task({'task_name': 'anon', 'function': lambda: None}))
+
+    def test_writes_are_group_committed(self):
+        """
+        Writes are committed in batches, and flush() commits the remainder.
+        """
+        store = TaskStore(self.path, batch_size=1000, commit_interval=60)
+        for i in range(2500):
+            store.save({'task_name': f'task-{i}'}, 'scheduled')
+
+        def committed_rows():
+            with sqlite3.connect(self.path) as connection:
+                return connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+        self.assertEqual(committed_rows(), 2000)
+        store.flush()
+        self.assertEqual(committed_rows(), 2500)
+        store.close()
+
+    def test_unstorable_task_is_not_queued(self):
+        """
+        A task that cannot be persisted is rejected without being queued or given a status.
+        """
+        scheduler = TaskScheduler(store=TaskStore(self.path))
+        with self.assertRaises(TypeError):
+            scheduler.schedule_task({'task_name': 'bad', 'function': os.getcwd, 'payload': object()})
+        self.assertEqual((len(scheduler.task_queue), scheduler.task_status), (0, {}))
+        scheduler.store.close()
+
+    def test_restart_resumes_pending_and_in_flight_tasks(self):
+        """
+        After a crash, a new scheduler resumes queued tasks, marks in-flight ones 'retry', and keeps finished statuses.
+        """
+        scheduler = TaskScheduler(store=TaskStore(self.path))
+        scheduler.schedule_task({'task_name': 'done', 'function': os.getcwd})
+        scheduler.schedule_task({'task_name': 'queued', 'function': os.getcwd, 'priority': 'low'})
+        scheduler.schedule_task({'task_name': 'in-flight', 'function': os.getcwd})
+        scheduler.schedule_task({'task_name': 'after-done', 'function': os.getcwd, 'depends_on': ['done']})
+        scheduler.schedule_task({'task_name': 'anon', 'function': lambda: None})
+        scheduler._set_status('done', 'completed')
+        scheduler._set_status('in-flight', 'running')
+        scheduler.store.flush()  # The process dies here without closing the store.
+
+        recovered = TaskScheduler(store=TaskStore(self.path))
+        self.assertEqual(recovered.task_status, {
+            'done': 'completed', 'queued': 'scheduled', 'in-flight': 'retry', 'after-done': 'scheduled', 'anon': 'failed',
+        })
+
+        recovered.execute_tasks()
+        self.assertEqual(recovered.task_status['in-flight'], 'completed')
+        recovered.store.close()
+
+        finished, pending = TaskStore(self.path).recover()
+        expected = {name: 'completed' for name in ('done', 'queued', 'in-flight', 'after-done')}
+        expected['anon'] = 'failed'
+        self.assertEqual(finished, expected)
+        self.assertEqual(pending, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
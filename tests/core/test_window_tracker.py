@@ -0,0 +1,95 @@
+"""
+Unit tests for the window_tracker module.
+
+These tests verify that the polling tracker reports only changes of the focused window, and (when Xvfb and python-xlib are installed) that the X11 tracker is told about focus and title changes by the X server without polling.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import time
+import unittest
+
+from src.core import window_tracker
+from src.core.window_tracker import PollingWindowTracker, X11WindowTracker
+
+
+class TestPollingWindowTracker(unittest.TestCase):
+
+    def test_reports_changes_only(self):
+        titles = iter(['Editor', 'Editor', 'Browser', 'Browser', 'Editor'])
+        seen = []
+        tracker = PollingWindowTracker(seen.append, read=lambda: next(titles, 'Editor'), interval=0.01)
+        tracker.start()
+        time.sleep(0.2)
+        tracker.stop()
+        tracker.join(1)
+        self.assertFalse(tracker.is_alive())
+        self.assertEqual(seen, ['Editor', 'Browser', 'Editor'])
+
+
+@unittest.skipUnless(window_tracker.xdisplay is not None and shutil.which('Xvfb'), "needs python-xlib and Xvfb")
+class TestX11WindowTracker(unittest.TestCase):
+
+    DISPLAY = ':97'
+
+    def setUp(self):
+        from Xlib import X, Xatom, display
+
+        self.server = subprocess.Popen(['Xvfb', self.DISPLAY, '-nolisten', 'tcp'],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        socket = f'/tmp/.X11-unix/X{self.DISPLAY[1:]}'
+        for _ in range(100):
+            if os.path.exists(socket):
+                break
+            time.sleep(0.05)
+        # This connection plays the window manager: it creates windows and sets _NET_ACTIVE_WINDOW.
+        self.wm = display.Display(self.DISPLAY)
+        self.root = self.wm.screen().root
+        self.X, self.Xatom = X, Xatom
+        self.active_atom = self.wm.intern_atom('_NET_ACTIVE_WINDOW')
+        self.name_atom = self.wm.intern_atom('_NET_WM_NAME')
+        self.utf8 = self.wm.intern_atom('UTF8_STRING')
+
+    def tearDown(self):
+        self.wm.close()
+        self.server.terminate()
+        self.server.wait()
+
+    def window(self, title):
+        window = self.root.create_window(0, 0, 100, 100, 0, self.wm.screen().root_depth)
+        self.rename(window, title)
+        return window
+
+    def rename(self, window, title):
+        window.change_property(self.name_atom, self.utf8, 8, title.encode('utf-8'))
+        self.wm.flush()
+
+    def focus(self, window):
+        self.root.change_property(self.active_atom, self.Xatom.WINDOW, 32, [window.id])
+        self.wm.flush()
+
+    def test_focus_and_title_changes_are_pushed(self):
+        editor, browser = self.window('Editor'), self.window('Browser')
+        self.focus(editor)
+        changes = queue.Queue()
+        tracker = X11WindowTracker(changes.put, self.DISPLAY)
+        tracker.start()
+        try:
+            self.assertEqual(changes.get(timeout=2), 'Editor')
+            self.focus(browser)
+            self.assertEqual(changes.get(timeout=2), 'Browser')
+            self.rename(browser, 'Browser - new tab')
+            self.assertEqual(changes.get(timeout=2), 'Browser - new tab')
+            self.rename(editor, 'Editor - unfocused')  # Not the focused window: not reported
+            time.sleep(0.2)
+            self.assertTrue(changes.empty())
+        finally:
+            tracker.stop()
+            tracker.join(2)
+        self.assertFalse(tracker.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Unit tests for GUI action scripts in the gui_control module.
+
+These tests verify that action scripts coalesce adjacent input events, pace them with the configured pause instead of PyAutoGUI's default, check the screen once at the end, and stop when the task is cancelled. A stand-in backend records the calls, so no display is needed.
+"""
+
+import unittest
+
+from src.core.cancellation import CancellationToken, TaskCancelled, use_token
+from src.modules.gui_automation.gui_control import ActionScriptError, run_action_script
+
+
+class RecordingBackend:
+    """
+    Records the PyAutoGUI calls made by an action script, with the pause in effect for each.
+    """
+
+    def __init__(self, on_screen=True):
+        self.PAUSE = 0.1
+        self.calls = []
+        self.on_screen = on_screen
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs, self.PAUSE))
+            return (0, 0, 10, 10) if self.on_screen else None
+        return record
+
+
+class TestActionScripts(unittest.TestCase):
+
+    def test_steps_are_coalesced_and_paced(self):
+        backend = RecordingBackend()
+        steps = [
+            {'action': 'move', 'x': 5, 'y': 5},
+            {'action': 'click', 'x': 100, 'y': 200},
+            {'action': 'type', 'text': 'Jane'},
+            {'action': 'type', 'text': ' Doe'},
+            {'action': 'press', 'key': 'tab'},
+            {'action': 'press', 'key': 'tab'},
+            {'action': 'hotkey', 'keys': ['ctrl', 's']},
+            {'action': 'wait', 'seconds': 0},
+        ]
+        result = run_action_script(steps, pace=0.0, verify={'image': 'saved.png'}, backend=backend)
+
+        self.assertEqual([call[0] for call in backend.calls], ['click', 'typewrite', 'press', 'hotkey', 'locateOnScreen'])
+        self.assertEqual(backend.calls[1][1], ('Jane Doe',))
+        self.assertEqual(backend.calls[2][2]['presses'], 2)
+        self.assertTrue(all(call[3] == 0.0 for call in backend.calls))
+        self.assertEqual(backend.PAUSE, 0.1)  # Restored after the script
+        self.assertEqual((result['steps'], result['events']), (8, 5))
+
+    def test_failed_screen_check_raises(self):
+        with self.assertRaises(ActionScriptError):
+            run_action_script([{'action': 'click', 'x': 1, 'y': 1}], verify={'image': 'saved.png'},
+                              backend=RecordingBackend(on_screen=False))
+        with self.assertRaises(ActionScriptError):
+            run_action_script([{'action': 'jump'}], backend=RecordingBackend())
+
+    def test_cancelled_script_stops(self):
+        backend = RecordingBackend()
+        token = CancellationToken()
+        token.cancel()
+        with use_token(token), self.assertRaises(TaskCancelled):
+            run_action_script([{'action': 'wait', 'seconds': 60}, {'action': 'type', 'text': 'x'}], backend=backend)
+        self.assertEqual(backend.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the macro module.
+
+These tests verify that recorded input events survive a round trip through the binary macro format, and that replays follow the recorded timing scaled by the speed multiplier, with idle gaps shortened. pynput keys and buttons and PyAutoGUI are replaced by stand-ins, so no display is needed.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from src.core.input_events import EVENT_FORMAT, key_name, read_events
+from src.modules.gui_automation.macro import MacroRecorder, macro_steps, replay_macro
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.PAUSE = 0.1
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+
+def char(c):
+    return SimpleNamespace(char=c)
+
+
+def special(name):
+    return SimpleNamespace(char=None, name=name)
+
+
+class TestMacros(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        clock = FakeClock()
+        self.recorder = MacroRecorder(clock=clock)
+        self.recorder.start()
+        left = SimpleNamespace(name='left')
+
+        def at(seconds, callback, *args):
+            clock.now = 100.0 + seconds
+            callback(*args)
+
+        at(0.0, self.recorder.on_move, 10, 20)
+        at(0.005, self.recorder.on_move, 11, 21)  # Within MOVE_SAMPLE_INTERVAL of the last move: dropped
+        at(0.5, self.recorder.on_click, 300, 400, left, True)
+        at(0.6, self.recorder.on_click, 300, 400, left, False)
+        at(1.0, self.recorder.on_key_press, char('h'))
+        at(1.1, self.recorder.on_key_release, char('h'))
+        at(31.1, self.recorder.on_key_press, special('ctrl_l'))  # After a 30 second idle gap
+        at(31.2, self.recorder.on_key_press, char('s'))
+        at(31.3, self.recorder.on_key_release, char('s'))
+        at(31.4, self.recorder.on_key_release, special('ctrl_l'))
+        at(32.0, self.recorder.on_scroll, 300, 400, 0, -3)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_macro_file_round_trip(self):
+        path = os.path.join(self.directory, 'form.macro')
+        self.assertEqual(self.recorder.save(path), 10)
+
+        events = read_events(path)
+        self.assertEqual(len(events), 10)
+        self.assertEqual(events[0].time, 0.0)
+        self.assertEqual(events[1][1:], (3, 300, 400, 'left'))
+        self.assertEqual([event.key for event in events[5:9]], ['ctrlleft', 's', 's', 'ctrlleft'])
+        self.assertEqual((events[-1].time, events[-1].key), (32.0, -3))
+        self.assertLess(os.path.getsize(path), 10 * EVENT_FORMAT.size + 40)
+
+    def test_replay_is_faster_and_compresses_idle_gaps(self):
+        steps = macro_steps(self.recorder.events, speed=10, max_idle=1.0)
+        waits = sum(step['seconds'] for step in steps if step['action'] == 'wait')
+        self.assertAlmostEqual(waits, (32.0 - 30.0 + 1.0) / 10)
+
+        backend = RecordingBackend()
+        result = replay_macro(self.recorder.events, speed=100, max_idle=0.5, backend=backend)
+        self.assertEqual([call[0] for call in backend.calls],
+                         ['moveTo', 'mouseDown', 'mouseUp', 'keyDown', 'keyUp',
+                          'keyDown', 'keyDown', 'keyUp', 'keyUp', 'scroll'])
+        self.assertEqual(result['recorded'], 32.0)
+        self.assertLess(result['elapsed'], 1.0)
+
+    def test_windows_control_characters_replay_as_letters(self):
+        """
+        Ctrl+S reported by pynput on Windows as '\x13' is recorded and replayed as the 's' key.
+        """
+        self.assertEqual(key_name(char('\x13')), 's')
+        self.assertEqual(key_name(char('\x1b')), '[')
+        self.assertEqual(key_name(SimpleNamespace(char=None, vk=0x53)), 's')
+
+        recorder = MacroRecorder(clock=FakeClock())
+        recorder.start()
+        recorder.on_key_press(special('ctrl_l'))
+        recorder.on_key_press(char('\x13'))
+        backend = RecordingBackend()
+        replay_macro(recorder.events, backend=backend)
+        self.assertEqual([call[1] for call in backend.calls], [('ctrlleft',), ('s',)])
+
+
+if __name__ == '__main__':
+    unittest.main()